@@ -0,0 +1,82 @@
+"""Benchmark batch mode against one event per invocation.
+
+Serves generated CVs (DOCX, and PDFs with a blank page that goes to Textract)
+from stand-in S3 and Textract clients that take S3_LATENCY_MS and
+TEXTRACT_LATENCY_MS per request. Parses them one {s3Bucket, s3Key} event at
+a time, then as one batch of SQS messages with 1 to 8 workers, and prints the
+CVs parsed per second. Batch mode also uploads each result. Exits non-zero if a
+batch reports a failure or stores a result that differs from the one-event parse.
+
+    python check_batch_throughput.py [cvs]
+"""
+import json
+import logging
+import os
+import sys
+import time
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+os.environ.setdefault('HEDGE_MAX_EXTRA_RATIO', '0')
+os.environ['TEXT_CACHE_ENABLED'] = 'false'
+os.environ['STAGE_METRICS_ENABLED'] = 'false'
+
+import cv_parser_path
+import lambda_function
+from sample_documents import cv_pdf, cv_text, docx_cv
+from stand_ins import StandInS3, StandInTextract, install
+
+S3_LATENCY_MS = 40
+TEXTRACT_LATENCY_MS = 400
+DEFAULT_CVS = 10
+WORKERS = [1, 2, 4, 8]
+
+def sample_objects(count):
+    """Key -> document for count CVs, alternating DOCX and PDF of varying length"""
+    objects = {}
+    for number in range(count):
+        if number % 2:
+            objects[f'cvs/{number}/cv.pdf'] = cv_pdf(jobs=number * 10, blank_pages=1)
+        else:
+            objects[f'cvs/{number}/cv.docx'] = docx_cv(cv_text(jobs=number * 10))[0]
+    return objects
+
+def main(count=DEFAULT_CVS):
+    logging.disable(logging.CRITICAL)
+    s3 = StandInS3(sample_objects(count), latency_ms=S3_LATENCY_MS)
+    install(s3=s3, textract=StandInTextract(latency_ms=TEXTRACT_LATENCY_MS))
+    keys = list(s3.objects)
+
+    # Imports and pattern compilation are paid once per container, not per CV
+    lambda_function.lambda_handler({'s3Bucket': 'stand-in', 's3Key': keys[0]}, None)
+    start = time.perf_counter()
+    expected = {}
+    for key in keys:
+        response = lambda_function.lambda_handler({'s3Bucket': 'stand-in', 's3Key': key}, None)
+        expected[key] = json.loads(json.dumps(response['body']))
+    seconds = time.perf_counter() - start
+    print(f"S3 {S3_LATENCY_MS} ms and Textract {TEXTRACT_LATENCY_MS} ms per request, {count} CVs")
+    print(f"{'one event per invoke':22} {seconds:6.2f} s {count / seconds:6.1f} CV/s")
+
+    failed = False
+    messages = [{'eventSource': 'aws:sqs', 'messageId': f'message-{number}',
+                 'body': json.dumps({'s3Bucket': 'stand-in', 's3Key': key})}
+                for number, key in enumerate(keys)]
+    for workers in WORKERS:
+        lambda_function.BATCH_MAX_WORKERS = workers
+        start = time.perf_counter()
+        response = lambda_function.lambda_handler({'Records': messages}, None)
+        seconds = time.perf_counter() - start
+        label = f"batch, {workers} worker{'s' if workers > 1 else ''}"
+        print(f"{label:22} {seconds:6.2f} s {count / seconds:6.1f} CV/s")
+        if response['batchItemFailures']:
+            print(f"FAIL: {len(response['batchItemFailures'])} records failed with {workers} workers")
+            failed = True
+        for key in keys:
+            stored = json.loads(s3.objects.pop(f'{lambda_function.BATCH_RESULTS_PREFIX}{key}.json', b'null'))
+            if stored is None or stored['body'] != expected[key]:
+                print(f"FAIL: the stored result of {key} differs from its one-event parse ({workers} workers)")
+                failed = True
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_CVS))
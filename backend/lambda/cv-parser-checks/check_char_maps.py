@@ -0,0 +1,178 @@
+"""Benchmark PyPDF2's font decoding for text extraction, and check it.
+
+Parses ToUnicode CMaps with large bfrange tables (one- and two-byte codes,
+values up to U+FFFF, surrogate pairs, short values) and compares each map with
+a per-code reference. Then extracts the text of generated PDFs whose pages all use
+the same three fonts, and of any PDFs given, with the PdfReader's font cache and
+without it, printing how many fonts were decoded and the time taken. Exits
+non-zero if a map differs from the reference, or the text differs between the two.
+
+    python check_char_maps.py [file.pdf ...]
+"""
+import io
+import logging
+import sys
+import time
+from binascii import unhexlify
+from math import ceil
+
+import cv_parser_path
+from PyPDF2 import PdfReader, PdfWriter, _cmap
+from PyPDF2.generic import (
+    ArrayObject,
+    DecodedStreamObject,
+    DictionaryObject,
+    NameObject,
+    NumberObject
+)
+
+GENERATED_PDFS = [('generated, 1 page', 1), ('generated, 10 pages', 10), ('generated, 50 pages', 50)]
+RUNS = 3
+
+def reference_range(first, last, start):
+    """The map of '<first> <last> <start>' one code at a time, as bfrange lines were read"""
+    nbytes = ceil(max(len(first), len(last)) / 2)
+    value_format = '%%0%dX' % max(4, len(start))
+    mapping = {}
+    value = int(start, 16)
+    for code in range(int(first, 16), int(last, 16) + 1):
+        key = unhexlify('%0*X' % (nbytes * 2, code)).decode('charmap' if nbytes == 1 else 'utf-16-be', 'surrogatepass')
+        mapping[key] = unhexlify(value_format % value).decode('utf-16-be', 'surrogatepass')
+        value += 1
+    return mapping
+
+def to_unicode(ranges):
+    lines = [b'/CIDInit /ProcSet findresource begin', b'12 dict begin', b'begincmap',
+             b'1 begincodespacerange <0000> <FFFF> endcodespacerange']
+    for start in range(0, len(ranges), 100):
+        block = ranges[start:start + 100]
+        lines.append(b'%d beginbfrange' % len(block))
+        lines += [b'<%s> <%s> <%s>' % (first.encode(), last.encode(), value.encode()) for first, last, value in block]
+        lines.append(b'endbfrange')
+    lines += [b'endcmap', b'CMapName currentdict /CMap defineresource pop', b'end', b'end']
+    stream = DecodedStreamObject()
+    stream.set_data(b'\n'.join(lines))
+    return stream
+
+def type0_font(ranges):
+    return DictionaryObject({
+        NameObject('/Type'): NameObject('/Font'),
+        NameObject('/Subtype'): NameObject('/Type0'),
+        NameObject('/BaseFont'): NameObject('/NotoSans'),
+        NameObject('/Encoding'): NameObject('/Identity-H'),
+        NameObject('/ToUnicode'): to_unicode(ranges),
+        NameObject('/DescendantFonts'): ArrayObject([DictionaryObject({
+            NameObject('/Type'): NameObject('/Font'),
+            NameObject('/Subtype'): NameObject('/CIDFontType2'),
+            NameObject('/DW'): NumberObject(1000),
+            NameObject('/W'): ArrayObject([NumberObject(3), ArrayObject([NumberObject(278)] * 95)])
+        })])
+    })
+
+def cmap_cases():
+    """(name, ranges) of ToUnicode CMaps, each range (first, last, start) in hex"""
+    return [
+        ('one range <0000> <FFFF>', [('0000', 'FFFF', '0000')]),
+        ('2000 one-code ranges', [('%04X' % code, '%04X' % code, '%04X' % (code + 29)) for code in range(3, 2003)]),
+        ('200 ranges of 64', [('%04X' % (n * 64), '%04X' % (n * 64 + 63), '%04X' % (0x4E00 + n * 64))
+                              for n in range(200)]),
+        ('one-byte codes', [('20', '7E', '0020'), ('A0', 'FF', '00A0')]),
+        ('values up to U+FFFF', [('0001', '0010', 'FFEF'), ('0100', '01FF', 'F000')]),
+        ('surrogate pair values', [('0200', '0219', 'D835DC00')]),
+        ('short values', [('0041', '005A', '41'), ('0061', '007A', '061')])
+    ]
+
+def parse_cmaps():
+    failed = False
+    print(f"{'ToUnicode CMap':30} {'codes':>7} {'ms':>8}")
+    for name, ranges in cmap_cases():
+        font = DictionaryObject({NameObject('/ToUnicode'): to_unicode(ranges)})
+        expected = {}
+        for first, last, start in ranges:
+            expected.update(reference_range(first, last, start))
+        times = []
+        for _ in range(RUNS):
+            start_time = time.perf_counter()
+            map_dict, _, int_entry = _cmap.parse_to_unicode(font, 32)
+            times.append((time.perf_counter() - start_time) * 1000)
+        map_dict.pop(-1, None)
+        if map_dict != expected or len(int_entry) != len(expected):
+            print(f"FAIL: {name} map differs from the per-code reference")
+            failed = True
+        print(f"{name:30} {len(map_dict):7} {min(times):8.2f}")
+    return failed
+
+def generated_pdf(pages):
+    writer = PdfWriter()
+    fonts = DictionaryObject()
+    for number in range(3):
+        ranges = [('%04X' % code, '%04X' % code, '%04X' % (code + 29)) for code in range(3, 98)]
+        ranges += [('%04X' % (0x100 + n * 64), '%04X' % (0x100 + n * 64 + 63), '%04X' % (0x4E00 + n * 64))
+                   for n in range(100 * number)]
+        fonts[NameObject('/F%d' % (number + 1))] = writer._add_object(type0_font(ranges))
+    for _ in range(pages):
+        # add_blank_page returns the page it was given, not the copy it added
+        writer.add_blank_page(612, 792)
+        page = writer.pages[-1]
+        page[NameObject('/Resources')] = DictionaryObject({NameObject('/Font'): fonts})
+        lines = [b'BT 12 TL 50 750 Td']
+        for line in range(40):
+            text = b'Senior engineer, Python and AWS'.hex().upper()
+            glyphs = ''.join('%04X' % (int(text[i:i + 2], 16) - 29) for i in range(0, len(text), 2))
+            lines.append(b'/F%d 10 Tf <%s> Tj T*' % (line % 3 + 1, glyphs.encode()))
+        lines.append(b'ET')
+        contents = DecodedStreamObject()
+        contents.set_data(b'\n'.join(lines))
+        page[NameObject('/Contents')] = writer._add_object(contents)
+    output = io.BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+def extract(pdf_bytes, cached):
+    """Text, seconds and fonts decoded by extract_text over every page of a freshly read PDF"""
+    reader = PdfReader(io.BytesIO(pdf_bytes))
+    if not cached:
+        reader._char_maps = None
+    decoded = 0
+    build = _cmap.build_char_map_from_dict
+
+    def counted(*args):
+        nonlocal decoded
+        decoded += 1
+        return build(*args)
+
+    _cmap.build_char_map_from_dict = counted
+    try:
+        start = time.perf_counter()
+        texts = [page.extract_text() for page in reader.pages]
+        return texts, time.perf_counter() - start, decoded
+    finally:
+        _cmap.build_char_map_from_dict = build
+
+def extract_pdfs(paths):
+    pdfs = [(name, generated_pdf(pages)) for name, pages in GENERATED_PDFS]
+    for path in paths:
+        with open(path, 'rb') as pdf_file:
+            pdfs.append((path, pdf_file.read()))
+    failed = False
+    print(f"\n{'pdf':40} {'pages':>6} {'fonts decoded':>14} {'uncached ms':>12} {'cached ms':>10}")
+    for name, pdf_bytes in pdfs:
+        expected, _, decoded_uncached = extract(pdf_bytes, False)
+        texts, _, decoded_cached = extract(pdf_bytes, True)
+        uncached = min(extract(pdf_bytes, False)[1] for _ in range(RUNS)) * 1000
+        cached = min(extract(pdf_bytes, True)[1] for _ in range(RUNS)) * 1000
+        print(f"{name[-40:]:40} {len(texts):6} {f'{decoded_uncached} -> {decoded_cached}':>14} "
+              f"{uncached:12.1f} {cached:10.1f}")
+        if texts != expected:
+            print(f"FAIL: {name} text differs with the font cache")
+            failed = True
+    return failed
+
+def main(paths):
+    logging.disable(logging.WARNING)
+    failed = parse_cmaps()
+    failed = extract_pdfs(paths) or failed
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
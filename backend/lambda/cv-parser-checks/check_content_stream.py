@@ -0,0 +1,172 @@
+"""Benchmark PyPDF2's content stream tokenizer and check it against ContentStream.
+
+Parses generated pages (dense text, escapes, nested strings, hex strings, inline
+images, marked content dictionaries, paths) and the pages of any PDFs given, with
+ContentStream and with iter_content_operations for all operators and for the text
+operators only, and prints the time each took. Then times the tokenizer on
+adversarial streams (long runs of operands with no operator after them, runs of
+whitespace before a stray delimiter) at full size and at a quarter of it. Exits
+non-zero if the tokenizer's operations differ from ContentStream's on any page,
+or its time on an adversarial stream grows by more than MAX_GROWTH when the
+stream grows fourfold (linear work grows about 4x, quadratic about 16x).
+
+    python check_content_stream.py [file.pdf ...]
+"""
+import logging
+import random
+import sys
+import time
+
+import cv_parser_path
+from PyPDF2 import PdfReader
+from PyPDF2.errors import PdfReadError
+from PyPDF2._content_stream import (
+    TEXT_OPERATORS,
+    ContentStreamSyntaxError,
+    content_stream_data,
+    iter_content_operations
+)
+from PyPDF2.generic import BooleanObject, ContentStream, DecodedStreamObject, FloatObject, NameObject, NullObject
+
+GENERATED_PAGES = 20
+LINES_PER_PAGE = 400
+ADVERSARIAL_TOKENS = 20000
+MAX_GROWTH = 8
+# Streams faster than this at full size are not checked for growth (timer noise)
+MIN_GROWTH_CHECK_MS = 5
+
+# Stream name -> function building a stream of about that many tokens
+ADVERSARIAL_STREAMS = {
+    'numbers before an array': lambda n: b'1 ' * n + b'[(a)] TJ',
+    'names in an array': lambda n: b'BT [' + b'/A ' * n + b'] TJ ET',
+    'numbers before a string': lambda n: b'BT ' + b'0.5 ' * n + b'(a) Tj ET',
+    'whitespace before a stray paren': lambda n: b' ' * n + b')',
+    'numbers before a stray paren': lambda n: b'1 ' * n + b')',
+    'open arrays': lambda n: b'[1 ' * n
+}
+
+def native(value):
+    """ContentStream's and the tokenizer's operands as comparable values"""
+    if isinstance(value, NullObject) or value is None:
+        return None
+    if isinstance(value, BooleanObject):
+        return value.value
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (FloatObject, float)):
+        return 'float', float(value)
+    if isinstance(value, int):
+        return 'int', int(value)
+    if isinstance(value, (NameObject, str)):
+        return 'name', str(value)
+    if isinstance(value, bytes):
+        return 'string', bytes(value)
+    if isinstance(value, list):
+        return [native(item) for item in value]
+    if isinstance(value, dict):
+        return {native(key): native(item) for key, item in value.items()}
+    raise TypeError(f"Unexpected operand {value!r}")
+
+def normalized(operations):
+    result = []
+    for operands, operator in operations:
+        if operator == b'INLINE IMAGE':
+            result.append((native(dict(operands['settings'])), operands['data'], operator))
+        else:
+            result.append(([native(operand) for operand in operands], bytes(operator)))
+    return result
+
+def generated_page(rng):
+    words = [b'Senior', b'engineer', b'Python', b'AWS', b'(2019)', b'C\\+\\+', b'\\050n\\051', b'caf\\351',
+             b'multi\\\nline', b'a (nested) word', b'\\M']
+    lines = [b'%generated page', b'q 1 0 0 1 0 0 cm']
+    for line in range(LINES_PER_PAGE):
+        y = 800 - line * 2
+        choice = rng.random()
+        if choice < 0.5:
+            text = b' '.join(rng.choice(words) for _ in range(rng.randint(1, 6)))
+            lines.append(b'BT /F%d %d Tf 1 0 0 1 50 %d Tm (%s) Tj ET' % (rng.randint(1, 3), rng.randint(8, 14), y, text))
+        elif choice < 0.75:
+            parts = b' '.join(b'(%s) %d' % (rng.choice(words[:6]), rng.randint(-300, 300)) for _ in range(4))
+            lines.append(b'BT 50 %d Td 12 TL [%s <48656C6C6F> < 4 8 6 >] TJ T* (x) \' 1 2 (y) " ET' % (y, parts))
+        elif choice < 0.9:
+            lines.append(b'0.5 0.25 .75 rg 50 %d m 300 %d l 50 %d 250 1 re S f*' % (y, y, y))
+        elif choice < 0.97:
+            lines.append(b'/Span <</ActualText (x) /MCID %d /Flags [true false null /A#20B]>> BDC EMC' % line)
+        else:
+            lines.append(b'BI /W 2 /H 1 /BPC 8 /CS /G /D [1 0] ID \x00\xff EI Q q')
+    lines.append(b'Q')
+    return b'\n'.join(lines)
+
+def parse_all(pages):
+    """Time each parser over every page and return (timings, pages whose operations differ)"""
+    timings = {'ContentStream': 0.0, 'tokenizer, all': 0.0, 'tokenizer, text': 0.0}
+    mismatched = []
+    for name, contents, pdf in pages:
+        data = content_stream_data(contents)
+        start = time.perf_counter()
+        expected = ContentStream(contents, pdf, 'bytes').operations
+        timings['ContentStream'] += time.perf_counter() - start
+        start = time.perf_counter()
+        operations = list(iter_content_operations(data, None, pdf))
+        timings['tokenizer, all'] += time.perf_counter() - start
+        start = time.perf_counter()
+        list(iter_content_operations(data, TEXT_OPERATORS, pdf))
+        timings['tokenizer, text'] += time.perf_counter() - start
+        if normalized(operations) != normalized(expected):
+            mismatched.append(name)
+    return timings, mismatched
+
+def tokenize_ms(data):
+    """Best of three times of iter_content_operations over data, in ms"""
+    times = []
+    for _ in range(3):
+        start = time.perf_counter()
+        try:
+            list(iter_content_operations(data, TEXT_OPERATORS))
+        except (ContentStreamSyntaxError, PdfReadError):
+            pass  # ContentStream reads it instead
+        times.append((time.perf_counter() - start) * 1000)
+    return min(times)
+
+def check_adversarial():
+    """Time the tokenizer on each adversarial stream and return whether any grew superlinearly"""
+    failed = False
+    print(f"\n{'adversarial stream':40} {'tokens':>6} {'quarter ms':>11} {'full ms':>8} {'growth':>7}")
+    for name, make in ADVERSARIAL_STREAMS.items():
+        quarter = tokenize_ms(make(ADVERSARIAL_TOKENS // 4))
+        full = tokenize_ms(make(ADVERSARIAL_TOKENS))
+        growth = full / max(quarter, 0.001)
+        print(f"{name:40} {ADVERSARIAL_TOKENS:6} {quarter:11.2f} {full:8.2f} {growth:7.1f}")
+        if full >= MIN_GROWTH_CHECK_MS and growth > MAX_GROWTH:
+            print(f"FAIL: tokenizer time on '{name}' grows superlinearly")
+            failed = True
+    return failed
+
+def main(paths):
+    logging.disable(logging.WARNING)
+    rng = random.Random(0)
+    sets = {'generated': []}
+    for number in range(GENERATED_PAGES):
+        stream = DecodedStreamObject()
+        stream.set_data(generated_page(rng))
+        sets['generated'].append((f'generated page {number}', stream, None))
+    for path in paths:
+        reader = PdfReader(path)
+        sets[path] = [(f'{path} page {number + 1}', page['/Contents'], reader)
+                      for number, page in enumerate(reader.pages) if '/Contents' in page]
+
+    failed = False
+    print(f"{'pages':40} {'count':>6} {'ContentStream ms':>17} {'all ops ms':>11} {'text ops ms':>12}")
+    for name, pages in sets.items():
+        timings, mismatched = parse_all(pages)
+        print(f"{name[-40:]:40} {len(pages):6} {timings['ContentStream'] * 1000:17.1f} "
+              f"{timings['tokenizer, all'] * 1000:11.1f} {timings['tokenizer, text'] * 1000:12.1f}")
+        for page in mismatched:
+            print(f"FAIL: operations differ from ContentStream on {page}")
+            failed = True
+    failed = check_adversarial() or failed
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,81 @@
+"""Benchmark downloading CVs into the handler's bounded buffer against reading them whole.
+
+Serves documents of several sizes from a stand-in S3 client and fetches each one
+with fetch_document, which keeps up to MAX_IN_MEMORY_BYTES in memory and spills
+the rest to a temp file, and by reading the whole response body, as a download
+held in memory would. Prints where the document ended up, the peak memory Python
+allocated (the stand-in's copy not included) and the time taken. Exits non-zero
+if a fetched document differs from the object, or a document over the limit was
+held in memory or took more memory than the limit allows.
+
+    python check_document_download.py [size_mb ...]
+"""
+import io
+import logging
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+os.environ.setdefault('HEDGE_MAX_EXTRA_RATIO', '0')
+
+import cv_parser_path
+import lambda_function
+from stand_ins import StandInS3, install
+
+DEFAULT_SIZES_MB = [1, 8, 40]
+RUNS = 3
+# BytesIO over-allocates as it grows, and a spill holds the last chunk as well
+MAX_OVERHEAD_RATIO = 1.25
+
+def fetch(key, method):
+    """Contents, where they were held, seconds and peak bytes allocated fetching the object at key"""
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        if method == 'fetch_document':
+            document, _ = lambda_function.fetch_document('stand-in', key)
+            held = 'memory' if isinstance(document, io.BytesIO) else 'temp file'
+        else:
+            document = io.BytesIO(lambda_function.get_s3_object(Bucket='stand-in', Key=key)['Body'].read())
+            held = 'memory'
+        seconds = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    with document:
+        return document.read(), held, seconds, peak
+
+def main(sizes_mb):
+    logging.disable(logging.WARNING)
+    s3 = StandInS3({f'cv-{size}mb.pdf': random.Random(size).randbytes(size * 2**20) for size in sizes_mb})
+    install(s3=s3)
+    limit = lambda_function.MAX_IN_MEMORY_BYTES
+    max_peak = limit * MAX_OVERHEAD_RATIO + lambda_function.S3_READ_CHUNK_BYTES
+
+    failed = False
+    methods = ('fetch_document', 'whole body')
+    print(f"{'MB':>5} " + ' '.join(f"{method:>15} {'MB peak':>8} {'ms':>6}" for method in methods))
+    for size in sizes_mb:
+        key = f'cv-{size}mb.pdf'
+        row = f"{size:5}"
+        for method in methods:
+            results = [fetch(key, method) for _ in range(RUNS)]
+            contents, held, _, _ = results[0]
+            peak = min(result[3] for result in results)
+            if contents != s3.objects[key]:
+                print(f"FAIL: {method} returned different contents for {key}")
+                failed = True
+            if method == 'fetch_document' and len(contents) > limit and (held == 'memory' or peak > max_peak):
+                print(f"FAIL: {key} held in {held} with {peak / 2**20:.1f} MB peak, over the "
+                      f"{limit / 2**20:.0f} MB limit")
+                failed = True
+            row += f" {held:>15} {peak / 2**20:8.1f} {min(result[2] for result in results) * 1000:6.0f}"
+        print(row)
+    print(f"MAX_IN_MEMORY_BYTES {limit / 2**20:.0f} MB")
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main([int(size) for size in sys.argv[1:]] or DEFAULT_SIZES_MB))
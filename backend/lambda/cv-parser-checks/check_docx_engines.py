@@ -0,0 +1,103 @@
+"""Benchmark the DOCX engines: the streaming reader against python-docx.
+
+Generates Word packages (a CV, and a long one ending in a 150-row table) and
+reads their paragraphs with each DOCX_ENGINE in a fresh interpreter, printing
+the time taken (best of RUNS, after a first read) and how far the first read
+grew the process's peak RSS. RSS includes lxml's own memory, which tracemalloc
+does not see. Exits non-zero if an engine cannot read a document or reads
+paragraphs other than those written (python-docx reads tables after the body, so
+order is not compared).
+
+python-docx needs lxml built for the platform the check runs on, and the package
+ships a Windows build, so the baseline fails outside Windows unless PYTHONPATH
+holds a build for this platform (see cv_parser_path), preferably of the same
+version. The lxml the baseline used is printed under the table.
+
+    PYTHONPATH=/path/to/linux/lxml python check_docx_engines.py
+"""
+import json
+import logging
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+import cv_parser_path
+import lambda_function
+from docx_stream import iter_docx_paragraphs
+from sample_documents import cv_text, docx_cv
+
+# Name -> (jobs added to the sample CV, rows in its closing table)
+DOCUMENTS = {'cv': (0, 0), 'long cv': (300, 150)}
+ENGINES = ['stream', 'python-docx']
+RUNS = 5
+
+def read_paragraphs(engine, path):
+    if engine == 'python-docx':
+        return lambda_function.extract_paragraphs_with_python_docx(path)
+    return [paragraph for paragraph in iter_docx_paragraphs(path) if paragraph.strip()]
+
+def measure(engine, path):
+    """Read a package with one engine in this process and print the paragraphs, ms and peak RSS growth as JSON"""
+    library = None
+    if engine == 'python-docx':
+        import docx
+        import lxml
+        library = f"lxml {lxml.__version__} from {os.path.dirname(os.path.dirname(lxml.__file__))}"
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    paragraphs = read_paragraphs(engine, path)
+    growth_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline
+    seconds = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        read_paragraphs(engine, path)
+        seconds.append(time.perf_counter() - start)
+    print(json.dumps({'paragraphs': paragraphs, 'ms': min(seconds) * 1000, 'rss_growth_kb': growth_kb,
+                      'library': library}))
+
+def main():
+    logging.disable(logging.WARNING)
+    failed = False
+    libraries = set()
+    print(f"{'document':10} {'paragraphs':>10} {'KB':>6} " + ' '.join(f"{engine:>12} {'RSS +MB':>8}" for engine in ENGINES))
+    with tempfile.TemporaryDirectory() as directory:
+        for name, (jobs, table_rows) in DOCUMENTS.items():
+            package, written = docx_cv(cv_text(jobs), table_rows)
+            path = os.path.join(directory, name.replace(' ', '_') + '.docx')
+            with open(path, 'wb') as file:
+                file.write(package)
+            row = f"{name:10} {len(written):10} {len(package) / 1024:6.0f}"
+            for engine in ENGINES:
+                result = subprocess.run([sys.executable, __file__, engine, path], capture_output=True, text=True)
+                if result.returncode != 0:
+                    print(result.stderr)
+                    if engine == 'python-docx' and 'lxml' in result.stderr:
+                        print(f"FAIL: python-docx could not import lxml. The package's lxml is built for "
+                              f"another platform; put a build for this one on PYTHONPATH")
+                    else:
+                        print(f"FAIL: {engine} could not read {name}")
+                    failed = True
+                    row += f" {'failed':>12} {'':>8}"
+                    continue
+                measured = json.loads(result.stdout)
+                if measured['library']:
+                    libraries.add(measured['library'])
+                if sorted(measured['paragraphs']) != sorted(written):
+                    print(f"FAIL: {engine} read different paragraphs from {name}")
+                    failed = True
+                row += f" {measured['ms']:9.1f} ms {measured['rss_growth_kb'] / 1024:8.1f}"
+            print(row)
+    for library in sorted(libraries):
+        print(f"python-docx used {library}")
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    if len(sys.argv) == 3:
+        logging.disable(logging.WARNING)
+        measure(sys.argv[1], sys.argv[2])
+    else:
+        sys.exit(main())
@@ -0,0 +1,90 @@
+"""Fail when an extractor is slow or superlinear on adversarial CV text.
+
+Runs extract_sections on generated inputs built to make backtracking regexes
+blow up (long runs of one character class, repeated keywords, dates without a
+line break, ...), cleaned with clean_text as the pipeline does. Each input is
+timed at full size and at a quarter of it with StageTimer, and the check exits
+non-zero if any extractor stage goes over its budget at full size or grows by
+more than MAX_GROWTH when the input grows fourfold (linear work grows about 4x,
+quadratic about 16x).
+
+    python check_extractor_budgets.py [budget_ms] [chars]
+
+The budget defaults to EXTRACTOR_BUDGET_MS (100 ms per stage at 100,000 chars).
+"""
+import logging
+import os
+import sys
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+import cv_parser_path
+import lambda_function
+from stage_timer import StageTimer
+
+DEFAULT_BUDGET_MS = float(os.environ.get('EXTRACTOR_BUDGET_MS', '100'))
+DEFAULT_CHARS = 100000
+EXTRACTOR_STAGES = ['personal_info', 'section_index', 'education', 'skills', 'experience']
+MAX_GROWTH = 8
+# Stages faster than this at full size are not checked for growth (timer noise)
+MIN_GROWTH_CHECK_MS = 5
+
+def repeat(unit, chars):
+    return unit * max(1, chars // len(unit))
+
+# Input name -> function building roughly that many characters of text
+ADVERSARIAL_INPUTS = {
+    'word_run': lambda chars: repeat('a', chars),
+    'caps_run': lambda chars: repeat('A', chars),
+    'letters_spaces': lambda chars: repeat('ab cd ', chars),
+    'caps_words': lambda chars: repeat('Ab ', chars),
+    'dotted_local_part': lambda chars: repeat('a.', chars),
+    'hyphenated_local_part': lambda chars: repeat('a.b-', chars) + '@',
+    'at_signs': lambda chars: repeat('a@', chars),
+    'email_labels': lambda chars: repeat('email', chars),
+    'digit_groups': lambda chars: repeat('123 ', chars),
+    'university_no_delimiter': lambda chars: repeat('University', chars),
+    'education_text': lambda chars: 'EDUCATION ' + repeat('ab cd ', chars),
+    'degree_spam': lambda chars: 'EDUCATION ' + repeat('BSc in ', chars),
+    'skills_letter_run': lambda chars: 'SKILLS ' + repeat('ab cd ', chars),
+    'skills_bullets': lambda chars: 'SKILLS ' + repeat('• x ', chars),
+    'skills_distinct_items': lambda chars: 'SKILLS ' + ', '.join(f'skill{i}' for i in range(chars // 10)),
+    'certification_dates': lambda chars: 'CERTIFICATIONS ' + repeat('01/2020 - ', chars),
+    'experience_titles': lambda chars: 'EXPERIENCE ' + repeat('Ab. ', chars),
+    'project_bullets': lambda chars: 'PROJECTS ' + repeat('- x. ', chars),
+    'headers': lambda chars: repeat('Experience ', chars)
+}
+
+def time_stages(text):
+    """Run the extractors on cleaned text and return {stage: wall ms}"""
+    text = lambda_function.clean_text(text)
+    with StageTimer(trace_memory=False) as timer:
+        lambda_function.extract_sections(text)
+    return {name: stats['wall_ms'] for name, stats in timer.report().items() if name in EXTRACTOR_STAGES}
+
+def main(budget_ms=DEFAULT_BUDGET_MS, chars=DEFAULT_CHARS):
+    # The extractors log every section they find
+    logging.disable(logging.INFO)
+
+    print(f"{'input':24} " + " ".join(f"{name:>14}" for name in EXTRACTOR_STAGES))
+    failures = []
+    for input_name, build in ADVERSARIAL_INPUTS.items():
+        small = time_stages(build(chars // 4))
+        full = time_stages(build(chars))
+        print(f"{input_name:24} " + " ".join(f"{full.get(name, 0.0):14.1f}" for name in EXTRACTOR_STAGES))
+        for name, wall_ms in full.items():
+            if wall_ms > budget_ms:
+                failures.append(f"{name} took {wall_ms:.1f} ms on {input_name} (budget {budget_ms:.0f} ms)")
+            growth = wall_ms / max(small.get(name, 0.0), 0.01)
+            if wall_ms > MIN_GROWTH_CHECK_MS and growth > MAX_GROWTH:
+                failures.append(f"{name} grew {growth:.1f}x on {input_name} for 4x the input")
+
+    print(f"{chars} chars per input, budget {budget_ms:.0f} ms per stage (wall ms at full size)")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    budget = float(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_BUDGET_MS
+    char_count = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_CHARS
+    sys.exit(main(budget, char_count))
@@ -0,0 +1,88 @@
+"""Fail when hedged requests do not cut tail latency, or hedge more than their cap.
+
+Installs a stand-in S3 client whose get_object usually answers in BASE_MS but takes
+SLOW_MS for a SLOW_FRACTION of calls, picked at random per call. It then makes the
+same number of calls directly and through the handler's get_s3_object, one after
+another as a container would. Prints p50/p99/max latency and the hedges issued and won,
+and exits non-zero if hedging did not lower p99 or issued more than
+HEDGE_MAX_EXTRA_RATIO of the calls as hedges.
+
+    python check_hedging.py [calls] [slow_fraction]
+"""
+import io
+import logging
+import os
+import random
+import statistics
+import sys
+import time
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+import cv_parser_path
+import aws_clients
+import lambda_function
+
+BASE_MS = 5
+SLOW_MS = 150
+DEFAULT_CALLS = 1000
+DEFAULT_SLOW_FRACTION = 0.03
+
+class SlowS3:
+    """Stand-in S3 client that injects latency into get_object"""
+
+    def __init__(self, slow_fraction, seed=0):
+        self.slow_fraction = slow_fraction
+        self.random = random.Random(seed)
+        self.calls = 0
+
+    def get_object(self, Bucket, Key, **kwargs):
+        self.calls += 1
+        slow = self.random.random() < self.slow_fraction
+        time.sleep((SLOW_MS if slow else BASE_MS) / 1000)
+        return {'Body': io.BytesIO(b'%PDF-1.4'), 'ETag': '"stand-in"'}
+
+def time_calls(get_object, calls):
+    """Make calls one at a time and return their latencies in ms, sorted"""
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        get_object(Bucket='stand-in', Key='cv.pdf')['Body'].close()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return sorted(latencies)
+
+def percentile(latencies, percent):
+    return latencies[min(len(latencies) - 1, int(len(latencies) * percent / 100))]
+
+def main(calls=DEFAULT_CALLS, slow_fraction=DEFAULT_SLOW_FRACTION):
+    logging.disable(logging.INFO)
+    direct_client = SlowS3(slow_fraction)
+    direct = time_calls(direct_client.get_object, calls)
+
+    hedged_client = aws_clients._clients['s3', aws_clients.RETRY_MODE] = SlowS3(slow_fraction)
+    lambda_function.hedger.take_counts()
+    hedged = time_calls(lambda_function.get_s3_object, calls)
+    counts = lambda_function.hedger.take_counts().get('s3_get_object', {'calls': 0, 'hedged': 0, 'won': 0})
+
+    print(f"{calls} calls, {slow_fraction:.1%} take {SLOW_MS} ms instead of {BASE_MS} ms")
+    print(f"{'':8} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'mean ms':>8} {'requests':>9}")
+    for name, latencies, client in [('direct', direct, direct_client), ('hedged', hedged, hedged_client)]:
+        print(f"{name:8} {percentile(latencies, 50):8.1f} {percentile(latencies, 99):8.1f} "
+              f"{latencies[-1]:8.1f} {statistics.mean(latencies):8.1f} {client.calls:9}")
+    print(f"hedges issued {counts['hedged']}, won {counts['won']} "
+          f"(cap {lambda_function.HEDGE_MAX_EXTRA_RATIO:.0%} of calls)")
+
+    failed = False
+    if percentile(hedged, 99) >= percentile(direct, 99):
+        print("FAIL: hedging did not lower p99 latency")
+        failed = True
+    # The budget starts with one hedge in hand
+    if counts['hedged'] > lambda_function.HEDGE_MAX_EXTRA_RATIO * calls + 1:
+        print(f"FAIL: {counts['hedged']} hedges exceed the cap")
+        failed = True
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    call_count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_CALLS
+    fraction = float(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_SLOW_FRACTION
+    sys.exit(main(call_count, fraction))
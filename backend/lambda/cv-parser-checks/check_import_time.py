@@ -0,0 +1,72 @@
+"""Fail when importing the Lambda handler gets slower than its budget.
+
+Imports lambda_function in fresh interpreters under `python -X importtime`, takes
+the median cumulative import time and exits non-zero if it is over budget, or
+if a module that should only load on first use (boto3, PyPDF2, python-docx) is
+imported at startup. The slowest imports of the median run are printed to
+show where a regression came from.
+
+    python check_import_time.py [budget_ms] [runs]
+
+The budget defaults to IMPORT_TIME_BUDGET_MS (150 ms).
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+from cv_parser_path import CV_PARSER_DIR
+
+HANDLER_MODULE = 'lambda_function'
+DEFAULT_BUDGET_MS = float(os.environ.get('IMPORT_TIME_BUDGET_MS', '150'))
+# Loaded on first use by aws_clients and the extraction functions
+DEFERRED_MODULES = ['boto3', 'botocore.session', 'PyPDF2', 'docx']
+
+def measure_import():
+    """Import the handler in a fresh interpreter and return {module: (self_us, cumulative_us)}"""
+    env = dict(os.environ)
+    env.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {HANDLER_MODULE}'],
+        cwd=CV_PARSER_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+def main(budget_ms=DEFAULT_BUDGET_MS, runs=5):
+    samples = sorted((measure_import() for _ in range(runs)), key=lambda modules: modules[HANDLER_MODULE][1])
+    median = samples[len(samples) // 2]
+    times_ms = [modules[HANDLER_MODULE][1] / 1000 for modules in samples]
+    median_ms = statistics.median(times_ms)
+
+    print(f"import {HANDLER_MODULE}: median {median_ms:.1f} ms over {runs} runs "
+          f"(min {times_ms[0]:.1f}, max {times_ms[-1]:.1f}), budget {budget_ms:.0f} ms")
+    print("Slowest imports (cumulative ms):")
+    slowest = sorted(median.items(), key=lambda item: item[1][1], reverse=True)[:15]
+    for name, (_, cumulative_us) in slowest:
+        print(f"  {cumulative_us / 1000:8.1f}  {name}")
+
+    failed = False
+    eager = [name for name in DEFERRED_MODULES if name in median]
+    if eager:
+        print(f"FAIL: imported at startup instead of on first use: {', '.join(eager)}")
+        failed = True
+    if median_ms > budget_ms:
+        print(f"FAIL: import time {median_ms:.1f} ms exceeds budget of {budget_ms:.0f} ms")
+        failed = True
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    budget = float(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_BUDGET_MS
+    run_count = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    sys.exit(main(budget, run_count))
@@ -0,0 +1,165 @@
+"""Benchmark PyPDF2's memory use reading large PDFs from a file, bytes and a memory map.
+
+Generates portfolio-style PDFs (a few pages of text, each drawing large embedded
+JPEG-filtered images), with a valid cross-reference table and with offsets that
+are all wrong (so the reader rebuilds the table by scanning the whole file), and
+extracts their text with PdfReader reading an open temp file, the file's bytes,
+a memory map of it, and the buffer the handler passes for a document it fetched
+into memory (lambda_function.document_buffer). Prints the peak memory Python
+allocated while reading (the source itself not included) and the time taken;
+PDFs given as arguments are measured too. Exits non-zero if the text differs
+between the sources, or reading the handler's buffer allocates more than
+MAX_FETCHED_PEAK_RATIO of the document.
+
+    python check_pdf_memory.py [file.pdf ...]
+"""
+import io
+import logging
+import mmap
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+import cv_parser_path
+import lambda_function
+from PyPDF2 import PdfReader, PdfWriter
+from PyPDF2.generic import DecodedStreamObject, DictionaryObject, NameObject, NumberObject
+from stand_ins import StandInS3, install
+
+GENERATED_PDFS = [('generated, 8 MB', 4, 2), ('generated, 40 MB', 10, 4)]
+IMAGE_BYTES = 1024 * 1024
+RUNS = 3
+# Reading a fetched document in place allocates the parsed objects, not a copy of it
+MAX_FETCHED_PEAK_RATIO = 0.25
+
+def image(seed):
+    stream = DecodedStreamObject()
+    # Stands in for JPEG data, which text extraction never decodes
+    stream.set_data(bytes((seed * 7 + i * 31) & 0xFF for i in range(256)) * (IMAGE_BYTES // 256))
+    stream.update({
+        NameObject('/Type'): NameObject('/XObject'),
+        NameObject('/Subtype'): NameObject('/Image'),
+        NameObject('/Width'): NumberObject(1024),
+        NameObject('/Height'): NumberObject(341),
+        NameObject('/ColorSpace'): NameObject('/DeviceRGB'),
+        NameObject('/BitsPerComponent'): NumberObject(8),
+        NameObject('/Filter'): NameObject('/DCTDecode')
+    })
+    return stream
+
+def generated_pdf(pages, images_per_page):
+    writer = PdfWriter()
+    font = DictionaryObject({
+        NameObject('/Type'): NameObject('/Font'),
+        NameObject('/Subtype'): NameObject('/Type1'),
+        NameObject('/BaseFont'): NameObject('/Helvetica')
+    })
+    for number in range(pages):
+        # add_blank_page returns the page it was given, not the copy it added
+        writer.add_blank_page(612, 792)
+        page = writer.pages[-1]
+        images = DictionaryObject()
+        lines = [b'BT /F1 11 Tf 13 TL 50 760 Td']
+        lines += [b'(Project %d: brand identity, web and print work for client %d) Tj T*' % (number, line)
+                  for line in range(30)]
+        lines.append(b'ET')
+        for count in range(images_per_page):
+            name = NameObject('/Im%d' % count)
+            images[name] = writer._add_object(image(number * images_per_page + count))
+            lines.append(b'q 500 0 0 166 50 %d cm %s Do Q' % (50 + count * 170, name.encode()))
+        page[NameObject('/Resources')] = DictionaryObject({
+            NameObject('/Font'): DictionaryObject({NameObject('/F1'): font}),
+            NameObject('/XObject'): images
+        })
+        contents = DecodedStreamObject()
+        contents.set_data(b'\n'.join(lines))
+        page[NameObject('/Contents')] = writer._add_object(contents)
+    output = io.BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+def fetched(path):
+    """The file at path as the handler holds it after fetching it from S3 into memory"""
+    with open(path, 'rb') as pdf_file:
+        install(s3=StandInS3({path: pdf_file.read()}))
+    document, _ = lambda_function.fetch_document('stand-in', path)
+    if not isinstance(document, io.BytesIO):
+        raise RuntimeError(f"{path} was spilled to a temp file, raise MAX_IN_MEMORY_BYTES")
+    return document
+
+def extract(path, source):
+    """Text, seconds and peak bytes allocated extracting every page of the file at path"""
+    if source == 'fetched':
+        document = fetched(path)
+        tracemalloc.start()
+        try:
+            start = time.perf_counter()
+            with lambda_function.document_buffer(document) as buffer:
+                texts = [page.extract_text() for page in PdfReader(buffer).pages]
+            seconds = time.perf_counter() - start
+            return texts, seconds, tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+            document.close()
+    with open(path, 'rb') as pdf_file:
+        if source == 'bytes':
+            pdf = pdf_file.read()
+        elif source == 'mmap':
+            pdf = mmap.mmap(pdf_file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            pdf = pdf_file
+        tracemalloc.start()
+        try:
+            start = time.perf_counter()
+            texts = [page.extract_text() for page in PdfReader(pdf).pages]
+            seconds = time.perf_counter() - start
+            return texts, seconds, tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+            if source == 'mmap':
+                pdf.close()
+
+def main(paths):
+    logging.disable(logging.WARNING)
+    # Every generated PDF is held in memory, as documents under the limit are
+    lambda_function.MAX_IN_MEMORY_BYTES = 64 * 2**20
+    with tempfile.TemporaryDirectory() as directory:
+        pdfs = []
+        for name, pages, images_per_page in GENERATED_PDFS:
+            pdf_bytes = generated_pdf(pages, images_per_page)
+            # The same objects, after offsets pointing nowhere useful
+            broken = pdf_bytes.replace(b'%PDF-1.3\n', b'%PDF-1.3\n' + b'% padding\n' * 20, 1)
+            for label, data in ((name, pdf_bytes), (name + ', bad xref', broken)):
+                path = f'{directory}/{len(pdfs)}.pdf'
+                with open(path, 'wb') as pdf_file:
+                    pdf_file.write(data)
+                pdfs.append((label, path))
+        pdfs += [(path, path) for path in paths]
+
+        failed = False
+        sources = ('file', 'bytes', 'mmap', 'fetched')
+        print(f"{'pdf':40} {'MB':>5} " + ' '.join(f"{source + ' MB peak':>13} {'ms':>6}" for source in sources))
+        for name, path in pdfs:
+            with open(path, 'rb') as pdf_file:
+                size = len(pdf_file.read())
+            expected = extract(path, 'file')[0]
+            row = f"{name[-40:]:40} {size / 2**20:5.1f}"
+            for source in sources:
+                results = [extract(path, source) for _ in range(RUNS)]
+                if results[0][0] != expected:
+                    print(f"FAIL: {name} text differs reading {source}")
+                    failed = True
+                peak = min(r[2] for r in results)
+                if source == 'fetched' and peak > size * MAX_FETCHED_PEAK_RATIO:
+                    print(f"FAIL: reading the handler's buffer of {name} allocated {peak} bytes")
+                    failed = True
+                row += f" {peak / 2**20:13.1f} {min(r[1] for r in results) * 1000:6.0f}"
+            print(row)
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,115 @@
+"""Benchmark PyPDF2's PNG predictor decoding and check it against a per-byte reference.
+
+Builds cross-reference streams (predictor 12, every row Up) and RGB image streams
+(Up, Sub, Paeth and mixed rows) from seeded random bytes, and times a per-byte
+reference decoder, the bytes-operations path, and the numpy path when numpy is
+installed. Also decodes fuzzed streams of every filter type and width. Exits
+non-zero if any path's output differs from the reference.
+
+    python check_png_predictor.py [fuzz_streams]
+"""
+import random
+import sys
+import time
+
+import cv_parser_path
+from PyPDF2 import filters
+from PyPDF2.errors import PdfReadError
+
+DEFAULT_FUZZ_STREAMS = 2000
+
+def reference_unpredict(data, rowlength):
+    """Undo PNG prediction one byte at a time, with a one-byte left neighbour"""
+    width = rowlength - 1
+    output = bytearray()
+    prev = [0] * width
+    for start in range(0, len(data), rowlength):
+        filter_byte = data[start]
+        if filter_byte > 4:
+            raise PdfReadError(f"Unsupported PNG filter {filter_byte!r}")
+        row = list(data[start + 1:start + rowlength])
+        for i in range(width):
+            left = row[i - 1] if i else 0
+            up = prev[i]
+            up_left = prev[i - 1] if i else 0
+            if filter_byte == 0:
+                predicted = 0
+            elif filter_byte == 1:
+                predicted = left
+            elif filter_byte == 2:
+                predicted = up
+            elif filter_byte == 3:
+                predicted = (left + up) // 2
+            else:
+                estimate = left + up - up_left
+                distances = [abs(estimate - left), abs(estimate - up), abs(estimate - up_left)]
+                predicted = [left, up, up_left][distances.index(min(distances))]
+            row[i] = (row[i] + predicted) % 256
+        output += bytes(row)
+        prev = row
+    return bytes(output)
+
+def decoders():
+    paths = [('bytes', filters._png_unpredict)]
+    numpy = filters._numpy()
+    if numpy is not None:
+        paths.append(('numpy', lambda data, rowlength: filters._png_unpredict_numpy(numpy, data, rowlength)))
+    return paths
+
+def outcome(decode, data, rowlength):
+    try:
+        return decode(data, rowlength)
+    except PdfReadError as error:
+        return str(error)
+
+def make_stream(rng, rows, rowlength, filter_bytes):
+    return b''.join(bytes([rng.choice(filter_bytes)]) + rng.randbytes(rowlength - 1) for _ in range(rows))
+
+def best_ms(decode, data, rowlength, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        decode(data, rowlength)
+        times.append((time.perf_counter() - start) * 1000)
+    return min(times)
+
+def main(fuzz_streams=DEFAULT_FUZZ_STREAMS):
+    rng = random.Random(0)
+    paths = decoders()
+    failed = False
+
+    streams = [
+        ('xref, 2k entries W [1 3 1]', make_stream(rng, 2000, 6, [2]), 6),
+        ('xref, 50k entries W [1 3 1]', make_stream(rng, 50000, 6, [2]), 6),
+        ('xref, 50k entries W [1 4 2]', make_stream(rng, 50000, 8, [2]), 8),
+        ('image 600x800 RGB, Up', make_stream(rng, 800, 1801, [2]), 1801),
+        ('image 600x800 RGB, Sub', make_stream(rng, 800, 1801, [1]), 1801),
+        ('image 600x800 RGB, Paeth', make_stream(rng, 800, 1801, [4]), 1801),
+        ('image 600x800 RGB, mixed', make_stream(rng, 800, 1801, [0, 1, 2, 3, 4]), 1801)
+    ]
+    print(f"{'stream':30} {'bytes':>9} {'per-byte ms':>12}" + ''.join(f" {name + ' ms':>9}" for name, _ in paths))
+    for name, data, rowlength in streams:
+        expected = reference_unpredict(data, rowlength)
+        line = f"{name:30} {len(data):9} {best_ms(reference_unpredict, data, rowlength, 1):12.1f}"
+        for path_name, decode in paths:
+            if decode(data, rowlength) != expected:
+                print(f"FAIL: {path_name} output differs from the reference for {name}")
+                failed = True
+            line += f" {best_ms(decode, data, rowlength, 3):9.2f}"
+        print(line)
+
+    for _ in range(fuzz_streams):
+        rowlength = rng.choice([1, 2, 3, 4, 5, 6, 7, 8, 13, 40, 301])
+        rows = rng.choice([1, 2, 3, 10, 50, 200])
+        filter_bytes = rng.choice([[2], [0, 1, 2, 3, 4], [0, 1, 2, 3, 4, 5]])
+        data = make_stream(rng, rows, rowlength, filter_bytes)
+        expected = outcome(reference_unpredict, data, rowlength)
+        for path_name, decode in paths:
+            if outcome(decode, data, rowlength) != expected:
+                print(f"FAIL: {path_name} output differs from the reference (rowlength {rowlength}, {rows} rows)")
+                failed = True
+    print(f"{fuzz_streams} fuzzed streams decoded by {', '.join(name for name, _ in paths)}")
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_FUZZ_STREAMS))
@@ -0,0 +1,109 @@
+"""Benchmark reading DOCX text with ranged GETs against downloading the whole file.
+
+Generates Word packages with images and embedded fonts, as CVs from design
+tools have, and extracts their text from a stand-in S3 client that takes
+S3_LATENCY_MS per GET and transfers at S3_BYTES_PER_SECOND, with
+DOCX_RANGED_READS off and on. Ranged reads are forced for every document, even
+those under DOCX_RANGED_MIN_BYTES, which the handler reads whole. Prints the
+bytes and GETs each mode took and its time (best of RUNS), and the bytes and GETs
+of the handler parsing the document with the cache off, when no HEAD request
+gives its size. Exits non-zero if the modes extract different text, ranged reads
+fetch more than a full download of a document over DOCX_RANGED_MIN_BYTES, or the
+handler does not read a document under DOCX_RANGED_MIN_BYTES whole (in at most
+two GETs) and one over it with ranged reads.
+
+    python check_ranged_docx.py
+"""
+import logging
+import os
+import sys
+import time
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+os.environ.setdefault('HEDGE_MAX_EXTRA_RATIO', '0')
+os.environ['TEXT_CACHE_ENABLED'] = 'false'
+os.environ['STAGE_METRICS_ENABLED'] = 'false'
+
+import cv_parser_path
+import lambda_function
+from sample_documents import cv_text, docx_cv
+from stand_ins import StandInS3, install
+
+S3_LATENCY_MS = 15
+S3_BYTES_PER_SECOND = 80e6
+RUNS = 3
+KB = 1024
+DOCX_RANGED_MIN_BYTES = lambda_function.DOCX_RANGED_MIN_BYTES
+
+# Name -> docx_cv arguments
+DOCUMENTS = {
+    'text_only': dict(text=cv_text()),
+    'long_text': dict(text=cv_text(200), table_rows=100),
+    'headshot': dict(text=cv_text(), media=[180 * KB]),
+    'photo_hires': dict(text=cv_text(), media=[2400 * KB]),
+    'designer': dict(text=cv_text(30), media=[900 * KB, 350 * KB, 120 * KB, 60 * KB], fonts=[420 * KB, 380 * KB]),
+    'portfolio': dict(text=cv_text(60), media=[1500 * KB] * 5 + [300 * KB] * 6, fonts=[450 * KB]),
+    'media_first': dict(text=cv_text(30), media=[1200 * KB, 800 * KB], media_first=True)
+}
+
+def extract(s3, key, ranged):
+    """Text, bytes fetched, GETs made and best ms extracting a DOCX in one mode"""
+    lambda_function.DOCX_RANGED_READS = ranged
+    lambda_function.DOCX_RANGED_MIN_BYTES = 0
+    best_ms = None
+    for _ in range(RUNS):
+        s3.calls.clear()
+        start = time.perf_counter()
+        entry, _ = lambda_function.extract_document_text('stand-in', key, '.docx', [])
+        milliseconds = (time.perf_counter() - start) * 1000
+        best_ms = milliseconds if best_ms is None else min(best_ms, milliseconds)
+    gets = sum(1 for operation, _, _ in s3.calls if operation == 'get_object')
+    return entry['text'], s3.bytes_sent(), gets, best_ms
+
+def handle(s3, key):
+    """Bytes fetched and GETs made by the handler parsing a DOCX with the cache off"""
+    lambda_function.DOCX_RANGED_READS = True
+    lambda_function.DOCX_RANGED_MIN_BYTES = DOCX_RANGED_MIN_BYTES
+    s3.calls.clear()
+    response = lambda_function.lambda_handler({'s3Bucket': 'stand-in', 's3Key': key}, None)
+    if response['statusCode'] != 200:
+        raise RuntimeError(f"{key} failed: {response['body']}")
+    gets = sum(1 for operation, _, _ in s3.calls if operation == 'get_object')
+    return s3.bytes_sent(), gets
+
+def main():
+    logging.disable(logging.CRITICAL)
+    s3 = StandInS3({f'cvs/{name}.docx': docx_cv(seed=number, **arguments)[0]
+                    for number, (name, arguments) in enumerate(DOCUMENTS.items())},
+                   latency_ms=S3_LATENCY_MS, bytes_per_second=S3_BYTES_PER_SECOND)
+    install(s3=s3)
+
+    failed = False
+    print(f"{'document':12} {'KB':>6} {'full KB':>8} {'ranged KB':>9} {'GETs':>5} {'full ms':>8} {'ranged ms':>9}"
+          f"  {'handler KB':>10} {'GETs':>5}")
+    for name in DOCUMENTS:
+        key = f'cvs/{name}.docx'
+        size = len(s3.objects[key])
+        full_text, full_bytes, _, full_ms = extract(s3, key, ranged=False)
+        ranged_text, ranged_bytes, gets, ranged_ms = extract(s3, key, ranged=True)
+        handler_bytes, handler_gets = handle(s3, key)
+        print(f"{name:12} {size / KB:6.0f} {full_bytes / KB:8.0f} {ranged_bytes / KB:9.0f} {gets:5} "
+              f"{full_ms:8.1f} {ranged_ms:9.1f}  {handler_bytes / KB:10.0f} {handler_gets:5}")
+        if ranged_text != full_text:
+            print(f"FAIL: ranged reads extracted different text from {name}")
+            failed = True
+        if size >= DOCX_RANGED_MIN_BYTES and ranged_bytes >= full_bytes:
+            print(f"FAIL: ranged reads fetched {ranged_bytes} bytes of {name}, a full download {full_bytes}")
+            failed = True
+        if size < DOCX_RANGED_MIN_BYTES and (handler_bytes != size or handler_gets > 2):
+            print(f"FAIL: the handler read {handler_bytes} bytes of {name} in {handler_gets} GETs, not whole")
+            failed = True
+        if size >= DOCX_RANGED_MIN_BYTES and handler_bytes != ranged_bytes:
+            print(f"FAIL: the handler read {handler_bytes} bytes of {name}, ranged reads {ranged_bytes}")
+            failed = True
+    print(f"S3 {S3_LATENCY_MS} ms per GET at {S3_BYTES_PER_SECOND / 1e6:.0f} MB/s; the handler reads "
+          f"documents under {DOCX_RANGED_MIN_BYTES / KB:.0f} KB whole")
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,59 @@
+"""Benchmark the education, skills and experience extractors on CVs of growing length.
+
+Times the three extractors, and the section index they slice when the package
+has one, on generated CVs of about 7, 40 and 135 KB, cleaned with clean_text as
+the pipeline does. Set CV_PARSER_DIR to time an earlier copy of the package;
+one from before the section index is timed with its extractors searching the
+whole text. Exits non-zero if an extractor finds nothing in a CV that has
+every section.
+
+    python check_section_index.py [runs]
+"""
+import logging
+import os
+import sys
+import time
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+import cv_parser_path
+import lambda_function
+from sample_documents import cv_text
+
+# Jobs added to the sample CV -> its size
+CV_JOBS = [50, 300, 1000]
+DEFAULT_RUNS = 10
+
+def extract(text):
+    """Run the three extractors (on the section index when there is one) and return their results"""
+    if hasattr(lambda_function, 'build_section_index'):
+        sections = lambda_function.build_section_index(text)
+        return [lambda_function.extract_education_info(text, sections),
+                lambda_function.extract_skills_info(text, sections),
+                lambda_function.extract_experience_info(text, sections)]
+    return [lambda_function.extract_education_info(text),
+            lambda_function.extract_skills_info(text),
+            lambda_function.extract_experience_info(text)]
+
+def main(runs=DEFAULT_RUNS):
+    # The extractors log every section they find
+    logging.disable(logging.INFO)
+    print(f"package {cv_parser_path.CV_PARSER_DIR}")
+    print(f"{'KB':>7} {'ms':>8}")
+    failed = False
+    for jobs in CV_JOBS:
+        text = lambda_function.clean_text(cv_text(jobs))
+        results = extract(text)
+        start = time.perf_counter()
+        for _ in range(runs):
+            extract(text)
+        milliseconds = (time.perf_counter() - start) / runs * 1000
+        print(f"{len(text) / 1024:7.0f} {milliseconds:8.2f}")
+        for name, result in zip(['education', 'skills', 'experience'], results):
+            if not result:
+                print(f"FAIL: no {name} found in the {len(text) / 1024:.0f} KB CV")
+                failed = True
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_RUNS))
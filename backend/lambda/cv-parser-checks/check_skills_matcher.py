@@ -0,0 +1,58 @@
+"""Check the skills taxonomy on CV phrases and on ordinary prose.
+
+Runs the taxonomy's matcher over phrases that name skills, including the
+short and lowercase forms CVs use, and over prose whose common words are
+also skill names or synonyms ("each node", "excel at", "the rest of the
+team"). Exits non-zero if a phrase misses an expected skill or prose reports
+one it should not.
+
+    python check_skills_matcher.py
+"""
+import sys
+
+import cv_parser_path
+from skills_matcher import SkillsMatcher
+
+# Phrase -> skills it must report (others may be reported too)
+MENTIONS = {
+    'Python, Node, Rails and Excel': ['Python', 'Node.js', 'Ruby on Rails', 'Excel'],
+    'python3 and nodejs': ['Python', 'Node.js'],
+    'Built REST APIs on Spark with PyTorch and Transformers': ['REST API', 'Apache Spark', 'PyTorch', 'Hugging Face'],
+    'restful services, pyspark jobs': ['REST API', 'Apache Spark'],
+    'Deployed charts with Helm on k8s': ['Helm', 'Kubernetes'],
+    'Microsoft Excel, C': ['Excel', 'C'],
+    'Ruby on Rails (RoR)': ['Ruby on Rails']
+}
+
+# Prose -> skills it may report (anything else reported is a false positive)
+PROSE = {
+    'Wrote a parser for each node of the tree': [],
+    'Laid new rails for the depot': [],
+    'I excel at C and led the rest of the team': ['C'],
+    'Took the helm of a team that could spark change': [],
+    'Passed the torch to the rest of the group': [],
+    'Maintained power transformers at the substation': [],
+    'The py files were reviewed': []
+}
+
+def main():
+    matcher = SkillsMatcher.from_file()
+    failed = False
+    for phrase, expected in MENTIONS.items():
+        found = matcher.find_skills(phrase)
+        missing = [skill for skill in expected if skill not in found]
+        print(f"{phrase:60} {', '.join(found)}")
+        if missing:
+            print(f"FAIL: '{phrase}' misses {', '.join(missing)}")
+            failed = True
+    for prose, allowed in PROSE.items():
+        found = matcher.find_skills(prose)
+        unexpected = [skill for skill in found if skill not in allowed]
+        print(f"{prose:60} {', '.join(found) or '-'}")
+        if unexpected:
+            print(f"FAIL: '{prose}' reports {', '.join(unexpected)}")
+            failed = True
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
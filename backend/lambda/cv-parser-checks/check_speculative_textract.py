@@ -0,0 +1,79 @@
+"""Benchmark speculative Textract against extracting the text layer first.
+
+Extracts generated PDFs through a stand-in Textract that answers after
+TEXTRACT_LATENCY_MS, with PDF_SPECULATIVE_TEXTRACT off and on: a one-page CV,
+a scan, a page whose text layer is slow to extract (readable, then garbled)
+and a three-page CV with blank pages in async mode. Prints each mode's time
+(best of RUNS) and the speculation's report: the winning engine, the local
+and Textract ms and the Textract call's state. Exits non-zero if the modes
+extract different text.
+
+    python check_speculative_textract.py
+"""
+import io
+import logging
+import os
+import sys
+import time
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+os.environ['TEXT_CACHE_ENABLED'] = 'false'
+
+import cv_parser_path
+import lambda_function
+from PyPDF2 import PdfReader
+from sample_documents import cv_pdf, dense_pdf, scanned_pdf
+from stand_ins import StandInS3, StandInTextract, install
+
+TEXTRACT_LATENCY_MS = 1200
+TEXTRACT_POLL_SECONDS = 0.4
+RUNS = 3
+
+# Name -> (document, Textract mode)
+DOCUMENTS = {
+    'cv': (cv_pdf(), 'sync'),
+    'scan': (scanned_pdf(512 * 1024), 'sync'),
+    'dense': (dense_pdf(), 'sync'),
+    'dense garbled': (dense_pdf(garbled=True), 'sync'),
+    'cv, 3 pages': (cv_pdf(blank_pages=2), 'async')
+}
+
+def extract(key, textract_mode, speculative, pages):
+    """Text, extraction report and best ms extracting a PDF in one mode"""
+    lambda_function.PDF_SPECULATIVE_TEXTRACT = speculative
+    lambda_function.TEXTRACT_MODE = textract_mode
+    best_ms = None
+    for _ in range(RUNS):
+        install(textract=StandInTextract(latency_ms=TEXTRACT_LATENCY_MS, pages=pages))
+        start = time.perf_counter()
+        entry, _ = lambda_function.extract_document_text('stand-in', key, '.pdf', [])
+        milliseconds = (time.perf_counter() - start) * 1000
+        best_ms = milliseconds if best_ms is None else min(best_ms, milliseconds)
+    return entry['text'], entry['extraction'], best_ms
+
+def main():
+    logging.disable(logging.CRITICAL)
+    install(s3=StandInS3({f'cvs/{name}.pdf': document for name, (document, _) in DOCUMENTS.items()}))
+    lambda_function.TEXTRACT_POLL_INITIAL_SECONDS = TEXTRACT_POLL_SECONDS
+    lambda_function.TEXTRACT_POLL_MAX_SECONDS = TEXTRACT_POLL_SECONDS
+
+    failed = False
+    print(f"Textract answers in {TEXTRACT_LATENCY_MS} ms")
+    print(f"{'document':14} {'mode':6} {'sequential ms':>13} {'speculative ms':>14}  "
+          f"winner / local ms / Textract ms / Textract state")
+    for name, (document, textract_mode) in DOCUMENTS.items():
+        key = f'cvs/{name}.pdf'
+        pages = len(PdfReader(io.BytesIO(document)).pages)
+        sequential_text, _, sequential_ms = extract(key, textract_mode, False, pages)
+        speculative_text, extraction, speculative_ms = extract(key, textract_mode, True, pages)
+        speculation = extraction.get('speculation')
+        report = speculation and ' / '.join(str(speculation[field])
+                                             for field in ('winner', 'local_ms', 'textract_ms', 'textract'))
+        print(f"{name:14} {textract_mode:6} {sequential_ms:13.0f} {speculative_ms:14.0f}  {report}")
+        if speculative_text != sequential_text:
+            print(f"FAIL: speculative Textract extracted different text from {name}")
+            failed = True
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
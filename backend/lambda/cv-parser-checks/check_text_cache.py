@@ -0,0 +1,108 @@
+"""Benchmark the extracted-text cache on the miss and hit paths of single CV requests.
+
+Parses generated CVs, with a text layer and scanned (which need Textract),
+through the handler with stand-in clients: S3 takes S3_LATENCY_MS per request and
+Textract TEXTRACT_LATENCY_MS. Each CV is parsed with the cache off, on a miss (a
+new CV), on a hit in this container's memory, on a hit in another container (its
+S3 sidecar), and re-uploaded under a new key. Prints each path's median time over
+CVS documents of a kind, the S3 reads made before the response and the sidecars
+written. Exits non-zero if a path returns a different parse; if the miss path reads
+more than HEAD, one sidecar GET and the download, writes more than one sidecar, or
+takes long enough to have waited for the write; or if a hit on a scan is not
+faster than parsing it with the cache off. (A text-layer CV parses in a few ms, so
+a sidecar hit's extra round trip can cost more than it saves.)
+
+    python check_text_cache.py
+"""
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+os.environ['STAGE_METRICS_ENABLED'] = 'false'
+
+import cv_parser_path
+import lambda_function
+from sample_documents import cv_pdf, scanned_pdf
+from stand_ins import StandInS3, StandInTextract, install
+from text_cache import TextCache
+
+S3_LATENCY_MS = 25
+TEXTRACT_LATENCY_MS = 400
+CVS = 5
+# HEAD, the sidecar GET by ETag and the download
+MAX_MISS_READS = 3
+
+def new_container(s3, directory):
+    """Give the handler an empty cache, as a new container has"""
+    lambda_function.text_cache = TextCache(lambda: s3, disk_dir=tempfile.mkdtemp(dir=directory))
+
+def parse(s3, key):
+    """Parse one CV and return its body, ms, S3 reads before the response and sidecars written"""
+    s3.calls.clear()
+    start = time.perf_counter()
+    response = lambda_function.lambda_handler({'s3Bucket': 'stand-in', 's3Key': key}, None)
+    milliseconds = (time.perf_counter() - start) * 1000
+    reads = sum(1 for operation, _, _ in s3.calls if operation != 'put_object')
+    lambda_function.text_cache.flush()
+    if response['statusCode'] != 200:
+        raise RuntimeError(f"{key} failed: {response['body']}")
+    puts = sum(1 for operation, _, _ in s3.calls if operation == 'put_object')
+    return response['body'], milliseconds, reads, puts
+
+def main():
+    logging.disable(logging.CRITICAL)
+    documents = {}
+    for number in range(CVS):
+        documents[f'cvs/cv-{number}.pdf'] = ('text layer', cv_pdf(jobs=number * 5))
+        documents[f'cvs/scan-{number}.pdf'] = ('scan', scanned_pdf(256 * 1024, seed=number))
+    s3 = StandInS3({key: document for key, (_, document) in documents.items()}, latency_ms=S3_LATENCY_MS)
+    install(s3=s3, textract=StandInTextract(latency_ms=TEXTRACT_LATENCY_MS))
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for key, (kind, document) in documents.items():
+            lambda_function.TEXT_CACHE_ENABLED = False
+            runs = {'cache off': parse(s3, key)}
+            lambda_function.TEXT_CACHE_ENABLED = True
+            new_container(s3, directory)
+            runs['miss'] = parse(s3, key)
+            runs['hit, memory'] = parse(s3, key)
+            new_container(s3, directory)
+            runs['hit, sidecar'] = parse(s3, key)
+            copy = key.replace('cvs/', 'cvs/re-uploaded/')
+            s3.objects[copy] = document
+            new_container(s3, directory)
+            runs['re-upload'] = parse(s3, copy)
+            for path, run in runs.items():
+                results.setdefault((kind, path), []).append((key, *run))
+
+    failed = False
+    print(f"S3 {S3_LATENCY_MS} ms per request, Textract {TEXTRACT_LATENCY_MS} ms, {CVS} CVs of each kind")
+    print(f"{'document':10} {'path':14} {'median ms':>9} {'reads':>5} {'sidecars':>8}")
+    uncached = {run[0]: run[1] for (_, path), runs in results.items() if path == 'cache off' for run in runs}
+    for (kind, path), runs in results.items():
+        median_ms = statistics.median(run[2] for run in runs)
+        print(f"{kind:10} {path:14} {median_ms:9.1f} {max(run[3] for run in runs):5} {max(run[4] for run in runs):8}")
+        for key, body, _, reads, puts in runs:
+            if body != uncached[key]:
+                print(f"FAIL: {key} parsed differently on the {path} path")
+                failed = True
+            if path == 'miss' and (reads > MAX_MISS_READS or puts > 1):
+                print(f"FAIL: a miss on {key} read {reads} times before its response and wrote {puts} sidecars")
+                failed = True
+        off_ms = statistics.median(run[2] for run in results[kind, 'cache off'])
+        # The cache adds MAX_MISS_READS - 1 round trips to a miss; waiting for the write would add one more
+        if path == 'miss' and median_ms >= off_ms + (MAX_MISS_READS - 0.5) * S3_LATENCY_MS:
+            print(f"FAIL: a miss on a {kind} CV took {median_ms:.0f} ms, {off_ms:.0f} ms with the cache off")
+            failed = True
+        if kind == 'scan' and path.startswith('hit') and median_ms >= off_ms:
+            print(f"FAIL: the {path} path is not faster than parsing a scan with the cache off")
+            failed = True
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
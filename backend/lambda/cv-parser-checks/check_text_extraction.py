@@ -0,0 +1,107 @@
+"""Benchmark PyPDF2 text extraction on text-heavy multi-page PDFs.
+
+Generates CV-like PDFs (two columns of positioned lines, kerned TJ arrays,
+nested cm/q/Q, fractional coordinates) and times page.extract_text, which reads
+numeric operands as plain float and int, against the same pages read through
+ContentStream, whose numbers are Decimal-based FloatObject and NumberObject.
+PDFs given as arguments are timed too. Exits non-zero if the two give different
+text for any page.
+
+    python check_text_extraction.py [file.pdf ...]
+"""
+import io
+import logging
+import random
+import sys
+import time
+
+import cv_parser_path
+from PyPDF2 import PdfReader, PdfWriter
+from PyPDF2.generic import ContentStream, DecodedStreamObject, DictionaryObject, NameObject
+
+GENERATED_PDFS = [('generated, 3 pages', 3), ('generated, 10 pages', 10), ('generated, 30 pages', 30)]
+LINES_PER_COLUMN = 60
+RUNS = 3
+
+WORDS = ['Senior', 'software', 'engineer', 'Python', 'AWS', 'Lambda', 'led', 'team', 'of', 'five',
+         'delivered', 'pipeline', 'reduced', 'latency', 'by', '40%', 'Kubernetes', 'PostgreSQL']
+
+def generated_page(rng):
+    lines = [b'q 0.75 0 0 0.75 0 0 cm']
+    for column, x in enumerate((54.024, 320.5)):
+        lines.append(b'q 1 0 0 1 %.3f 0 cm BT /F1 10.5 Tf 12.6 TL' % (x * column / 4))
+        lines.append(b'1 0 0 1 %.3f %.3f Tm' % (x, 760.875))
+        for line in range(LINES_PER_COLUMN):
+            words = [rng.choice(WORDS) for _ in range(rng.randint(3, 8))]
+            choice = rng.random()
+            if choice < 0.4:
+                kerned = b' '.join(b'(%s) -%d' % (word.encode(), rng.randint(180, 320)) for word in words)
+                lines.append(b'0 -%.4f Td [%s] TJ' % (rng.uniform(11.5, 13.5), kerned))
+            elif choice < 0.7:
+                lines.append(b'1 0 0 1 %.3f %.3f Tm (%s) Tj' % (x, 740 - line * 12.35, ' '.join(words).encode()))
+            elif choice < 0.9:
+                lines.append(b'T* (%s) Tj 0.2 Tw' % ' '.join(words).encode())
+            else:
+                lines.append(b'%.2f 0 TD (%s) \'' % (rng.uniform(2, 20), ' '.join(words).encode()))
+        lines.append(b'ET Q')
+    lines.append(b'Q')
+    return b'\n'.join(lines)
+
+def generated_pdf(rng, pages):
+    writer = PdfWriter()
+    font = DictionaryObject({
+        NameObject('/Type'): NameObject('/Font'),
+        NameObject('/Subtype'): NameObject('/Type1'),
+        NameObject('/BaseFont'): NameObject('/Helvetica')
+    })
+    for _ in range(pages):
+        # add_blank_page returns the page it was given, not the copy it added
+        writer.add_blank_page(612, 792)
+        page = writer.pages[-1]
+        page[NameObject('/Resources')] = DictionaryObject({
+            NameObject('/Font'): DictionaryObject({NameObject('/F1'): font})
+        })
+        contents = DecodedStreamObject()
+        contents.set_data(generated_page(rng))
+        page[NameObject('/Contents')] = writer._add_object(contents)
+    output = io.BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+def extract(pdf_bytes, through_content_stream):
+    """Text and seconds of extract_text over every page of a freshly read PDF"""
+    reader = PdfReader(io.BytesIO(pdf_bytes))
+    pages = list(reader.pages)
+    texts = []
+    start = time.perf_counter()
+    for page in pages:
+        if through_content_stream and '/Contents' in page:
+            # _extract_text uses a ContentStream it is given as it is
+            page[NameObject('/Contents')] = ContentStream(page['/Contents'], reader, 'bytes')
+        texts.append(page.extract_text())
+    return texts, time.perf_counter() - start
+
+def main(paths):
+    logging.disable(logging.WARNING)
+    rng = random.Random(0)
+    pdfs = [(name, generated_pdf(rng, pages)) for name, pages in GENERATED_PDFS]
+    for path in paths:
+        with open(path, 'rb') as pdf_file:
+            pdfs.append((path, pdf_file.read()))
+
+    failed = False
+    print(f"{'pdf':40} {'pages':>6} {'ContentStream ms':>17} {'extract_text ms':>16} {'ms/page':>8}")
+    for name, pdf_bytes in pdfs:
+        expected, _ = extract(pdf_bytes, True)
+        texts, _ = extract(pdf_bytes, False)
+        slow = min(extract(pdf_bytes, True)[1] for _ in range(RUNS)) * 1000
+        fast = min(extract(pdf_bytes, False)[1] for _ in range(RUNS)) * 1000
+        print(f"{name[-40:]:40} {len(texts):6} {slow:17.1f} {fast:16.1f} {fast / len(texts):8.2f}")
+        for number, (text, expected_text) in enumerate(zip(texts, expected)):
+            if text != expected_text:
+                print(f"FAIL: {name} page {number + 1} text differs from ContentStream's")
+                failed = True
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,77 @@
+"""Benchmark sending scanned single-page CVs to Textract as S3 objects rather than inline bytes.
+
+Parses generated one-page scans of about 1.5 and 6 MB through the handler with
+stand-in S3 and Textract clients, with TEXTRACT_S3_OBJECT on and off. Prints
+the response status, Textract requests, document bytes uploaded to Textract,
+the handler's time (median of RUNS) and the time the upload would take at
+UPLOAD_BYTES_PER_SECOND. Then parses two scans from a bucket Textract cannot
+read. Exits non-zero if a scan is sent inline from a bucket Textract can read,
+fails in S3Object mode, or a bucket Textract cannot read costs more than one
+rejected request.
+
+    python check_textract_s3_object.py
+"""
+import logging
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+os.environ['TEXT_CACHE_ENABLED'] = 'false'
+os.environ['STAGE_METRICS_ENABLED'] = 'false'
+
+import cv_parser_path
+import lambda_function
+from sample_documents import scanned_pdf
+from stand_ins import StandInS3, StandInTextract, install
+
+# Name -> image bytes on the page
+SCANS = {'scan, 1.5 MB': 3 * 2**19, 'scan, 6 MB': 6 * 2**20}
+RUNS = 5
+UPLOAD_BYTES_PER_SECOND = 50e6
+
+def parse(key, bucket='stand-in'):
+    """Parse one CV and return the handler's response, its ms and the Textract requests made"""
+    textract = StandInTextract(unreadable_buckets={'unreadable'})
+    install(textract=textract)
+    start = time.perf_counter()
+    response = lambda_function.lambda_handler({'s3Bucket': bucket, 's3Key': key}, None)
+    return response, (time.perf_counter() - start) * 1000, textract
+
+def main():
+    logging.disable(logging.CRITICAL)
+    objects = {f'cvs/{name}.pdf': scanned_pdf(size) for name, size in SCANS.items()}
+    install(s3=StandInS3(objects))
+
+    failed = False
+    print(f"{'document':14} {'MB':>5} {'mode':9} {'status':>6} {'requests':>8} {'bytes sent':>10} "
+          f"{'ms':>6} {'+ upload ms':>11}")
+    for name in SCANS:
+        key = f'cvs/{name}.pdf'
+        for s3_object in (True, False):
+            lambda_function.TEXTRACT_S3_OBJECT = s3_object
+            runs = [parse(key) for _ in range(RUNS)]
+            response, _, textract = runs[-1]
+            sent = textract.inline_bytes_sent()
+            print(f"{name:14} {len(objects[key]) / 1e6:5.2f} {'S3Object' if s3_object else 'inline':9} "
+                  f"{response['statusCode']:6} {len(textract.calls):8} {sent:10} "
+                  f"{statistics.median(run[1] for run in runs):6.1f} {sent / UPLOAD_BYTES_PER_SECOND * 1000:11.1f}")
+            if s3_object and (sent or response['statusCode'] != 200):
+                print(f"FAIL: {name} was sent as {sent} inline bytes with status {response['statusCode']}")
+                failed = True
+
+    # The first CV from the bucket finds out Textract cannot read it, the second goes straight to bytes
+    lambda_function.TEXTRACT_S3_OBJECT = True
+    key = 'cvs/scan, 1.5 MB.pdf'
+    for number, allowed_requests in ((1, 2), (2, 1)):
+        response, _, textract = parse(key, bucket='unreadable')
+        print(f"unreadable bucket, CV {number}: status {response['statusCode']}, {len(textract.calls)} requests, "
+              f"{textract.inline_bytes_sent()} bytes sent")
+        if response['statusCode'] != 200 or len(textract.calls) > allowed_requests:
+            print(f"FAIL: CV {number} from a bucket Textract cannot read made {len(textract.calls)} requests")
+            failed = True
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
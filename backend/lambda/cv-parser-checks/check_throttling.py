@@ -0,0 +1,158 @@
+"""Load-test the AWS retry settings against a throttling stand-in for Textract.
+
+Worker threads share one Textract client, as batch workers share a container's
+client, and call detect_document_text as fast as they can. A stand-in endpoint
+(a botocore before-send hook, so botocore's own retry and rate limiting code runs)
+serves QUOTA_TPS requests per second and answers the rest with
+ProvisionedThroughputExceededException. The run is repeated for each retry mode,
+printing the attempts sent, throttled attempts, failed calls and call latency, and
+the counts aws_clients publishes as metrics. Exits non-zero if the batch mode
+(AWS_BATCH_RETRY_MODE, adaptive by default) is throttled as often as legacy retries,
+if the mode of single CV requests (AWS_RETRY_MODE, standard by default) holds one
+call in a hundred longer than MAX_DRAIN_RATIO times the time the stand-in needs to
+serve every call at its quota (a synchronous parse has to finish within its
+Deadline, and adaptive mode's rate limiter sleeps regardless of it), or if the
+published counts disagree with what the stand-in saw.
+
+    python check_throttling.py [workers] [calls_per_worker] [quota_tps]
+"""
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+# The stand-in never checks signatures
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'stand-in')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'stand-in')
+
+import cv_parser_path
+import aws_clients
+
+DEFAULT_WORKERS = 8
+DEFAULT_CALLS_PER_WORKER = 8
+DEFAULT_QUOTA_TPS = 10
+LATENCY_MS = 30
+RETRY_MODES = ['legacy', 'standard', 'adaptive']
+MAX_DRAIN_RATIO = 2
+
+class StandInBody:
+    def __init__(self, body):
+        self.body = body
+
+    def stream(self, **kwargs):
+        yield self.body
+
+class ThrottlingTextract:
+    """Stand-in Textract endpoint that serves quota_tps requests per second and throttles the rest"""
+
+    def __init__(self, quota_tps):
+        self.quota_tps = quota_tps
+        self.tokens = float(quota_tps)
+        self.refilled = time.monotonic()
+        self.attempts = 0
+        self.throttled = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, request, **kwargs):
+        from botocore.awsrequest import AWSResponse
+
+        time.sleep(LATENCY_MS / 1000)
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.quota_tps, self.tokens + (now - self.refilled) * self.quota_tps)
+            self.refilled = now
+            self.attempts += 1
+            served = self.tokens >= 1
+            if served:
+                self.tokens -= 1
+            else:
+                self.throttled += 1
+        if served:
+            status, body = 200, {'DocumentMetadata': {'Pages': 1}, 'Blocks': []}
+        else:
+            status, body = 400, {'__type': 'ProvisionedThroughputExceededException', 'Message': 'Rate exceeded'}
+        headers = {'x-amzn-RequestId': 'stand-in', 'Content-Type': 'application/x-amz-json-1.1'}
+        return AWSResponse(request.url, status, headers, StandInBody(json.dumps(body).encode()))
+
+def run(retry_mode, workers, calls_per_worker, quota_tps):
+    """Run the load against a fresh client and stand-in, and return the results"""
+    client = aws_clients.create_client('textract', aws_clients.client_config(retry_mode=retry_mode))
+    stand_in = ThrottlingTextract(quota_tps)
+    client.meta.events.register('before-send.textract', stand_in)
+    aws_clients.take_retry_counts()
+
+    def call():
+        start = time.perf_counter()
+        try:
+            client.detect_document_text(Document={'Bytes': b'%PDF-1.4'})
+            failed = False
+        except client.exceptions.ProvisionedThroughputExceededException:
+            failed = True
+        return (time.perf_counter() - start) * 1000, failed
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(lambda _: call(), range(workers * calls_per_worker)))
+    wall_s = time.perf_counter() - start
+    latencies = sorted(latency for latency, _ in results)
+    return {
+        'wall_s': wall_s,
+        'attempts': stand_in.attempts,
+        'throttled': stand_in.throttled,
+        'failed': sum(failed for _, failed in results),
+        'p50_ms': latencies[len(latencies) // 2],
+        'p99_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+        'counts': aws_clients.take_retry_counts().get('textract', {})
+    }
+
+def main(workers=DEFAULT_WORKERS, calls_per_worker=DEFAULT_CALLS_PER_WORKER, quota_tps=DEFAULT_QUOTA_TPS):
+    logging.disable(logging.INFO)
+    calls = workers * calls_per_worker
+    print(f"{workers} workers sharing a client, {calls} calls, quota {quota_tps} TPS, "
+          f"{aws_clients.MAX_ATTEMPTS} attempts per call")
+    print(f"{'mode':10} {'wall s':>7} {'attempts':>9} {'throttled':>10} {'failed':>7} {'p50 ms':>8} {'p99 ms':>8}"
+          f"  published (retries / throttled / failed / quota reached)")
+    results = {}
+    for retry_mode in RETRY_MODES:
+        result = results[retry_mode] = run(retry_mode, workers, calls_per_worker, quota_tps)
+        counts = result['counts']
+        print(f"{retry_mode:10} {result['wall_s']:7.1f} {result['attempts']:9} {result['throttled']:10} "
+              f"{result['failed']:7} {result['p50_ms']:8.0f} {result['p99_ms']:8.0f}"
+              f"  {counts.get('retries')} / {counts.get('throttles')} / {counts.get('throttled_failures')}"
+              f" / {counts.get('retry_quota_reached')}")
+
+    failed = False
+    batch = results.get(aws_clients.BATCH_RETRY_MODE)
+    if batch is not None and batch['throttled'] >= results['legacy']['throttled']:
+        print(f"FAIL: {aws_clients.BATCH_RETRY_MODE} retries were throttled {batch['throttled']} times, "
+              f"legacy retries {results['legacy']['throttled']}")
+        failed = True
+    configured = results.get(aws_clients.RETRY_MODE)
+    drain_ms = calls / quota_tps * 1000
+    if configured is not None and configured['p99_ms'] > drain_ms * MAX_DRAIN_RATIO:
+        print(f"FAIL: {aws_clients.RETRY_MODE} retries held calls for {configured['p99_ms']:.0f} ms (p99), over "
+              f"{MAX_DRAIN_RATIO}x the {drain_ms:.0f} ms the stand-in needs to serve every call")
+        failed = True
+    for retry_mode, result in results.items():
+        counts = result['counts']
+        expected = {
+            'calls': calls,
+            'retries': result['attempts'] - calls,
+            'throttles': result['throttled'],
+            'throttled_failures': result['failed']
+        }
+        mismatched = {key: (counts.get(key), value) for key, value in expected.items() if counts.get(key) != value}
+        if mismatched:
+            print(f"FAIL: {retry_mode} published counts differ from the stand-in (published, actual): {mismatched}")
+            failed = True
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    worker_count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_WORKERS
+    per_worker = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_CALLS_PER_WORKER
+    quota = float(sys.argv[3]) if len(sys.argv) > 3 else DEFAULT_QUOTA_TPS
+    sys.exit(main(worker_count, per_worker, quota))
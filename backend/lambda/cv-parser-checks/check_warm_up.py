@@ -0,0 +1,117 @@
+"""Benchmark the first CV request of a container, cold and after a warm-up ping.
+
+Each run is a fresh interpreter that imports the handler and parses one
+generated CV, either straight away or after a {"warmup": true} ping. Clients
+are created for real (session, service models, endpoints); their requests
+are answered by stand-ins, each client's first one after HANDSHAKE_MS as a new
+TLS connection would be. Prints the median time of the first CV request (over
+7 runs by default), and exits non-zero if a warm-up ping does not make it faster
+or sends Textract a request (each one spends Textract's TPS quota).
+
+    python check_warm_up.py [runs]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import cv_parser_path
+
+DEFAULT_RUNS = 7
+HANDSHAKE_MS = [0, 60]
+
+class Connection:
+    """A real client whose requests a stand-in answers, the first after a handshake"""
+
+    def __init__(self, client, stand_in, handshake_ms):
+        self._client = client
+        self._stand_in = stand_in
+        self._handshake_ms = handshake_ms
+        self._connected = False
+
+    def __getattr__(self, name):
+        if not hasattr(self._stand_in, name):
+            # meta, exceptions, ... come from the real client
+            return getattr(self._client, name)
+        method = getattr(self._stand_in, name)
+
+        def call(*args, **kwargs):
+            if not self._connected:
+                time.sleep(self._handshake_ms / 1000)
+                self._connected = True
+            return method(*args, **kwargs)
+        return call
+
+def first_request(mode, path, handshake_ms):
+    """Time the first CV request in this interpreter and print it in ms"""
+    os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+    os.environ['TEXT_CACHE_ENABLED'] = 'false'
+    os.environ['STAGE_METRICS_ENABLED'] = 'false'
+    # Imported here so the measured interpreter loads nothing the handler would not
+    import logging
+
+    import aws_clients
+    import lambda_function
+    from stand_ins import StandInS3, StandInTextract
+
+    logging.disable(logging.CRITICAL)
+    key = 'cvs/' + os.path.basename(path)
+    with open(path, 'rb') as file:
+        stand_ins = {'s3': StandInS3({key: file.read()}), 'textract': StandInTextract()}
+    create_session = aws_clients._create_session
+
+    class Session:
+        def __init__(self):
+            self._session = create_session()
+
+        def client(self, service_name, config=None):
+            return Connection(self._session.client(service_name, config=config),
+                              stand_ins[service_name], handshake_ms)
+
+    aws_clients._create_session = Session
+    if mode == 'warm':
+        lambda_function.lambda_handler({'warmup': True, 's3Bucket': 'stand-in'}, None)
+        if stand_ins['textract'].calls:
+            raise RuntimeError(f"The warm-up ping sent Textract {stand_ins['textract'].calls}")
+    start = time.perf_counter()
+    response = lambda_function.lambda_handler({'s3Bucket': 'stand-in', 's3Key': key}, None)
+    milliseconds = (time.perf_counter() - start) * 1000
+    if response['statusCode'] != 200:
+        raise RuntimeError(f"{key} failed: {response['body']}")
+    print(json.dumps(milliseconds))
+
+def main(runs=DEFAULT_RUNS):
+    from sample_documents import cv_pdf, cv_text, docx_cv
+
+    failed = False
+    print(f"{'document':10} {'handshake ms':>12} {'cold ms':>8} {'after ping ms':>13}  (median of {runs})")
+    with tempfile.TemporaryDirectory() as directory:
+        documents = {'cv.pdf': cv_pdf(), 'cv.docx': docx_cv(cv_text())[0]}
+        for name, document in documents.items():
+            with open(os.path.join(directory, name), 'wb') as file:
+                file.write(document)
+        for name in documents:
+            for handshake_ms in HANDSHAKE_MS:
+                medians = {}
+                for mode in ('cold', 'warm'):
+                    medians[mode] = statistics.median(
+                        json.loads(subprocess.run(
+                            [sys.executable, __file__, mode, os.path.join(directory, name), str(handshake_ms)],
+                            capture_output=True, text=True, check=True
+                        ).stdout)
+                        for _ in range(runs)
+                    )
+                print(f"{name:10} {handshake_ms:12} {medians['cold']:8.1f} {medians['warm']:13.1f}")
+                if medians['warm'] >= medians['cold']:
+                    print(f"FAIL: a warm-up ping did not speed up the first request for {name}")
+                    failed = True
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    if len(sys.argv) == 4:
+        first_request(sys.argv[1], sys.argv[2], float(sys.argv[3]))
+    else:
+        sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_RUNS))
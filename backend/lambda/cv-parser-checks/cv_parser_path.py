@@ -0,0 +1,18 @@
+"""Put the cv-parser Lambda package on sys.path for the checks in this directory.
+
+The checks sit outside the package so deployment zips do not ship them; each
+imports this module before any of the package's modules. Setting CV_PARSER_DIR
+runs them against another copy of the package instead, such as a git worktree
+of an earlier commit, to reproduce before-and-after measurements.
+"""
+import os
+import sys
+
+CV_PARSER_DIR = os.path.normpath(os.environ.get('CV_PARSER_DIR') or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), os.pardir, 'cv-parser'))
+
+if CV_PARSER_DIR not in sys.path:
+    # After this directory and PYTHONPATH, so PYTHONPATH can stand in for a vendored
+    # library that does not load here (the package's lxml is a Windows build)
+    sys.path.insert(1 + len([entry for entry in os.environ.get('PYTHONPATH', '').split(os.pathsep) if entry]),
+                    CV_PARSER_DIR)
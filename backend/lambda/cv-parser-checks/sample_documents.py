@@ -0,0 +1,178 @@
+"""Generated CVs for the checks and benchmarks, so no real CV has to be committed."""
+import io
+import random
+import zipfile
+from xml.sax.saxutils import escape
+
+import cv_parser_path
+from PyPDF2 import PdfWriter
+from PyPDF2.generic import DecodedStreamObject, DictionaryObject, NameObject, NumberObject
+
+CV_TEXT = """JANE DOE
+jane.doe@mail.com
+Phone: +44 7700 900123
+Summary: Backend engineer with 8 years building distributed systems.
+Education:
+University of Manchester, BSc in Computer Science, 2012 - 2015.
+Imperial College London, MSc in Machine Learning, 2016.
+Skills:
+Programming Languages: Python, Java, Go
+Cloud: AWS, Docker, Kubernetes
+Certifications:
+- AWS Certified Solutions Architect Associate
+- Certified Kubernetes Administrator
+Work Experience:
+Senior Software Engineer at Acme Ltd 2018 - Present.
+Led migration of payment services to Kubernetes and reduced latency by 40 percent.
+Software Engineer at Initech 2015 - 2018.
+Built REST APIs in Django and maintained PostgreSQL databases for reporting.
+Projects:
+Resume Parser.
+Developed a CV parsing tool with Python and AWS Lambda that extracts sections.
+Chess Engine.
+Built a chess engine in Rust with alpha-beta pruning and a web UI.
+References:
+Available on request.
+"""
+
+def cv_text(jobs=0):
+    """CV_TEXT with that many more jobs in its work experience (each about 130 characters)"""
+    lines = [f"Engineer {job} at Company{job} 20{job % 20:02d} - 20{(job + 1) % 20:02d}.\n"
+             f"Developed services with Python and Java for team {job} and improved reliability across regions.\n"
+             for job in range(jobs)]
+    return CV_TEXT.replace("Projects:", "".join(lines) + "Projects:")
+
+def pdf_string(text):
+    return b'(' + text.encode('latin-1').replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)') + b')'
+
+def text_pdf(pages):
+    """A PDF with a Helvetica text layer, given each page's lines (no lines for a blank page)"""
+    writer = PdfWriter()
+    font = DictionaryObject({
+        NameObject('/Type'): NameObject('/Font'),
+        NameObject('/Subtype'): NameObject('/Type1'),
+        NameObject('/BaseFont'): NameObject('/Helvetica')
+    })
+    for lines in pages:
+        # add_blank_page returns the page it was given, not the copy it added
+        writer.add_blank_page(612, 792)
+        page = writer.pages[-1]
+        page[NameObject('/Resources')] = DictionaryObject({
+            NameObject('/Font'): DictionaryObject({NameObject('/F1'): font})
+        })
+        contents = DecodedStreamObject()
+        contents.set_data(b'\n'.join([b'BT /F1 11 Tf 14 TL 50 760 Td']
+                                     + [pdf_string(line) + b' Tj T*' for line in lines] + [b'ET']))
+        page[NameObject('/Contents')] = writer._add_object(contents)
+    output = io.BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+def cv_pdf(jobs=0, blank_pages=0):
+    """The sample CV as a one-page PDF, followed by blank pages (which need Textract)"""
+    lines = [line for line in cv_text(jobs).splitlines() if line.strip()]
+    return text_pdf([lines] + [[]] * blank_pages)
+
+def dense_pdf(garbled=False, lines=6000):
+    """A one-page PDF whose text layer is slow to extract: thousands of text-showing operators,
+    of ordinary text or of symbols that fail the page quality score"""
+    # Currency sign, broken bar, diaeresis and not sign: symbols no CV is written in
+    line = ' '.join(['\xa4\xa6\xa8\xac'] * 4) if garbled else 'Senior engineer, Python and AWS.'
+    return text_pdf([[line] * lines])
+
+def scanned_pdf(image_bytes, seed=0):
+    """A one-page PDF that is only a scanned image (JPEG-filtered random bytes, never decoded)"""
+    writer = PdfWriter()
+    writer.add_blank_page(612, 792)
+    page = writer.pages[-1]
+    image = DecodedStreamObject()
+    image.set_data(random.Random(seed).randbytes(image_bytes))
+    image.update({
+        NameObject('/Type'): NameObject('/XObject'),
+        NameObject('/Subtype'): NameObject('/Image'),
+        NameObject('/Width'): NumberObject(2480),
+        NameObject('/Height'): NumberObject(3508),
+        NameObject('/ColorSpace'): NameObject('/DeviceRGB'),
+        NameObject('/BitsPerComponent'): NumberObject(8),
+        NameObject('/Filter'): NameObject('/DCTDecode')
+    })
+    page[NameObject('/Resources')] = DictionaryObject({
+        NameObject('/XObject'): DictionaryObject({NameObject('/Im0'): writer._add_object(image)})
+    })
+    contents = DecodedStreamObject()
+    contents.set_data(b'q 612 0 0 792 0 0 cm /Im0 Do Q')
+    page[NameObject('/Contents')] = writer._add_object(contents)
+    output = io.BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+WORD_NAMESPACE = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+CONTENT_TYPES = ('<?xml version="1.0" encoding="UTF-8"?>'
+                 '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                 '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+                 '<Default Extension="xml" ContentType="application/xml"/>'
+                 '<Override PartName="/word/document.xml" ContentType="application/'
+                 'vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/></Types>')
+PACKAGE_RELATIONSHIPS = ('<?xml version="1.0" encoding="UTF-8"?>'
+                         '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+                         '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+                         'relationships/officeDocument" Target="word/document.xml"/></Relationships>')
+DOCUMENT_RELATIONSHIPS = ('<?xml version="1.0" encoding="UTF-8"?>'
+                          '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships"/>')
+
+def docx_paragraph(text):
+    return (f'<w:p><w:pPr><w:pStyle w:val="Normal"/></w:pPr><w:r><w:rPr><w:b/></w:rPr>'
+            f'<w:t xml:space="preserve">{escape(text)}</w:t></w:r></w:p>')
+
+def docx_table(rows):
+    return ('<w:tbl><w:tblGrid>' + '<w:gridCol w:w="2000"/>' * len(rows[0]) + '</w:tblGrid>'
+            + ''.join('<w:tr>' + ''.join(f'<w:tc>{docx_paragraph(cell)}</w:tc>' for cell in row) + '</w:tr>'
+                      for row in rows)
+            + '</w:tbl>')
+
+def docx_styles(count):
+    return (f'<w:styles xmlns:w="{WORD_NAMESPACE}">'
+            + ''.join(f'<w:style w:styleId="S{number}"><w:name w:val="Style {number}"/>'
+                      f'<w:rPr><w:sz w:val="22"/></w:rPr></w:style>' for number in range(count))
+            + '</w:styles>')
+
+def docx_cv(text, table_rows=0, media=(), fonts=(), media_first=False, seed=0):
+    """A Word package holding a CV's lines as paragraphs, with a two-row table after its
+    header and a table of that many rows at the end. media and fonts are the sizes of
+    JPEG images and embedded fonts to include (random bytes, stored uncompressed as Word
+    stores them); media_first puts the images ahead of the document part in the zip.
+
+    Returns the package and its paragraphs, in document order.
+    """
+    lines = [line for line in text.splitlines() if line.strip()]
+    header_table = [['Skills', 'Python, Java'], ['Languages', 'English']]
+    end_table = [[f'Row {row} column {column} text' for column in range(4)] for row in range(table_rows)]
+    body = ''.join(docx_paragraph(line) for line in lines[:6]) + docx_table(header_table)
+    body += ''.join(docx_paragraph(line) for line in lines[6:])
+    if end_table:
+        body += docx_table(end_table)
+    paragraphs = lines[:6] + [cell for row in header_table for cell in row] + lines[6:]
+    paragraphs += [cell for row in end_table for cell in row]
+
+    document = (f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                f'<w:document xmlns:w="{WORD_NAMESPACE}"><w:body>{body}<w:sectPr/></w:body></w:document>')
+    generator = random.Random(seed)
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED) as package:
+        def write_media():
+            for number, size in enumerate(media, 1):
+                package.writestr(zipfile.ZipInfo(f'word/media/image{number}.jpeg'), generator.randbytes(size),
+                                 compress_type=zipfile.ZIP_STORED)
+        package.writestr('[Content_Types].xml', CONTENT_TYPES)
+        package.writestr('_rels/.rels', PACKAGE_RELATIONSHIPS)
+        if media_first:
+            write_media()
+        package.writestr('word/document.xml', document)
+        package.writestr('word/_rels/document.xml.rels', DOCUMENT_RELATIONSHIPS)
+        package.writestr('word/styles.xml', docx_styles(300))
+        package.writestr('word/settings.xml', f'<w:settings xmlns:w="{WORD_NAMESPACE}"/>')
+        if not media_first:
+            write_media()
+        for number, size in enumerate(fonts, 1):
+            package.writestr(f'word/fonts/font{number}.odttf', generator.randbytes(size))
+    return output.getvalue(), paragraphs
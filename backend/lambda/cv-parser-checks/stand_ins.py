@@ -0,0 +1,179 @@
+"""Stand-in S3 and Textract clients for the checks that run CVs through the handler.
+
+StandInS3 serves objects from a dict and honours Range and IfMatch as S3 does;
+StandInTextract answers text detection, synchronous or as a job, with one line
+of text per page. Both can add latency to each request and record the calls
+they answered. install() makes aws_clients hand them out instead of real clients.
+"""
+import hashlib
+import threading
+import time
+
+import cv_parser_path
+import aws_clients
+from botocore.exceptions import ClientError
+
+# Textract's limit on inline document bytes
+TEXTRACT_MAX_INLINE_BYTES = 5 * 1024 * 1024
+
+class StreamingBody:
+    """A response body like botocore's StreamingBody: every read returns newly allocated
+    bytes, as reads from a connection do, so a reader's memory use is what it keeps"""
+
+    def __init__(self, data):
+        self._data = memoryview(data)
+        self._position = 0
+
+    def read(self, amt=None):
+        end = len(self._data) if amt is None or amt < 0 else min(self._position + amt, len(self._data))
+        chunk = bytes(self._data[self._position:end])
+        self._position = end
+        return chunk
+
+    def iter_chunks(self, chunk_size=1024):
+        while True:
+            chunk = self.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+    def close(self):
+        pass
+
+def client_error(code, operation_name, message=''):
+    return ClientError({'Error': {'Code': code, 'Message': message}}, operation_name)
+
+def etag(data):
+    return '"%s"' % hashlib.md5(data).hexdigest()
+
+class StandInS3:
+    """S3 client over a dict of key -> bytes. Each request waits latency_ms, and a GET
+    also waits for its bytes to arrive at bytes_per_second when one is given."""
+
+    def __init__(self, objects=None, latency_ms=0, bytes_per_second=None):
+        self.objects = dict(objects or {})
+        self.latency_ms = latency_ms
+        self.bytes_per_second = bytes_per_second
+        self.calls = []
+        self._etags = {}
+        self._lock = threading.Lock()
+
+    def _request(self, operation, key, transferred=0):
+        with self._lock:
+            self.calls.append((operation, key, transferred))
+        delay = self.latency_ms / 1000
+        if self.bytes_per_second:
+            delay += transferred / self.bytes_per_second
+        if delay:
+            time.sleep(delay)
+
+    def _object(self, key, operation, operation_name):
+        try:
+            return self.objects[key]
+        except KeyError:
+            # A request for a missing object still takes a round trip
+            self._request(operation, key)
+            raise client_error('NoSuchKey', operation_name, f'No object {key}') from None
+
+    def _etag(self, key, data):
+        # Hashing a large object on every request would dwarf the work being measured
+        cached = self._etags.get(key)
+        if cached is None or cached[0] is not data:
+            cached = self._etags[key] = (data, etag(data))
+        return cached[1]
+
+    def bytes_sent(self):
+        """Bytes returned by GET requests so far"""
+        return sum(transferred for operation, _, transferred in self.calls if operation == 'get_object')
+
+    def head_bucket(self, Bucket):
+        self._request('head_bucket', None)
+        return {}
+
+    def head_object(self, Bucket, Key, **kwargs):
+        data = self._object(Key, 'head_object', 'HeadObject')
+        self._request('head_object', Key)
+        return {'ETag': self._etag(Key, data), 'ContentLength': len(data)}
+
+    def get_object(self, Bucket, Key, Range=None, IfMatch=None, **kwargs):
+        data = self._object(Key, 'get_object', 'GetObject')
+        if IfMatch is not None and IfMatch != self._etag(Key, data):
+            raise client_error('PreconditionFailed', 'GetObject')
+        response = {'ETag': self._etag(Key, data)}
+        if Range is not None:
+            # "bytes=<first>-<last>", "bytes=<first>-" or "bytes=-<suffix length>"
+            first, last = Range[len('bytes='):].split('-')
+            if first:
+                start, end = int(first), min(int(last) + 1 if last else len(data), len(data))
+            else:
+                start, end = max(0, len(data) - int(last)), len(data)
+            response['ContentRange'] = f'bytes {start}-{end - 1}/{len(data)}'
+            data = data[start:end]
+        self._request('get_object', Key, len(data))
+        response.update({'Body': StreamingBody(data), 'ContentLength': len(data)})
+        return response
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self._request('put_object', Key)
+        with self._lock:
+            self.objects[Key] = Body
+        return {'ETag': etag(Body)}
+
+class StandInTextract:
+    """Textract client answering with one LINE block per page after latency_ms, whether
+    called synchronously or as a job (whose result is ready latency_ms after it starts).
+    Inline documents over Textract's size limit are rejected as Textract rejects them,
+    and so are S3 objects in unreadable_buckets (another region, a KMS key it cannot use)."""
+
+    def __init__(self, latency_ms=0, pages=1, unreadable_buckets=()):
+        self.latency_ms = latency_ms
+        self.pages = pages
+        self.unreadable_buckets = set(unreadable_buckets)
+        self.calls = []
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def _blocks(self, pages):
+        return [{'BlockType': 'LINE', 'Page': page, 'Text': f'Text detected by Textract on page {page}'}
+                for page in range(1, pages + 1)]
+
+    def inline_bytes_sent(self):
+        """Document bytes sent inline to detect_document_text so far"""
+        return sum(size for operation, size in self.calls if operation == 'detect_document_text')
+
+    def detect_document_text(self, Document):
+        size = len(Document.get('Bytes', b''))
+        with self._lock:
+            self.calls.append(('detect_document_text', size))
+        if size > TEXTRACT_MAX_INLINE_BYTES:
+            raise client_error('ValidationException', 'DetectDocumentText',
+                               f'Member must have length less than or equal to {TEXTRACT_MAX_INLINE_BYTES}')
+        if Document.get('S3Object', {}).get('Bucket') in self.unreadable_buckets:
+            raise client_error('InvalidS3ObjectException', 'DetectDocumentText', 'Unable to get object metadata from S3')
+        time.sleep(self.latency_ms / 1000)
+        return {'Blocks': self._blocks(1)}
+
+    def start_document_text_detection(self, DocumentLocation):
+        with self._lock:
+            self.calls.append(('start_document_text_detection', 0))
+            job_id = f'job-{len(self._jobs) + 1}'
+            self._jobs[job_id] = time.monotonic() + self.latency_ms / 1000
+        return {'JobId': job_id}
+
+    def get_document_text_detection(self, JobId, MaxResults=1000, NextToken=None):
+        with self._lock:
+            self.calls.append(('get_document_text_detection', 0))
+            ready_at = self._jobs.get(JobId)
+        if ready_at is None:
+            raise client_error('InvalidJobIdException', 'GetDocumentTextDetection')
+        if time.monotonic() < ready_at:
+            return {'JobStatus': 'IN_PROGRESS'}
+        return {'JobStatus': 'SUCCEEDED', 'Blocks': self._blocks(self.pages)}
+
+def install(s3=None, textract=None):
+    """Make aws_clients.get_client return the given stand-ins, in single and batch invocations"""
+    for mode in (aws_clients.RETRY_MODE, aws_clients.BATCH_RETRY_MODE):
+        if s3 is not None:
+            aws_clients._clients['s3', mode] = s3
+        if textract is not None:
+            aws_clients._clients['textract', mode] = textract
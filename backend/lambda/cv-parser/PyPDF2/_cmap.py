@@ -1,3 +1,4 @@
+import re
 import warnings
 from binascii import unhexlify
 from math import ceil
@@ -19,8 +20,29 @@ def build_char_map(
 
     This function returns a tuple consisting of:
     font sub-type, space_width/2, encoding, map character-map, font-dictionary.
-    The font-dictionary itself is suitable for the curious."""
+    The font-dictionary itself is suitable for the curious.
+
+    A PdfReader keeps the result for each font object it has read, so a font
+    used on every page is decoded once; the tuple is shared and must not be
+    changed."""
     ft: DictionaryObject = obj["/Resources"]["/Font"][font_name]  # type: ignore
+    font_ref = getattr(ft, "indirect_reference", None)
+    # only a PdfReader has the cache: the fonts of a PdfWriter may still change
+    char_maps = getattr(getattr(font_ref, "pdf", None), "_char_maps", None)
+    if char_maps is None:
+        return build_char_map_from_dict(space_width, ft)
+    key = (font_ref.idnum, font_ref.generation, space_width)  # type: ignore
+    try:
+        return char_maps[key]
+    except KeyError:
+        char_map = char_maps[key] = build_char_map_from_dict(space_width, ft)
+        return char_map
+
+
+def build_char_map_from_dict(
+    space_width: float, ft: DictionaryObject
+) -> Tuple[str, float, Union[str, Dict[int, str]], Dict, DictionaryObject]:
+    """Determine information about a font dictionary, as build_char_map does."""
     font_type: str = cast(str, ft["/Subtype"])
 
     space_code = 32
@@ -77,6 +99,10 @@ unknown_char_map: Tuple[str, float, Union[str, Dict[int, str]], Dict[Any, Any]]
 )
 
 
+# a bfrange line as prepare_cm leaves it: code range and first value, without brackets
+_SIMPLE_BFRANGE = re.compile(rb"([0-9A-Fa-f]{1,4}) +([0-9A-Fa-f]{1,4}) +([0-9A-Fa-f]{1,4})")
+
+
 _predefined_cmap: Dict[str, str] = {
     "/Identity-H": "utf-16-be",
     "/Identity-V": "utf-16-be",
@@ -193,8 +219,20 @@ def parse_to_unicode(
     ] = None  # tuple = (current_char, remaining size) ; cf #1285 for example of file
     cm = prepare_cm(ft)
     for l in cm.split(b"\n"):
+        l = l.strip(b" ")
+        # most bfrange lines are "first last start": map those without the line parser
+        simple_range = (
+            process_rg and multiline_rg is None and _SIMPLE_BFRANGE.fullmatch(l)
+        )
+        if simple_range:
+            first, last, start = simple_range.groups()
+            a, b, c = int(first, 16), int(last, 16), int(start, 16)
+            if c + b - a <= 0xFFFF:
+                map_dict[-1] = ceil(max(len(first), len(last)) / 2)
+                _map_bfrange(a, b, c, map_dict, int_entry)
+                continue
         process_rg, process_char, multiline_rg = process_cm_line(
-            l.strip(b" "), process_rg, process_char, multiline_rg, map_dict, int_entry
+            l, process_rg, process_char, multiline_rg, map_dict, int_entry
         )
 
     for a, value in map_dict.items():
@@ -313,19 +351,31 @@ def parse_bfrange(
             c = int(lst[2], 16)
             fmt2 = b"%%0%dX" % max(4, len(lst[2]))
             closure_found = True
-            while a <= b:
-                map_dict[
-                    unhexlify(fmt % a).decode(
-                        "charmap" if map_dict[-1] == 1 else "utf-16-be",
-                        "surrogatepass",
-                    )
-                ] = unhexlify(fmt2 % c).decode("utf-16-be", "surrogatepass")
-                int_entry.append(a)
-                a += 1
-                c += 1
+            if map_dict[-1] <= 2 and len(lst[2]) <= 4 and c + b - a <= 0xFFFF:
+                _map_bfrange(a, b, c, map_dict, int_entry)
+            else:
+                while a <= b:
+                    map_dict[
+                        unhexlify(fmt % a).decode(
+                            "charmap" if map_dict[-1] == 1 else "utf-16-be",
+                            "surrogatepass",
+                        )
+                    ] = unhexlify(fmt2 % c).decode("utf-16-be", "surrogatepass")
+                    int_entry.append(a)
+                    a += 1
+                    c += 1
     return None if closure_found else (a, b)
 
 
+def _map_bfrange(
+    a: int, b: int, c: int, map_dict: Dict[Any, Any], int_entry: List[int]
+) -> None:
+    # codes of one or two bytes and values of one UTF-16 unit decode to the
+    # character with that number, so the range is mapped in bulk
+    map_dict.update(zip(map(chr, range(a, b + 1)), map(chr, range(c, c + b - a + 1))))
+    int_entry.extend(range(a, b + 1))
+
+
 def parse_bfchar(l: bytes, map_dict: Dict[Any, Any], int_entry: List[int]) -> None:
     lst = [x for x in l.split(b" ") if x]
     map_dict[-1] = len(lst[0]) // 2
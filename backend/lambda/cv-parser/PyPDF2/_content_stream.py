@@ -0,0 +1,364 @@
+"""
+Regex tokenizer for page content streams.
+
+ContentStream parses every operand into a PdfObject, reading one byte at a
+time from a BytesIO. Text extraction only needs a handful of operators, so
+this scans the decoded bytes with one compiled pattern instead, in strides of
+a whole operation where it can: an operator with only number and name
+operands is a single match, as is an array of strings and numbers (the usual
+TJ operand). Operands are native values (int, float, str for names, bytes for
+strings, list, dict), and those of operators the caller did not ask for are
+never converted.
+
+Every token is matched where the previous one ended and no alternative
+fails after scanning more than one token, so the time taken is linear in
+the length of the stream, whatever it holds.
+"""
+
+import re
+from binascii import unhexlify
+from io import BytesIO
+from typing import Any, Collection, Iterator, List, Optional, Tuple, Union
+
+from .errors import PdfReadError
+from .generic import (
+    ArrayObject,
+    FloatObject,
+    NameObject,
+    NumberObject,
+    read_hex_string_from_stream,
+    read_string_from_stream,
+)
+
+# Operators PageObject._extract_text acts on; all others leave its state alone
+TEXT_OPERATORS = frozenset(
+    [
+        b"BT",
+        b"ET",
+        b"q",
+        b"Q",
+        b"cm",
+        b"Tz",
+        b"Tw",
+        b"TL",
+        b"Tf",
+        b"Td",
+        b"TD",
+        b"Tm",
+        b"T*",
+        b"Tj",
+        b"TJ",
+        b"'",
+        b'"',
+        b"Do",
+    ]
+)
+
+# Token boundaries as ContentStream sees them: names and operators end at
+# whitespace or a delimiter; \f is also skipped between tokens.
+_SPACE = rb"[ \t\n\r\f\x00]"
+_REGULAR = rb"[^ \t\n\r\f\v()<>\[\]{}/%]"
+_END = rb"(?!" + _REGULAR + rb")"
+_NUMBER = rb"[+\-.0-9][+,\-.0-9]*"
+_NAME = rb"/" + _REGULAR + rb"*"
+_OPERATOR = rb"[A-Za-z'\"]" + _REGULAR + rb"*"
+_STRING_BODY = rb"[^()\\]*(?:\\[\s\S][^()\\]*)*"
+_PLAIN_STRING = rb"\((" + _STRING_BODY + rb")\)"  # no nested parentheses
+_HEX_STRING = rb"<([0-9A-Fa-f \t\n\r\x00]*)>"
+
+_TOKEN = re.compile(
+    _SPACE
+    + rb"*(?:"
+    # 1, 2: a run of number and name operands, and the operator after it if
+    # there is one (a run that ends otherwise is a match of its own, so it is
+    # never scanned again from a later operand)
+    + rb"((?:(?:"
+    + _NUMBER
+    + rb"|"
+    + _NAME
+    + rb")"
+    + _END
+    + _SPACE
+    + rb"*)+)("
+    + _OPERATOR
+    + rb")?"
+    + rb"|("
+    + _OPERATOR
+    + rb")"  # 3: an operator without operands of that kind
+    # 4: an array of strings, hex strings and numbers
+    + rb"|\[((?:"
+    + _SPACE
+    + rb"*(?:"
+    + rb"\("
+    + _STRING_BODY
+    + rb"\)"
+    + rb"|<[0-9A-Fa-f \t\n\r\x00]*>"
+    + rb"|"
+    + _NUMBER
+    + rb"))*)"
+    + _SPACE
+    + rb"*\]"
+    + rb"|"
+    + _PLAIN_STRING  # 5
+    + rb"|"
+    + _HEX_STRING  # 6
+    + rb"|("
+    + _NUMBER
+    + rb")"  # 7: a number run into other characters, such as 1a
+    + rb"|(\()"  # 8: a string with nested parentheses
+    + rb"|(<<|>>|\[|\])"  # 9: dictionary and array brackets
+    + rb"|%[^\r\n]*"  # comment
+    + rb"|(<)"  # 10: a hex string with other bytes
+    + rb")"
+)
+_OPERANDS, _OPERATION, _OPERATOR_ONLY, _SIMPLE_ARRAY, _STRING, _HEX = 1, 2, 3, 4, 5, 6
+_NUMBER_TOKEN, _NESTED_STRING, _BRACKET, _ODD_HEX = 7, 8, 9, 10
+
+_OPERAND = re.compile(rb"(" + _NAME + rb")|(" + _NUMBER + rb")")
+_ARRAY_ITEM = re.compile(_PLAIN_STRING + rb"|" + _HEX_STRING + rb"|(" + _NUMBER + rb")")
+
+# Escapes in literal strings, as read_string_from_stream reads them
+_ESCAPES = {
+    b"n": b"\n",
+    b"r": b"\r",
+    b"t": b"\t",
+    b"b": b"\b",
+    b"f": b"\f",
+    b"c": rb"\c",
+    **{bytes((c,)): bytes((c,)) for c in b"()/\\ %<>[]#_&$"},
+}
+_ESCAPE = re.compile(rb"\\([0-7]{1,3}|\r[\r\n]?|\n[\r\n]?|[\s\S])")
+_UNKNOWN_ESCAPE = re.compile(rb"\\[^0-7\r\nnrtbfc()/\\ %<>\[\]#_&$]")
+
+_KEYWORDS = {b"true": True, b"false": False, b"null": None}
+_INLINE_IMAGE_END = re.compile(rb"[ \n\r\t\x00]EI[ \n\r\t\x00]+")
+
+
+class ContentStreamSyntaxError(PdfReadError):
+    """Content the tokenizer does not parse; ContentStream decides what it means."""
+
+
+def content_stream_data(contents: Any) -> bytes:
+    """
+    Return the decoded bytes of page contents, as ContentStream reads them.
+
+    :param contents: a stream, or an array of streams (each followed by a newline)
+    """
+    contents = contents.get_object()
+    if isinstance(contents, ArrayObject):
+        return b"".join(part.get_object().get_data() + b"\n" for part in contents)
+    return contents.get_data()
+
+
+def _number(token: bytes) -> Union[int, float]:
+    # Same values NumberObject.read_from_stream gives; odd tokens such as
+    # "1.2.3" go through it for the same warning and fallback
+    try:
+        return float(token) if b"." in token else int(token)
+    except ValueError:
+        return FloatObject(token) if b"." in token else NumberObject(token)
+
+
+def _name(token: bytes, pdf: Any) -> str:
+    if b"#" not in token and token.isascii():
+        return token.decode()
+    return NameObject.read_from_stream(BytesIO(token), pdf)
+
+
+def _unescape_one(match: "re.Match[bytes]") -> bytes:
+    escaped = match.group(1)
+    if escaped[0] in b"01234567":
+        code = int(escaped, 8)
+        return bytes((code,)) if code < 256 else chr(code).encode("utf-8")
+    if escaped[0] in b"\r\n":
+        return b""
+    return _ESCAPES[escaped]
+
+
+def _string(content: bytes) -> Optional[bytes]:
+    """The bytes of a literal string (None for escapes left to read_string_from_stream)"""
+    if b"\\" not in content:
+        return content
+    if _UNKNOWN_ESCAPE.search(content) is not None:
+        return None
+    return _ESCAPE.sub(_unescape_one, content)
+
+
+def _hex_string(digits: bytes) -> bytes:
+    digits = digits.translate(None, b" \t\n\r\x00")
+    if len(digits) % 2:
+        digits += b"0"
+    return unhexlify(digits)
+
+
+def _operands(text: bytes, pdf: Any) -> List[Any]:
+    """The values of number and name operands"""
+    items = _OPERAND.findall(text)
+    try:
+        return [
+            (float(number) if b"." in number else int(number))
+            if number
+            else name.decode()
+            if b"#" not in name
+            else _name(name, pdf)
+            for name, number in items
+        ]
+    except ValueError:  # odd numbers, names that are not UTF-8
+        return [_name(name, pdf) if name else _number(number) for name, number in items]
+
+
+def _array(body: bytes) -> Optional[List[Any]]:
+    """The values of an array of strings and numbers (None for escapes left to read_string_from_stream)"""
+    items = _ARRAY_ITEM.findall(body)
+    try:
+        values = [
+            (float(number) if b"." in number else int(number))
+            if number
+            else unhexlify(hex_digits)
+            if hex_digits
+            else string
+            if b"\\" not in string
+            else _string(string)
+            for string, hex_digits, number in items
+        ]
+    except ValueError:  # odd numbers, hex strings with whitespace or an odd length
+        values = [
+            _number(number)
+            if number
+            else _hex_string(hex_digits)
+            if hex_digits
+            else _string(string)
+            for string, hex_digits, number in items
+        ]
+    return None if None in values else values
+
+
+def iter_content_operations(
+    data: Union[bytes, memoryview],
+    operators: Optional[Collection[bytes]] = None,
+    pdf: Any = None,
+) -> Iterator[Tuple[Any, bytes]]:
+    """
+    Yield the (operands, operator) pairs of a decoded content stream.
+
+    Operands are native values: int and float numbers, str names, bytes
+    strings, lists and dicts. An inline image is yielded as
+    ({"settings": ..., "data": ...}, b"INLINE IMAGE").
+
+    :param data: the decoded content stream
+    :param operators: the operators to yield (all when None); the operands
+        of other operators are not converted
+    :param pdf: the PdfReader, for how strictly to read odd names
+    :raises ContentStreamSyntaxError: on content this does not tokenize (an
+        unbalanced bracket, a stray delimiter); ContentStream.operations then
+        has the answer, errors included
+    """
+    stream: Optional[BytesIO] = None
+    operands: List[Any] = []
+    # Arrays and dictionaries being read, innermost last
+    open_brackets: List[Tuple[bytes, List[Any]]] = []
+    values = operands
+    # Between BI and ID the operands are the inline image settings
+    in_image_settings = False
+    pos = 0
+    while True:
+        # Anchored at pos: a search would try every later offset after a failure
+        match = _TOKEN.match(data, pos)
+        if match is None:
+            break
+        pos = match.end()
+        kind = match.lastindex
+        if kind == _OPERANDS:
+            values += _operands(match.group(kind), pdf)
+        elif kind == _OPERATION or kind == _OPERATOR_ONLY:
+            operator = match.group(kind)
+            run = match.group(_OPERANDS)
+            if not (open_brackets or in_image_settings or operator == b"BI"):
+                if operators is None or operator in operators:
+                    if run:
+                        operands += _operands(run, pdf)
+                    yield operands, operator
+                    operands = values = []
+                elif operands:
+                    operands = values = []
+                continue
+            if run:
+                values += _operands(run, pdf)
+            if open_brackets or in_image_settings and operator in _KEYWORDS:
+                # Only true, false and null may be values
+                if operator not in _KEYWORDS:
+                    raise ContentStreamSyntaxError(f"Operator {operator!r} inside an array")
+                values.append(_KEYWORDS[operator])
+            elif operator == b"BI":
+                if operands:
+                    raise ContentStreamSyntaxError("Operands before an inline image")
+                in_image_settings = True
+            else:
+                if operator != b"ID":
+                    raise ContentStreamSyntaxError(f"Operator {operator!r} in inline image settings")
+                # ID and one whitespace byte, then the image data up to EI between whitespace
+                # (ContentStream keeps the whitespace before EI in the data)
+                start = pos + 1
+                image_end = _INLINE_IMAGE_END.search(data, start)
+                if image_end is None:
+                    raise PdfReadError("Unexpected end of stream")
+                if operators is None or b"INLINE IMAGE" in operators:
+                    settings = iter(operands)
+                    image = {
+                        "settings": dict(zip(settings, settings)),
+                        "data": bytes(data[start : image_end.start() + 1]),
+                    }
+                    yield image, b"INLINE IMAGE"
+                operands = values = []
+                in_image_settings = False
+                pos = image_end.end()
+        elif kind == _SIMPLE_ARRAY:
+            items = _array(match.group(kind))
+            if items is None:
+                # An odd escape: read the array again a token at a time
+                open_brackets.append((b"[", values))
+                values = []
+                pos = match.start(kind)
+            else:
+                values.append(items)
+        elif kind == _STRING:
+            value = _string(match.group(kind))
+            if value is None:
+                if stream is None:
+                    stream = BytesIO(data)
+                stream.seek(match.start(kind) - 1)
+                value = bytes(read_string_from_stream(stream, "bytes"))
+            values.append(value)
+        elif kind == _HEX:
+            values.append(_hex_string(match.group(kind)))
+        elif kind == _NUMBER_TOKEN:
+            values.append(_number(match.group(kind)))
+        elif kind == _BRACKET:
+            bracket = match.group(kind)
+            if bracket in (b"[", b"<<"):
+                open_brackets.append((bracket, values))
+                values = []
+            elif not open_brackets or open_brackets[-1][0] != (b"[" if bracket == b"]" else b"<<"):
+                raise ContentStreamSyntaxError(f"Unbalanced {bracket!r} at {pos}")
+            else:
+                items = values
+                values = open_brackets.pop()[1]
+                if bracket == b"]":
+                    values.append(items)
+                else:
+                    keys = iter(items)
+                    values.append(dict(zip(keys, keys)))
+        elif kind in (_NESTED_STRING, _ODD_HEX):
+            # Read as read_object reads them, then carry on after them
+            if stream is None:
+                stream = BytesIO(data)
+            stream.seek(match.start(kind))
+            if kind == _NESTED_STRING:
+                values.append(bytes(read_string_from_stream(stream, "bytes")))
+            else:
+                values.append(bytes(read_hex_string_from_stream(stream, "bytes")))
+            pos = stream.tell()
+    if bytes(data[pos:]).strip(b" \t\n\r\f\x00"):
+        raise ContentStreamSyntaxError(f"Unexpected content at {pos}")
+    if open_brackets:
+        raise ContentStreamSyntaxError("Unclosed array or dictionary")
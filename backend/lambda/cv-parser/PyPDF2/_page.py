@@ -46,6 +46,12 @@ from typing import (
 )
 
 from ._cmap import build_char_map, unknown_char_map
+from ._content_stream import (
+    TEXT_OPERATORS,
+    ContentStreamSyntaxError,
+    content_stream_data,
+    iter_content_operations,
+)
 from ._protocols import PdfReaderProtocol
 from ._utils import (
     CompressedTransformationMatrix,
@@ -1352,8 +1358,24 @@ class PageObject(DictionaryObject):
             content = (
                 obj[content_key].get_object() if isinstance(content_key, str) else obj
             )
-            if not isinstance(content, ContentStream):
-                content = ContentStream(content, pdf, "bytes")
+            if (
+                isinstance(content, ContentStream)
+                or visitor_operand_before is not None
+                or visitor_operand_after is not None
+            ):
+                # visitors are shown every operation, with PdfObject operands
+                if not isinstance(content, ContentStream):
+                    content = ContentStream(content, pdf, "bytes")
+                operations = content.operations
+            else:
+                try:
+                    operations = list(
+                        iter_content_operations(
+                            content_stream_data(content), TEXT_OPERATORS, pdf
+                        )
+                    )
+                except ContentStreamSyntaxError:
+                    operations = ContentStream(content, pdf, "bytes").operations
         except KeyError:  # it means no content can be extracted(certainly empty page)
             return ""
         # Note: we check all strings are TextStringObjects.  ByteStringObjects
@@ -1604,8 +1626,10 @@ class PageObject(DictionaryObject):
             else:
                 return None
             if check_crlf_space:
-                m = mult(tm_matrix, cm_matrix)
-                orientation = orient(m)
+                # Tj has already worked out the text rendering matrix, and leaves it be
+                if operator != b"Tj":
+                    m = mult(tm_matrix, cm_matrix)
+                    orientation = orient(m)
                 delta_x = m[4] - tm_prev[4]
                 delta_y = m[5] - tm_prev[5]
                 k = math.sqrt(abs(m[0] * m[3]) + abs(m[1] * m[2]))
@@ -1693,7 +1717,7 @@ class PageObject(DictionaryObject):
                 except Exception:
                     pass
 
-        for operands, operator in content.operations:
+        for operands, operator in operations:
             if visitor_operand_before is not None:
                 visitor_operand_before(operator, operands, cm_matrix, tm_matrix)
             # multiple operators are defined in here ####
@@ -1712,7 +1736,8 @@ class PageObject(DictionaryObject):
                 for op in operands[0]:
                     if isinstance(op, (str, bytes)):
                         process_operation(b"Tj", [op])
-                    if isinstance(op, (int, float, NumberObject, FloatObject)):
+                    # int and float first: the PdfObject checks are Protocol checks, and slow
+                    elif isinstance(op, (int, float, NumberObject, FloatObject)):
                         if (
                             (abs(float(op)) >= _space_width)
                             and (len(text) > 0)
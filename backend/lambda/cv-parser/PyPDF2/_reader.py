@@ -27,6 +27,7 @@
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
 
+import mmap
 import os
 import re
 import struct
@@ -49,6 +50,7 @@ from typing import (
 from ._encryption import Encryption, PasswordType
 from ._page import PageObject, _VirtualList
 from ._utils import (
+    BufferType,
     StrByteType,
     StreamType,
     b_,
@@ -56,6 +58,8 @@ from ._utils import (
     deprecation_no_replacement,
     deprecation_with_replacement,
     logger_warning,
+    open_source,
+    read_all_bytes,
     read_non_whitespace,
     read_previous_line,
     read_until_whitespace,
@@ -285,7 +289,9 @@ class PdfReader:
 
     :param stream: A File object or an object that supports the standard read
         and seek methods similar to a File object. Could also be a
-        string representing a path to a PDF file.
+        string representing a path to a PDF file, or a buffer (``bytes``,
+        ``memoryview`` or ``mmap.mmap``), which is parsed in place: stream
+        data is only copied out of it when used.
     :param bool strict: Determines whether user should be warned of all
         problems and also causes some correctable problems to be fatal.
         Defaults to ``False``.
@@ -296,7 +302,7 @@ class PdfReader:
 
     def __init__(
         self,
-        stream: Union[StrByteType, Path],
+        stream: Union[StrByteType, Path, BufferType],
         strict: bool = False,
         password: Union[None, str, bytes] = None,
     ) -> None:
@@ -307,6 +313,8 @@ class PdfReader:
         self._page_id2num: Optional[
             Dict[Any, Any]
         ] = None  # map page indirect_reference number to Page Number
+        # build_char_map results by font (idnum, generation, space width)
+        self._char_maps: Dict[Tuple[int, int, float], Tuple[Any, ...]] = {}
         if hasattr(stream, "mode") and "b" not in stream.mode:  # type: ignore
             logger_warning(
                 "PdfReader stream/file object is not in binary mode. "
@@ -315,7 +323,9 @@ class PdfReader:
             )
         if isinstance(stream, (str, Path)):
             with open(stream, "rb") as fh:
-                stream = BytesIO(fh.read())
+                stream = open_source(fh.read())
+        elif isinstance(stream, (bytes, bytearray, memoryview, mmap.mmap)):
+            stream = open_source(stream)
         self.read(stream)
         self.stream = stream
 
@@ -1216,13 +1226,7 @@ class PdfReader:
             try:
                 idnum, generation = self.read_object_header(self.stream)
             except Exception:
-                if hasattr(self.stream, "getbuffer"):
-                    buf = bytes(self.stream.getbuffer())  # type: ignore
-                else:
-                    p = self.stream.tell()
-                    self.stream.seek(0, 0)
-                    buf = self.stream.read(-1)
-                    self.stream.seek(p, 0)
+                buf = read_all_bytes(self.stream)
                 m = re.search(
                     rf"\s{indirect_reference.idnum}\s+{indirect_reference.generation}\s+obj".encode(),
                     buf,
@@ -1270,13 +1274,7 @@ class PdfReader:
                     retval, indirect_reference.idnum, indirect_reference.generation
                 )
         else:
-            if hasattr(self.stream, "getbuffer"):
-                buf = bytes(self.stream.getbuffer())  # type: ignore
-            else:
-                p = self.stream.tell()
-                self.stream.seek(0, 0)
-                buf = self.stream.read(-1)
-                self.stream.seek(p, 0)
+            buf = read_all_bytes(self.stream)
             m = re.search(
                 rf"\s{indirect_reference.idnum}\s+{indirect_reference.generation}\s+obj".encode(),
                 buf,
@@ -1543,13 +1541,7 @@ class PdfReader:
                     offset, generation = int(offset_b), int(generation_b)
                 except Exception:
                     # if something wrong occured
-                    if hasattr(stream, "getbuffer"):
-                        buf = bytes(stream.getbuffer())  # type: ignore
-                    else:
-                        p = stream.tell()
-                        stream.seek(0, 0)
-                        buf = stream.read(-1)
-                        stream.seek(p)
+                    buf = read_all_bytes(stream)
 
                     f = re.search(f"{num}\\s+(\\d+)\\s+obj".encode(), buf)
                     if f is None:
@@ -1779,8 +1771,7 @@ class PdfReader:
 
     def _rebuild_xref_table(self, stream: StreamType) -> None:
         self.xref = {}
-        stream.seek(0, 0)
-        f_ = stream.read(-1)
+        f_ = read_all_bytes(stream)
 
         for m in re.finditer(rb"[\r\n \t][ \t]*(\d+)[ \t]+(\d+)[ \t]+obj", f_):
             idnum = int(m.group(1))
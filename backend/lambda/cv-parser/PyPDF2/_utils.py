@@ -31,10 +31,11 @@ __author_email__ = "biziqe@mathieu.fenniak.net"
 
 import functools
 import logging
+import mmap
 import warnings
 from codecs import getencoder
 from dataclasses import dataclass
-from io import DEFAULT_BUFFER_SIZE
+from io import DEFAULT_BUFFER_SIZE, BytesIO
 from os import SEEK_CUR
 from typing import (
     IO,
@@ -69,6 +70,7 @@ CompressedTransformationMatrix: TypeAlias = Tuple[
 
 StreamType = IO
 StrByteType = Union[str, StreamType]
+BufferType = Union[bytes, bytearray, memoryview, mmap.mmap]
 
 DEPR_MSG_NO_REPLACEMENT = "{} is deprecated and will be removed in PyPDF2 {}."
 DEPR_MSG_NO_REPLACEMENT_HAPPENED = "{} is deprecated and was removed in PyPDF2 {}."
@@ -151,6 +153,18 @@ def read_until_regex(
     :param bool ignore_eof: If true, ignore end-of-line and return immediately
     :param regex: re.Pattern
     """
+    source = stream_source(stream)
+    if source is not None:
+        # search the buffer in place instead of reading it in chunks
+        start = stream.tell()
+        m = regex.search(source, start)
+        if m is None:
+            if not ignore_eof:
+                raise PdfStreamError(STREAM_TRUNCATED_PREMATURELY)
+            stream.seek(0, 2)
+            return source[start:]
+        stream.seek(m.start(), 0)
+        return source[start : m.start()]
     name = b""
     while True:
         tok = stream.read(16)
@@ -167,6 +181,120 @@ def read_until_regex(
     return name
 
 
+class SourceBytesIO(BytesIO):
+    """
+    A BytesIO over a bytes object, which it keeps as its source.
+
+    BytesIO shares the bytes it is created with until it is written to, so
+    the stream and its source are the same buffer; see stream_source.
+    """
+
+    def __init__(self, source: bytes) -> None:
+        super().__init__(source)
+        self.source = source
+
+
+class SourceSlice:
+    """
+    Bytes ``start:end`` of a stream's source, copied out when first needed.
+
+    Unlike a memoryview, this holds no export of the source, so a memory map
+    can still be closed while the objects read from it are alive.
+    """
+
+    __slots__ = ("source", "start", "end")
+
+    def __init__(self, source: Union[bytes, mmap.mmap], start: int, end: int) -> None:
+        self.source = source
+        self.start = start
+        self.end = end
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    def __bytes__(self) -> bytes:
+        return self.source[self.start : self.end]
+
+    def __getitem__(self, index: slice) -> "SourceSlice":
+        start, stop, step = index.indices(len(self))
+        if step != 1:
+            raise ValueError("SourceSlice only supports contiguous slices")
+        return SourceSlice(
+            self.source, self.start + start, self.start + max(start, stop)
+        )
+
+
+def open_source(source: BufferType) -> StreamType:
+    """
+    Return a stream reading a buffer in place.
+
+    A memory map is its own stream. A bytes object, or a memoryview of a
+    whole bytes object or memory map, is read without copying; other
+    buffers are copied once.
+    """
+    if isinstance(source, memoryview):
+        obj = source.obj
+        if (
+            isinstance(obj, (bytes, mmap.mmap))
+            and source.contiguous
+            and source.nbytes == len(obj)
+        ):
+            source = obj
+    if isinstance(source, mmap.mmap):
+        source.seek(0, 0)
+        return source  # type: ignore
+    if not isinstance(source, bytes):
+        source = bytes(source)
+    return SourceBytesIO(source)
+
+
+def stream_source(stream: StreamType) -> Union[None, bytes, mmap.mmap]:
+    """
+    Return the buffer holding all of a stream's bytes, if it has one.
+
+    That is a memory map read as a stream, or the source of a SourceBytesIO.
+    """
+    if isinstance(stream, SourceBytesIO):
+        return stream.source
+    if isinstance(stream, mmap.mmap):
+        return stream
+    return None
+
+
+def read_source_slice(stream: StreamType, length: int) -> Union[bytes, SourceSlice]:
+    """
+    Read up to length bytes, as a SourceSlice if the stream has a source.
+
+    :param stream: the stream to read from, left after the bytes read
+    :param length: the number of bytes to read
+    """
+    source = stream_source(stream)
+    if source is None or length < 0:
+        return stream.read(length)
+    start = stream.tell()
+    end = max(start, min(start + length, len(source)))
+    stream.seek(end, 0)
+    return SourceSlice(source, start, end)
+
+
+def read_all_bytes(stream: StreamType) -> Union[bytes, mmap.mmap]:
+    """
+    Return all of a stream's bytes, leaving its position unchanged.
+
+    A stream with a source (see stream_source) returns it without copying.
+    """
+    source = stream_source(stream)
+    if source is not None:
+        return source
+    if hasattr(stream, "getbuffer"):
+        return bytes(stream.getbuffer())  # type: ignore
+    p = stream.tell()
+    stream.seek(0, 0)
+    buf = stream.read(-1)
+    stream.seek(p, 0)
+    return buf
+
+
 def read_block_backwards(stream: StreamType, to_read: int) -> bytes:
     """
     Given a stream at position X, read a block of size to_read ending at position X.
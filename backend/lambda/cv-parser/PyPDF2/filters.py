@@ -37,7 +37,9 @@ __author_email__ = "biziqe@mathieu.fenniak.net"
 import math
 import struct
 import zlib
+from functools import lru_cache
 from io import BytesIO
+from itertools import accumulate, groupby
 from typing import Any, Dict, Optional, Tuple, Union, cast
 
 from .generic import ArrayObject, DictionaryObject, IndirectObject, NameObject
@@ -49,7 +51,7 @@ except ImportError:
     # For older Python versions, the backport typing_extensions is necessary:
     from typing_extensions import Literal  # type: ignore[misc]
 
-from ._utils import b_, deprecate_with_replacement, ord_, paeth_predictor
+from ._utils import b_, deprecate_with_replacement, ord_
 from .constants import CcittFaxDecodeParameters as CCITT
 from .constants import ColorSpaces
 from .constants import FilterTypeAbbreviations as FTA
@@ -75,6 +77,134 @@ def decompress(data: bytes) -> bytes:
         return result_str
 
 
+# PNG predictors. Rows are undone a whole row (or a run of rows) at a time with
+# bytes operations that run in C: a Sub row is a running sum, a run of Up rows is
+# a running sum down each column, and Up rows wider than the run is long add the
+# row above with one big-int addition. Average and Paeth depend on the byte just
+# decoded, so they stay per byte. The byte to the left is always the previous
+# byte (one byte per pixel, as in cross-reference streams), and the row above the
+# first row is zeros.
+PNG_NUMPY_MIN_BYTES = 4096  # numpy, when installed, is used for streams this large
+_low_byte = (255).__and__
+
+
+@lru_cache(maxsize=None)
+def _numpy() -> Any:
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _png_sub_row(raw: bytes) -> bytes:
+    return bytes(map(_low_byte, accumulate(raw)))
+
+
+def _png_average_row(raw: bytes, prev: bytes) -> bytes:
+    row = bytearray(raw)
+    left = 0
+    for i, up in enumerate(prev):
+        left = row[i] = (row[i] + ((left + up) >> 1)) & 255
+    return bytes(row)
+
+
+def _png_paeth_row(raw: bytes, prev: bytes) -> bytes:
+    row = bytearray(raw)
+    left = up_left = 0
+    for i, up in enumerate(prev):
+        dist_left = abs(up - up_left)
+        dist_up = abs(left - up_left)
+        dist_up_left = abs(left + up - up_left - up_left)
+        if dist_left <= dist_up and dist_left <= dist_up_left:
+            predicted = left
+        elif dist_up <= dist_up_left:
+            predicted = up
+        else:
+            predicted = up_left
+        left = row[i] = (row[i] + predicted) & 255
+        up_left = up
+    return bytes(row)
+
+
+def _png_unpredict(data: bytes, rowlength: int) -> bytes:
+    width = rowlength - 1
+    output = bytearray(len(data) // rowlength * width)
+    prev = bytes(width)
+    row = 0
+    for filter_byte, run in groupby(data[::rowlength]):
+        count = sum(1 for _ in run)
+        start = row * rowlength
+        out = row * width
+        if filter_byte == 2 and count >= width:
+            # Up: each column is a running sum starting from the row above
+            for column in range(width):
+                raw = data[start + 1 + column : start + count * rowlength : rowlength]
+                output[out + column : out + count * width : width] = bytes(
+                    map(_low_byte, accumulate(raw, initial=prev[column]))
+                )[1:]
+        elif filter_byte == 2:
+            # Up: add the row above, byte by byte without carries, as one integer
+            low_bits = int.from_bytes(b"\x7f" * width, "big")
+            high_bits = int.from_bytes(b"\x80" * width, "big")
+            above = int.from_bytes(prev, "big")
+            for offset in range(count):
+                raw_start = start + offset * rowlength + 1
+                raw = int.from_bytes(data[raw_start : raw_start + width], "big")
+                above = ((raw & low_bits) + (above & low_bits)) ^ (
+                    (raw ^ above) & high_bits
+                )
+                output[out + offset * width : out + (offset + 1) * width] = (
+                    above.to_bytes(width, "big")
+                )
+        elif filter_byte in (0, 1, 3, 4):
+            for offset in range(count):
+                raw_start = start + offset * rowlength + 1
+                raw = data[raw_start : raw_start + width]
+                if filter_byte == 1:
+                    raw = _png_sub_row(raw)
+                elif filter_byte == 3:
+                    raw = _png_average_row(raw, prev)
+                elif filter_byte == 4:
+                    raw = _png_paeth_row(raw, prev)
+                output[out + offset * width : out + (offset + 1) * width] = prev = raw
+        else:
+            # unsupported PNG filter
+            raise PdfReadError(f"Unsupported PNG filter {filter_byte!r}")
+        prev = bytes(output[out + (count - 1) * width : out + count * width])
+        row += count
+    return bytes(output)
+
+
+def _png_unpredict_numpy(numpy: Any, data: bytes, rowlength: int) -> bytes:
+    rows = len(data) // rowlength
+    table = numpy.frombuffer(data, dtype=numpy.uint8).reshape(rows, rowlength)
+    filter_bytes = table[:, 0]
+    output = table[:, 1:].copy()
+    changes = numpy.flatnonzero(filter_bytes[1:] != filter_bytes[:-1])
+    run_starts = (changes + 1).tolist()
+    prev = numpy.zeros(rowlength - 1, dtype=numpy.uint8)
+    for start, end in zip([0] + run_starts, run_starts + [rows]):
+        filter_byte = int(filter_bytes[start])
+        run = output[start:end]
+        if filter_byte == 1:
+            numpy.cumsum(run, axis=1, dtype=numpy.uint8, out=run)
+        elif filter_byte == 2:
+            run[0] += prev
+            numpy.cumsum(run, axis=0, dtype=numpy.uint8, out=run)
+        elif filter_byte in (3, 4):
+            decode_row = _png_average_row if filter_byte == 3 else _png_paeth_row
+            for row in range(start, end):
+                decoded = decode_row(output[row].tobytes(), prev.tobytes())
+                output[row] = numpy.frombuffer(decoded, dtype=numpy.uint8)
+                prev = output[row]
+        elif filter_byte != 0:
+            # unsupported PNG filter
+            raise PdfReadError(f"Unsupported PNG filter {filter_byte!r}")
+        prev = output[end - 1]
+    return output.tobytes()
+
+
 class FlateDecode:
     @staticmethod
     def decode(
@@ -146,43 +276,15 @@ class FlateDecode:
 
     @staticmethod
     def _decode_png_prediction(data: str, columns: int, rowlength: int) -> bytes:
-        output = BytesIO()
         # PNG prediction can vary from row to row
         if len(data) % rowlength != 0:
             raise PdfReadError("Image data is not rectangular")
-        prev_rowdata = (0,) * rowlength
-        for row in range(len(data) // rowlength):
-            rowdata = [
-                ord_(x) for x in data[(row * rowlength) : ((row + 1) * rowlength)]
-            ]
-            filter_byte = rowdata[0]
-
-            if filter_byte == 0:
-                pass
-            elif filter_byte == 1:
-                for i in range(2, rowlength):
-                    rowdata[i] = (rowdata[i] + rowdata[i - 1]) % 256
-            elif filter_byte == 2:
-                for i in range(1, rowlength):
-                    rowdata[i] = (rowdata[i] + prev_rowdata[i]) % 256
-            elif filter_byte == 3:
-                for i in range(1, rowlength):
-                    left = rowdata[i - 1] if i > 1 else 0
-                    floor = math.floor(left + prev_rowdata[i]) / 2
-                    rowdata[i] = (rowdata[i] + int(floor)) % 256
-            elif filter_byte == 4:
-                for i in range(1, rowlength):
-                    left = rowdata[i - 1] if i > 1 else 0
-                    up = prev_rowdata[i]
-                    up_left = prev_rowdata[i - 1] if i > 1 else 0
-                    paeth = paeth_predictor(left, up, up_left)
-                    rowdata[i] = (rowdata[i] + paeth) % 256
-            else:
-                # unsupported PNG filter
-                raise PdfReadError(f"Unsupported PNG filter {filter_byte!r}")
-            prev_rowdata = tuple(rowdata)
-            output.write(bytearray(rowdata[1:]))
-        return output.getvalue()
+        if isinstance(data, str):
+            data = b_(data)
+        numpy = _numpy()
+        if numpy is not None and len(data) >= PNG_NUMPY_MIN_BYTES:
+            return _png_unpredict_numpy(numpy, data, rowlength)
+        return _png_unpredict(data, rowlength)
 
     @staticmethod
     def encode(data: bytes) -> bytes:
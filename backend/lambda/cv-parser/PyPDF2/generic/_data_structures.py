@@ -37,6 +37,7 @@ from typing import Any, Dict, Iterable, List, Optional, Tuple, Union, cast
 from .._protocols import PdfWriterProtocol
 from .._utils import (
     WHITESPACES,
+    SourceSlice,
     StreamType,
     b_,
     deprecate_with_replacement,
@@ -44,6 +45,7 @@ from .._utils import (
     hex_str,
     logger_warning,
     read_non_whitespace,
+    read_source_slice,
     read_until_regex,
     skip_over_comment,
 )
@@ -427,7 +429,8 @@ class DictionaryObject(dict, PdfObject):
                 length = pdf.get_object(length)
                 stream.seek(t, 0)
             pstart = stream.tell()
-            data["__streamdata__"] = stream.read(length)
+            # stream data read from a buffer is only copied out when used
+            data["__streamdata__"] = read_source_slice(stream, length)
             e = read_non_whitespace(stream)
             ndstream = stream.read(8)
             if (e + ndstream) != b"endstream":
@@ -718,6 +721,8 @@ class StreamObject(DictionaryObject):
 
     @property
     def _data(self) -> Any:
+        if isinstance(self.__data, SourceSlice):
+            self.__data = bytes(self.__data)
         return self.__data
 
     @_data.setter
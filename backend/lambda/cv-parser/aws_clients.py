@@ -0,0 +1,146 @@
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+logger = logging.getLogger()
+
+# Retries: botocore's 'standard' mode, capped exponential backoff with jitter and a retry quota
+# (a retry spends 5 of 500 tokens, a call that succeeds first time returns 1, so retrying stops
+# once most calls fail). The quota belongs to the client, and each client is shared by every
+# thread in the container (batch workers, hedges, speculative calls), so they back off together
+# instead of retrying in lockstep. Same variables as botocore's own settings.
+RETRY_MODE = os.environ.get('AWS_RETRY_MODE', 'standard')
+MAX_ATTEMPTS = int(os.environ.get('AWS_MAX_ATTEMPTS', '5'))
+# Retry mode of batch invocations (see retry_mode). 'adaptive' adds a token bucket, shared by the
+# batch workers, that lowers the client's send rate after throttling responses, so the workers send
+# fewer requests into a quota that is already spent. It sleeps before sending however little of an
+# invocation's Deadline is left, which only suits work no caller is waiting on.
+BATCH_RETRY_MODE = os.environ.get('AWS_BATCH_RETRY_MODE', 'adaptive')
+
+# Metric names of the per-service retry counts
+RETRY_METRIC_NAMES = {
+    'calls': 'AwsCalls',
+    'retries': 'Retries',
+    'throttles': 'ThrottledAttempts',
+    'throttled_failures': 'ThrottledFailures',
+    'retry_quota_reached': 'RetryQuotaReached'
+}
+
+_session = None
+# Clients by (service name, retry mode)
+_clients = {}
+# The retry mode of the clients get_client returns in this context (RETRY_MODE when unset)
+_active_retry_mode = ContextVar('active_retry_mode', default=None)
+_lock = threading.Lock()
+# Retry counts per service since the last take_retry_counts(), and when each service last throttled
+_retry_counts = {}
+_last_throttled = {}
+_counts_lock = threading.Lock()
+
+def _create_session():
+    # boto3 and botocore are imported here so importing the handler does not pay for them
+    import boto3
+    import botocore.session
+    from botocore_models import ModelLoader
+
+    botocore_session = botocore.session.get_session()
+    botocore_session.register_component('data_loader', ModelLoader())
+    return boto3.session.Session(botocore_session=botocore_session)
+
+def client_config(retry_mode=None, max_attempts=None):
+    """botocore client configuration (RETRY_MODE and MAX_ATTEMPTS unless given)"""
+    from botocore.config import Config
+
+    return Config(retries={
+        'mode': retry_mode or RETRY_MODE,
+        'max_attempts': max_attempts or MAX_ATTEMPTS
+    })
+
+def _count(service_name, name, amount=1):
+    with _counts_lock:
+        counts = _retry_counts.setdefault(service_name, dict.fromkeys(RETRY_METRIC_NAMES, 0))
+        counts[name] += amount
+
+def _register_retry_metrics(client, service_name):
+    """Count a client's calls, retries and throttling responses"""
+    from botocore.retries.standard import RetryEventAdapter, ThrottlingErrorDetector
+
+    throttling_detector = ThrottlingErrorDetector(RetryEventAdapter())
+    event_name = client.meta.service_model.service_id.hyphenize()
+
+    # Sent after every attempt, whether or not it is retried
+    def on_attempt(request_dict, **kwargs):
+        throttled = throttling_detector.is_throttling_error(request_dict=request_dict, **kwargs)
+        # The request context is passed on to after-call
+        request_dict['context']['last_attempt_throttled'] = throttled
+        if throttled:
+            _last_throttled[service_name] = time.monotonic()
+            _count(service_name, 'throttles')
+
+    # Sent once per call, after its last attempt
+    def on_call(http_response, parsed, context, **kwargs):
+        metadata = parsed.get('ResponseMetadata', {})
+        _count(service_name, 'calls')
+        _count(service_name, 'retries', metadata.get('RetryAttempts', 0))
+        if metadata.get('RetryQuotaReached'):
+            _count(service_name, 'retry_quota_reached')
+        if http_response.status_code >= 300 and context.get('last_attempt_throttled'):
+            _count(service_name, 'throttled_failures')
+
+    def on_call_error(**kwargs):
+        _count(service_name, 'calls')
+
+    client.meta.events.register(f'needs-retry.{event_name}', on_attempt)
+    client.meta.events.register(f'after-call.{event_name}', on_call)
+    client.meta.events.register(f'after-call-error.{event_name}', on_call_error)
+
+def _new_client(service_name, config):
+    # Callers hold _lock, as session and client creation are not thread-safe
+    global _session
+    if _session is None:
+        _session = _create_session()
+    client = _session.client(service_name, config=config)
+    _register_retry_metrics(client, service_name)
+    return client
+
+def create_client(service_name, config=None):
+    """Create a separate client for an AWS service, with retry metrics (get_client shares one per container)"""
+    with _lock:
+        return _new_client(service_name, config or client_config())
+
+@contextmanager
+def retry_mode(mode):
+    """Make get_client return clients with this retry mode in the current context"""
+    token = _active_retry_mode.set(mode)
+    try:
+        yield
+    finally:
+        _active_retry_mode.reset(token)
+
+def get_client(service_name):
+    """Return the container-wide client for an AWS service and the active retry mode, creating it on first use"""
+    mode = _active_retry_mode.get() or RETRY_MODE
+    client = _clients.get((service_name, mode))
+    if client is None:
+        with _lock:
+            client = _clients.get((service_name, mode))
+            if client is None:
+                start = time.perf_counter()
+                client = _clients[service_name, mode] = _new_client(service_name, client_config(retry_mode=mode))
+                logger.info(f"Created {service_name} client ({mode} retries) in "
+                            f"{(time.perf_counter() - start) * 1000:.1f} ms")
+    return client
+
+def throttled_recently(service_name, seconds):
+    """Return whether a service sent a throttling response in the last few seconds"""
+    return time.monotonic() - _last_throttled.get(service_name, float('-inf')) < seconds
+
+def take_retry_counts():
+    """Return {service: {'calls', 'retries', 'throttles', ...}} since the last call, and reset them"""
+    global _retry_counts
+    with _counts_lock:
+        counts, _retry_counts = _retry_counts, {}
+    return counts
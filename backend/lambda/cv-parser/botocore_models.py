@@ -0,0 +1,125 @@
+"""Fast loading of the botocore data files behind this function's clients.
+
+The data files read while creating the s3 and textract clients are shipped as
+marshal dumps next to their JSON sources in botocore/data, which load three to
+five times faster than json with OrderedDict pairs. Service models are found
+from their own directory rather than by listing every bundled service.
+
+Regenerate the dumps with the Lambda runtime's Python version after upgrading
+botocore:
+
+    python botocore_models.py
+"""
+import logging
+import marshal
+import os
+import sys
+
+from botocore.exceptions import DataNotFoundError
+from botocore.loaders import JSONFileLoader, Loader, instance_cache
+
+logger = logging.getLogger()
+
+SERVICES = ['s3', 'textract']
+
+# marshal output is specific to the Python version, like .pyc files
+MARSHAL_SUFFIX = f'.{sys.implementation.cache_tag}.marshal'
+
+class MarshalFileLoader(JSONFileLoader):
+    """Load data files from marshal dumps when present, falling back to JSON"""
+
+    def exists(self, file_path):
+        return os.path.isfile(file_path + MARSHAL_SUFFIX) or super().exists(file_path)
+
+    def load_file(self, file_path):
+        try:
+            with open(file_path + MARSHAL_SUFFIX, 'rb') as file:
+                # Reading the whole file first is much faster than marshal.load on the file object
+                return marshal.loads(file.read())
+        except FileNotFoundError:
+            pass
+        except (EOFError, ValueError, TypeError) as e:
+            logger.warning(f"Unreadable botocore model {file_path}{MARSHAL_SUFFIX}, using JSON: {str(e)}")
+        return super().load_file(file_path)
+
+class ModelLoader(Loader):
+    """Loader that reads marshal dumps and resolves a service from its own directory.
+
+    The stock loader lists every bundled service (over 300 directories) before
+    loading any model, just to validate the service name.
+    """
+    FILE_LOADER_CLASS = MarshalFileLoader
+
+    @instance_cache
+    def load_service_model(self, service_name, type_name, api_version=None):
+        if api_version is None:
+            try:
+                api_version = self.determine_latest_version(service_name, type_name)
+            except DataNotFoundError:
+                # Unknown service: let botocore raise its usual error
+                return super().load_service_model(service_name, type_name)
+        try:
+            model = self.load_data(os.path.join(service_name, api_version, type_name))
+        except DataNotFoundError:
+            return super().load_service_model(service_name, type_name, api_version)
+
+        # Load in all the extras, as the stock loader does
+        extras_data = self._find_extras(service_name, type_name, api_version)
+        self._extras_processor.process(model, extras_data)
+        return model
+
+class RecordingFileLoader(JSONFileLoader):
+    """JSON file loader that remembers what it loaded"""
+
+    def __init__(self):
+        self.loaded = {}
+
+    def load_file(self, file_path):
+        data = super().load_file(file_path)
+        if data is not None:
+            self.loaded[file_path] = data
+        return data
+
+def plain(data):
+    """Convert the loader's OrderedDicts to dicts (which keep order too) so marshal accepts them"""
+    if isinstance(data, dict):
+        return {key: plain(value) for key, value in data.items()}
+    if isinstance(data, list):
+        return [plain(value) for value in data]
+    return data
+
+def strip_documentation(model):
+    """Drop documentation strings from the operations and shapes of a service model"""
+    for operation in model.get('operations', {}).values():
+        operation.pop('documentation', None)
+        operation.pop('documentationUrl', None)
+    for shape in model.get('shapes', {}).values():
+        shape.pop('documentation', None)
+        for member in shape.get('members', {}).values():
+            member.pop('documentation', None)
+    model.pop('documentation', None)
+    return model
+
+def build(services=SERVICES):
+    """Create a client per service, then write a marshal dump of every bundled data file it read"""
+    import botocore.session
+
+    file_loader = RecordingFileLoader()
+    session = botocore.session.get_session()
+    session.register_component('data_loader', Loader(file_loader=file_loader))
+    for service_name in services:
+        session.create_client(service_name, region_name='us-east-1')
+
+    for file_path, data in file_loader.loaded.items():
+        if not file_path.startswith(Loader.BUILTIN_DATA_PATH):
+            continue
+        if os.path.basename(file_path) == 'service-2':
+            # Clients never read documentation, so leave it out of the dump
+            data = strip_documentation(data)
+        dump = marshal.dumps(plain(data))
+        with open(file_path + MARSHAL_SUFFIX, 'wb') as file:
+            file.write(dump)
+        print(f"{os.path.relpath(file_path, Loader.BUILTIN_DATA_PATH)}{MARSHAL_SUFFIX}: {len(dump)} bytes")
+
+if __name__ == '__main__':
+    build(sys.argv[1:] or SERVICES)
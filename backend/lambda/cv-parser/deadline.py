@@ -0,0 +1,72 @@
+import logging
+from contextvars import ContextVar
+
+logger = logging.getLogger()
+
+# The deadline of the invocation running in this thread
+_active_deadline = ContextVar('active_deadline', default=None)
+
+class Deadline:
+    """Time budget of one invocation, read from the Lambda context.
+
+    Slow or optional stages call time_allows() with an estimate of how long they
+    (and the work that must still follow them) will take. A stage that does not
+    fit in the remaining time, less a reserve for returning the response, is
+    skipped and recorded so the response can be flagged as partial.
+    """
+
+    def __init__(self, context, reserve_ms=0):
+        # Local runs and tests may pass no context, which means no limit
+        self.context = context if hasattr(context, 'get_remaining_time_in_millis') else None
+        self.reserve_ms = reserve_ms
+        self.skipped = []
+        self._token = None
+
+    def __enter__(self):
+        self._token = _active_deadline.set(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        _active_deadline.reset(self._token)
+        return False
+
+    def remaining_ms(self):
+        """Milliseconds left before the reserve is reached"""
+        if self.context is None:
+            return float('inf')
+        return self.context.get_remaining_time_in_millis() - self.reserve_ms
+
+    def skip(self, name):
+        """Record a stage as skipped (or cut short) for lack of time"""
+        if name not in self.skipped:
+            self.skipped.append(name)
+
+    def allows(self, name, needed_ms):
+        """Return whether a stage needing about needed_ms still fits, recording it as skipped if not"""
+        remaining = self.remaining_ms()
+        if remaining >= needed_ms:
+            return True
+        logger.warning(f"Skipping stage '{name}': {remaining:.0f} ms left, about {needed_ms} ms needed")
+        self.skip(name)
+        return False
+
+def remaining_ms():
+    """Milliseconds left on the active deadline (unlimited when none is active)"""
+    deadline = _active_deadline.get()
+    return float('inf') if deadline is None else deadline.remaining_ms()
+
+def time_allows(name, needed_ms):
+    """Check a stage against the active deadline (always allowed when none is active)"""
+    deadline = _active_deadline.get()
+    return deadline is None or deadline.allows(name, needed_ms)
+
+def skip_stage(name):
+    """Record a stage as skipped on the active deadline"""
+    deadline = _active_deadline.get()
+    if deadline is not None:
+        deadline.skip(name)
+
+def skipped_stages():
+    """Stages skipped so far under the active deadline"""
+    deadline = _active_deadline.get()
+    return list(deadline.skipped) if deadline is not None else []
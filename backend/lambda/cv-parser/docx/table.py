@@ -19,6 +19,9 @@ class Table(Parented):
     def __init__(self, tbl, parent):
         super(Table, self).__init__(parent)
         self._element = self._tbl = tbl
+        self._cell_grid = None
+        self._col_count = None
+        self._row_indices = None
 
     def add_column(self, width):
         """
@@ -31,6 +34,7 @@ class Table(Parented):
         for tr in self._tbl.tr_lst:
             tc = tr.add_tc()
             tc.width = width
+        self._invalidate_cells()
         return _Column(gridCol, self)
 
     def add_row(self):
@@ -42,6 +46,7 @@ class Table(Parented):
         for gridCol in tbl.tblGrid.gridCol_lst:
             tc = tr.add_tc()
             tc.width = gridCol.w
+        self._invalidate_cells()
         return _Row(tr, self)
 
     @property
@@ -105,6 +110,18 @@ class Table(Parented):
         end = start + column_count
         return self._cells[start:end]
 
+    def iter_cell_text(self):
+        """
+        Generate the text of each distinct cell in this table, left to right
+        and top to bottom, in a single pass over the ``<w:tc>`` elements.
+        A cell spanning several grid columns or rows is generated once, at
+        its top-left grid position.
+        """
+        for tc in self._tbl.iter_tcs():
+            if tc.vMerge == ST_Merge.CONTINUE:
+                continue
+            yield _Cell(tc, self).text
+
     @lazyproperty
     def rows(self):
         """
@@ -163,26 +180,54 @@ class Table(Parented):
         """
         A sequence of |_Cell| objects, one for each cell of the layout grid.
         If the table contains a span, one or more |_Cell| object references
-        are repeated.
-        """
-        col_count = self._column_count
-        cells = []
-        for tc in self._tbl.iter_tcs():
-            for grid_span_idx in range(tc.grid_span):
-                if tc.vMerge == ST_Merge.CONTINUE:
-                    cells.append(cells[-col_count])
-                elif grid_span_idx > 0:
-                    cells.append(cells[-1])
-                else:
-                    cells.append(_Cell(tc, self))
-        return cells
+        are repeated. The grid is computed on first access and reused until
+        the table is changed through this object, so reading every row is
+        linear in the size of the table rather than quadratic.
+        """
+        if self._cell_grid is None:
+            col_count = self._column_count
+            cells = []
+            for tc in self._tbl.iter_tcs():
+                for grid_span_idx in range(tc.grid_span):
+                    if tc.vMerge == ST_Merge.CONTINUE:
+                        cells.append(cells[-col_count])
+                    elif grid_span_idx > 0:
+                        cells.append(cells[-1])
+                    else:
+                        cells.append(_Cell(tc, self))
+            self._cell_grid = cells
+        return self._cell_grid
 
     @property
     def _column_count(self):
         """
         The number of grid columns in this table.
         """
-        return self._tbl.col_count
+        if self._col_count is None:
+            self._col_count = self._tbl.col_count
+        return self._col_count
+
+    def _invalidate_cells(self):
+        """
+        Discard the cached layout grid after rows, columns or spans change.
+        """
+        self._cell_grid = None
+        self._col_count = None
+        self._row_indices = None
+
+    def _row_index(self, tr):
+        """
+        Index of the row *tr* in this table, looked up in a mapping built
+        once rather than by scanning the rows each time.
+        """
+        if self._row_indices is None:
+            self._row_indices = dict(
+                (row_tr, idx) for idx, row_tr in enumerate(self._tbl.tr_lst)
+            )
+        idx = self._row_indices.get(tr)
+        if idx is None:
+            return tr.tr_idx
+        return idx
 
     @property
     def _tblPr(self):
@@ -230,6 +275,7 @@ class _Cell(BlockItemContainer):
         """
         tc, tc_2 = self._tc, other_cell._tc
         merged_tc = tc.merge(tc_2)
+        self._parent.table._invalidate_cells()
         return _Cell(merged_tc, self._parent)
 
     @property
@@ -437,7 +483,7 @@ class _Row(Parented):
         """
         Index of this row in its table, starting from zero.
         """
-        return self._tr.tr_idx
+        return self.table._row_index(self._tr)
 
 
 class _Rows(Parented):
@@ -0,0 +1,95 @@
+import posixpath
+import zipfile
+from xml.etree.ElementTree import iterparse
+
+# Transitional and Strict OOXML use different namespaces for the same elements
+WORD_NAMESPACES = [
+    'http://schemas.openxmlformats.org/wordprocessingml/2006/main',
+    'http://purl.oclc.org/ooxml/wordprocessingml/main'
+]
+MARKUP_COMPATIBILITY_NAMESPACE = 'http://schemas.openxmlformats.org/markup-compatibility/2006'
+OFFICE_DOCUMENT_RELATIONSHIPS = [
+    'http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument',
+    'http://purl.oclc.org/ooxml/officeDocument/relationships/officeDocument'
+]
+PACKAGE_RELATIONSHIPS_NAMESPACE = 'http://schemas.openxmlformats.org/package/2006/relationships'
+DEFAULT_DOCUMENT_PART = 'word/document.xml'
+# Parts read for the text (a package whose relationships name another document part reads that one too)
+TEXT_PARTS = ['_rels/.rels', DEFAULT_DOCUMENT_PART]
+
+def _tags(local_name):
+    return {f'{{{namespace}}}{local_name}' for namespace in WORD_NAMESPACES}
+
+PARAGRAPH_TAGS = _tags('p')
+TEXT_TAGS = _tags('t')
+TAB_TAGS = _tags('tab') | _tags('ptab')
+BREAK_TAGS = _tags('br') | _tags('cr')
+BODY_TAGS = _tags('body')
+FALLBACK_TAG = f'{{{MARKUP_COMPATIBILITY_NAMESPACE}}}Fallback'
+
+def find_document_part(package):
+    """Return the name of the main document part, following the package relationships"""
+    try:
+        with package.open('_rels/.rels') as rels:
+            for _, element in iterparse(rels):
+                if (element.tag == f'{{{PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship'
+                        and element.get('Type') in OFFICE_DOCUMENT_RELATIONSHIPS):
+                    return posixpath.normpath(element.get('Target').lstrip('/'))
+    except KeyError:
+        pass
+    return DEFAULT_DOCUMENT_PART
+
+def iter_document_paragraphs(stream):
+    """Stream the text of every paragraph in a WordprocessingML document part, in document order.
+
+    Table cells, content controls and text boxes are paragraphs too, so they are
+    emitted where they appear in the document. Each finished top-level body
+    element is discarded, keeping memory bounded regardless of document size.
+    """
+    body = None
+    # One text buffer per open paragraph; text box paragraphs nest inside their anchor paragraph
+    open_paragraphs = []
+    fallback_depth = 0
+
+    for event, element in iterparse(stream, events=('start', 'end')):
+        tag = element.tag
+        if event == 'start':
+            if tag in PARAGRAPH_TAGS and not fallback_depth:
+                open_paragraphs.append([])
+            elif tag == FALLBACK_TAG:
+                # mc:Fallback repeats the mc:Choice content for older readers
+                fallback_depth += 1
+            elif tag in BODY_TAGS:
+                body = element
+            continue
+
+        if tag == FALLBACK_TAG:
+            fallback_depth -= 1
+        elif fallback_depth or not open_paragraphs:
+            pass
+        elif tag in TEXT_TAGS:
+            if element.text:
+                open_paragraphs[-1].append(element.text)
+        elif tag in TAB_TAGS:
+            open_paragraphs[-1].append('\t')
+        elif tag in BREAK_TAGS:
+            open_paragraphs[-1].append('\n')
+        elif tag in PARAGRAPH_TAGS:
+            yield ''.join(open_paragraphs.pop())
+            # Paragraphs inside large tables stay attached until the table ends, so empty them now
+            element.clear()
+
+        # Discard each top-level body element once it has been read
+        if body is not None and len(body) and body[-1] is element:
+            element.clear()
+            del body[-1]
+
+def iter_package_paragraphs(package):
+    """Stream paragraph and table cell text from an open DOCX zip package"""
+    with package.open(find_document_part(package)) as document_part:
+        yield from iter_document_paragraphs(document_part)
+
+def iter_docx_paragraphs(file):
+    """Stream paragraph and table cell text from a DOCX file or file-like object"""
+    with zipfile.ZipFile(file) as package:
+        yield from iter_package_paragraphs(package)
@@ -0,0 +1,119 @@
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, wait
+
+logger = logging.getLogger()
+
+# Metric names of the per-operation hedge counts
+HEDGE_METRIC_NAMES = {'calls': 'HedgeableCalls', 'hedged': 'HedgesIssued', 'won': 'HedgesWon'}
+
+class Hedger:
+    """Hedged requests: a call still running after a high percentile of recent latencies is
+    issued a second time, and the first successful response wins.
+
+    Latencies are kept per operation. Until min_samples calls have completed, the
+    caller's initial delay is used instead of the percentile. Every call earns
+    max_extra_ratio of a hedge and each hedge spends a whole one, so duplicates stay
+    under that share of the calls (a ratio of 0 disables hedging). The losing call is
+    left to finish on its worker thread; discard is called with its result, if any, to
+    release it. allow_hedge, if given, is asked before each hedge (e.g. to hold off while
+    the service is throttling, when a duplicate only adds load).
+    """
+
+    def __init__(self, executor, percentile=95, max_extra_ratio=0.05, min_delay_ms=0,
+                 min_samples=20, window=500, max_tokens=10):
+        self.executor = executor
+        self.percentile = percentile
+        self.max_extra_ratio = max_extra_ratio
+        self.min_delay_ms = min_delay_ms
+        self.min_samples = min_samples
+        self.window = window
+        self.max_tokens = max_tokens
+        self._latencies = {}
+        self._tokens = {}
+        # Counts since the last take_counts() call, and since the container started
+        self._counts = {}
+        self._totals = {}
+        self._lock = threading.Lock()
+
+    def delay_ms(self, operation, initial_delay_ms):
+        """How long a call waits before it is hedged"""
+        with self._lock:
+            latencies = sorted(self._latencies.get(operation, ()))
+        if len(latencies) < self.min_samples:
+            return max(initial_delay_ms, self.min_delay_ms)
+        index = min(len(latencies) - 1, int(len(latencies) * self.percentile / 100))
+        return max(latencies[index], self.min_delay_ms)
+
+    def _count(self, operation, name):
+        for counts in (self._counts, self._totals):
+            operation_counts = counts.setdefault(operation, {'calls': 0, 'hedged': 0, 'won': 0})
+            operation_counts[name] += 1
+
+    def _earn_token(self, operation):
+        with self._lock:
+            self._count(operation, 'calls')
+            self._tokens[operation] = min(self.max_tokens, self._tokens.get(operation, 1.0) + self.max_extra_ratio)
+
+    def _spend_token(self, operation):
+        with self._lock:
+            if self._tokens.get(operation, 0.0) < 1.0:
+                return False
+            self._tokens[operation] -= 1.0
+            self._count(operation, 'hedged')
+            return True
+
+    def _timed(self, operation, function):
+        start = time.perf_counter()
+        result = function()
+        latency_ms = (time.perf_counter() - start) * 1000
+        with self._lock:
+            self._latencies.setdefault(operation, deque(maxlen=self.window)).append(latency_ms)
+        return result
+
+    def call(self, operation, function, initial_delay_ms, discard=None, allow_hedge=None):
+        """Run function(), issuing a duplicate if it is slow, and return the first successful result"""
+        if self.max_extra_ratio <= 0:
+            return function()
+        self._earn_token(operation)
+        delay_ms = self.delay_ms(operation, initial_delay_ms)
+        attempts = [self.executor.submit(self._timed, operation, function)]
+        done, _ = wait(attempts, timeout=delay_ms / 1000)
+        if not done and (allow_hedge is None or allow_hedge()) and self._spend_token(operation):
+            logger.info(f"Hedging {operation} after {delay_ms:.0f} ms")
+            attempts.append(self.executor.submit(self._timed, operation, function))
+
+        # The first success wins; an error only counts once every attempt has failed
+        winner = None
+        error = None
+        pending = set(attempts)
+        while winner is None and pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in sorted(done, key=attempts.index):
+                if future.exception() is None:
+                    winner = future
+                    break
+                error = error or future.exception()
+        if winner is None:
+            raise error
+        if winner is not attempts[0]:
+            with self._lock:
+                self._count(operation, 'won')
+
+        for future in attempts:
+            if future is not winner and discard is not None:
+                future.add_done_callback(lambda loser: loser.exception() is None and discard(loser.result()))
+        return winner.result()
+
+    def take_counts(self):
+        """Return {operation: {'calls', 'hedged', 'won'}} since the last call, and reset them"""
+        with self._lock:
+            counts, self._counts = self._counts, {}
+        return counts
+
+    def totals(self):
+        """Return {operation: {'calls', 'hedged', 'won'}} since the container started"""
+        with self._lock:
+            return {operation: dict(counts) for operation, counts in self._totals.items()}
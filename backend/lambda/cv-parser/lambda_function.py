@@ -1,38 +1,382 @@
 import json
 import os
-import boto3
+import hashlib
+import io
 import logging
+import mmap
+import random
 import re
+import tempfile
+import time
+import zipfile
+from bisect import bisect_left
+from collections import namedtuple
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
+from urllib.parse import unquote_plus
+
+from botocore.exceptions import ClientError
+
+from aws_clients import BATCH_RETRY_MODE, RETRY_METRIC_NAMES, get_client, retry_mode, take_retry_counts, throttled_recently
+from deadline import Deadline, remaining_ms, skip_stage, skipped_stages, time_allows
+from docx_stream import TEXT_PARTS as DOCX_TEXT_PARTS, iter_docx_paragraphs, iter_package_paragraphs
+from hedging import HEDGE_METRIC_NAMES, Hedger
+from patterns import PatternRegistry
+from ranged_zip import S3RangeFile, zip_member_spans
+from skills_matcher import get_skills_matcher
+from speculation import Speculation
+from stage_timer import StageTimer, emit_count_metrics, stage
+from text_cache import TextCache, content_digest, etag_digest, is_etag_digest, make_cache_key
 
 # Configure logging
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-# Initialize AWS clients
-s3_client = boto3.client('s3')
-textract_client = boto3.client('textract')
+# Cache versions: bump EXTRACTION_VERSION when extracted text changes, PARSER_VERSION
+# when section rules change (cached text is then reused, only the regex stage re-runs and
+# the entry is stored again with the new sections).
+# DOCX entries are also keyed by DOCX_ENGINE, as the engines lay out tables differently
+EXTRACTION_VERSION = 'x2'
+# r2: section index headers, taxonomy skills matching; r3: case-sensitive ambiguous skill terms
+PARSER_VERSION = 'r3'
+
+# Extracted-text cache (in memory and /tmp per container, gzip JSON sidecars in S3). Sidecars
+# are written in the background: a single CV's response does not wait for its write, which
+# finishes once it is sent (or when a frozen container next runs); batches flush before returning.
+TEXT_CACHE_ENABLED = os.environ.get('TEXT_CACHE_ENABLED', 'true').lower() == 'true'
+text_cache = TextCache(
+    lambda: get_client('s3'),
+    bucket=os.environ.get('TEXT_CACHE_BUCKET'),  # defaults to the CV's own bucket
+    prefix=os.environ.get('TEXT_CACHE_PREFIX', 'cv-cache/'),
+    memory_bytes=int(os.environ.get('TEXT_CACHE_MEMORY_BYTES', str(32 * 1024 * 1024))),
+    disk_bytes=int(os.environ.get('TEXT_CACHE_DISK_BYTES', str(128 * 1024 * 1024)))
+)
+
+# File types a CV can be parsed from
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx')
+
+# Documents up to this size are buffered in memory; larger ones spill to a temp file
+MAX_IN_MEMORY_BYTES = int(os.environ.get('MAX_IN_MEMORY_BYTES', str(16 * 1024 * 1024)))
+S3_READ_CHUNK_BYTES = 256 * 1024
+
+# Textract mode: 'sync' sends page bytes to detect_document_text, 'async' runs a
+# start_document_text_detection job against the S3 object (multi-page, no bytes in the Lambda)
+TEXTRACT_MODE = os.environ.get('TEXTRACT_MODE', 'sync').lower()
+TEXTRACT_POLL_INITIAL_SECONDS = float(os.environ.get('TEXTRACT_POLL_INITIAL_SECONDS', '0.5'))
+TEXTRACT_POLL_MAX_SECONDS = float(os.environ.get('TEXTRACT_POLL_MAX_SECONDS', '4'))
+TEXTRACT_JOB_TIMEOUT_SECONDS = float(os.environ.get('TEXTRACT_JOB_TIMEOUT_SECONDS', '120'))
+# Synchronous Textract reads single-page documents straight from S3 (Document.S3Object) instead
+# of receiving their bytes; buckets Textract cannot read fall back to inline bytes
+TEXTRACT_S3_OBJECT = os.environ.get('TEXTRACT_S3_OBJECT', 'true').lower() == 'true'
+# Speculative mode: Textract starts on a worker thread as soon as the page count is known, while
+# PyPDF2 extracts the text layer. When every page passes MIN_PAGE_QUALITY the Textract result is
+# ignored (an async job stops being polled), otherwise it is awaited. Only PDFs Textract takes in
+# one request are speculated on: single pages, or any PDF in async mode. Every one of them is
+# billed for Textract, so the mode is off by default.
+PDF_SPECULATIVE_TEXTRACT = os.environ.get('PDF_SPECULATIVE_TEXTRACT', 'false').lower() == 'true'
+
+# DOCX engine: 'stream' reads word/document.xml with zipfile + iterparse, 'python-docx' builds the full object model
+DOCX_ENGINE = os.environ.get('DOCX_ENGINE', 'stream').lower()
+# With the 'stream' engine a DOCX is read with S3 Range GETs instead of downloaded whole: the
+# last DOCX_TAIL_BYTES (the zip directory, or all of a small file), then only the text parts.
+# That costs a second round trip, so files smaller than DOCX_RANGED_MIN_BYTES are still read
+# whole: downloaded at once when the HEAD request gave their size, or else completed with one
+# GET for what the tail did not cover. python-docx loads every part of the package, so it
+# always downloads the whole file.
+DOCX_RANGED_READS = os.environ.get('DOCX_RANGED_READS', 'true').lower() == 'true'
+DOCX_RANGED_MIN_BYTES = int(os.environ.get('DOCX_RANGED_MIN_BYTES', str(1024 * 1024)))
+DOCX_TAIL_BYTES = int(os.environ.get('DOCX_TAIL_BYTES', str(64 * 1024)))
+
+# Text-layer quality thresholds for local PDF extraction
+MIN_PAGE_CHARS = int(os.environ.get('MIN_PAGE_CHARS', '100'))
+MIN_PAGE_QUALITY = float(os.environ.get('MIN_PAGE_QUALITY', '0.6'))
+
+# Log per-pattern compile and match timings after each parse
+LOG_PATTERN_STATS = os.environ.get('LOG_PATTERN_STATS', 'false').lower() == 'true'
+
+# Per-stage timings: CloudWatch Embedded Metric Format lines, tracemalloc peaks, and
+# a 'timings' key in the response when enabled here or requested with includeTimings
+STAGE_METRICS_ENABLED = os.environ.get('STAGE_METRICS_ENABLED', 'true').lower() == 'true'
+STAGE_METRICS_NAMESPACE = os.environ.get('STAGE_METRICS_NAMESPACE', 'ApplySync/CvParser')
+# tracemalloc makes a parse several times slower, so peaks are only traced when enabled
+# here (every invocation) or for a STAGE_MEMORY_TRACING_RATE fraction of them
+STAGE_MEMORY_TRACING = os.environ.get('STAGE_MEMORY_TRACING', 'false').lower() == 'true'
+STAGE_MEMORY_TRACING_RATE = float(os.environ.get('STAGE_MEMORY_TRACING_RATE', '0'))
+INCLUDE_TIMINGS = os.environ.get('INCLUDE_TIMINGS', 'false').lower() == 'true'
+
+# Batch mode: SQS messages or S3 notifications parsed concurrently, results written to
+# BATCH_RESULTS_PREFIX + key + '.json' in the CV's bucket
+BATCH_MAX_WORKERS = int(os.environ.get('BATCH_MAX_WORKERS', '4'))
+BATCH_RESULTS_PREFIX = os.environ.get('BATCH_RESULTS_PREFIX', 'cv-results/')
+BATCH_METRIC_NAMES = {'records': 'BatchRecords', 'skipped': 'BatchObjectsSkipped', 'failed': 'BatchRecordsFailed'}
+
+# Hedged requests: an S3 GET or HEAD, or a Textract text detection, still running after the
+# HEDGE_PERCENTILE latency of recent calls (the initial delay until HEDGE_MIN_SAMPLES calls
+# have finished) is issued again and the first response wins. Hedges are capped at
+# HEDGE_MAX_EXTRA_RATIO of the calls per operation (0 disables hedging); a hedged Textract
+# call is billed twice.
+HEDGE_MAX_EXTRA_RATIO = float(os.environ.get('HEDGE_MAX_EXTRA_RATIO', '0.05'))
+HEDGE_PERCENTILE = float(os.environ.get('HEDGE_PERCENTILE', '95'))
+HEDGE_MIN_SAMPLES = int(os.environ.get('HEDGE_MIN_SAMPLES', '20'))
+HEDGE_MIN_DELAY_MS = float(os.environ.get('HEDGE_MIN_DELAY_MS', '20'))
+HEDGE_S3_INITIAL_DELAY_MS = float(os.environ.get('HEDGE_S3_INITIAL_DELAY_MS', '250'))
+HEDGE_TEXTRACT_INITIAL_DELAY_MS = float(os.environ.get('HEDGE_TEXTRACT_INITIAL_DELAY_MS', '4000'))
+# No hedges for a service that sent a throttling response this recently (retries are in aws_clients)
+HEDGE_THROTTLE_PAUSE_SECONDS = float(os.environ.get('HEDGE_THROTTLE_PAUSE_SECONDS', '10'))
+
+# Deadline: as the invocation's remaining time (less DEADLINE_RESERVE_MS for returning the
+# response) runs short, the optional fallback scans are skipped first, then the text is
+# capped to DEADLINE_TEXT_CAP_CHARS, then Textract is skipped in favour of the local text
+# layer. The response is flagged partial with the stages that were skipped.
+DEADLINE_RESERVE_MS = int(os.environ.get('DEADLINE_RESERVE_MS', '1000'))
+FALLBACK_SCAN_ESTIMATE_MS = int(os.environ.get('FALLBACK_SCAN_ESTIMATE_MS', '1500'))
+SECTIONS_ESTIMATE_MS = int(os.environ.get('SECTIONS_ESTIMATE_MS', '1000'))
+TEXTRACT_PAGE_ESTIMATE_MS = int(os.environ.get('TEXTRACT_PAGE_ESTIMATE_MS', '3000'))
+TEXTRACT_JOB_ESTIMATE_MS = int(os.environ.get('TEXTRACT_JOB_ESTIMATE_MS', '10000'))
+DEADLINE_TEXT_CAP_CHARS = int(os.environ.get('DEADLINE_TEXT_CAP_CHARS', '20000'))
+
+# Warm-up pings: {"warmup": true} or a scheduled EventBridge event. The bucket (the event's
+# s3Bucket, else WARMUP_S3_BUCKET) gets a HEAD request so its S3 endpoint connection is pooled.
+# Textract has no free request (even one for an unknown job id spends TPS quota), so by
+# default only its client is created; WARMUP_TEXTRACT_CONNECTION=true makes such a request too.
+WARMUP_EVENT_SOURCES = {'aws.events', 'serverless-plugin-warmup'}
+WARMUP_S3_BUCKET = os.environ.get('WARMUP_S3_BUCKET') or os.environ.get('TEXT_CACHE_BUCKET')
+WARMUP_TEXTRACT_CONNECTION = os.environ.get('WARMUP_TEXTRACT_CONNECTION', 'false').lower() == 'true'
+
+# Punctuation we expect in normal CV text (anything else counts as garbage)
+COMMON_PUNCTUATION = set('.,;:!?\'"()[]{}-–—_/\\|@#&%+*=<>~`$€£•·…’‘“”')
+
+# Hedged Requests
+# Each call and its duplicate run on a worker thread; a losing call keeps its thread until it finishes
+hedger = Hedger(
+    ThreadPoolExecutor(max_workers=4 * BATCH_MAX_WORKERS, thread_name_prefix='hedged-request'),
+    percentile=HEDGE_PERCENTILE,
+    max_extra_ratio=HEDGE_MAX_EXTRA_RATIO,
+    min_delay_ms=HEDGE_MIN_DELAY_MS,
+    min_samples=HEDGE_MIN_SAMPLES
+)
+
+def hedge_allowed(service_name):
+    """Return a check that holds off hedges while a service is throttling"""
+    return lambda: not throttled_recently(service_name, HEDGE_THROTTLE_PAUSE_SECONDS)
+
+def close_s3_body(response):
+    response['Body'].close()
+
+def get_s3_object(**params):
+    """S3 GetObject, hedged on the time until the response headers arrive (the caller reads the body)"""
+    # Clients are looked up here, as the active retry mode does not reach the hedging threads
+    client = get_client('s3')
+    return hedger.call('s3_get_object', lambda: client.get_object(**params),
+                       HEDGE_S3_INITIAL_DELAY_MS, discard=close_s3_body, allow_hedge=hedge_allowed('s3'))
+
+def head_s3_object(**params):
+    """S3 HeadObject, hedged"""
+    client = get_client('s3')
+    return hedger.call('s3_head_object', lambda: client.head_object(**params),
+                       HEDGE_S3_INITIAL_DELAY_MS, allow_hedge=hedge_allowed('s3'))
+
+def detect_document_text(document):
+    """Textract DetectDocumentText on inline bytes or an S3 object, hedged"""
+    client = get_client('textract')
+    return hedger.call('textract_detect_document_text', lambda: client.detect_document_text(Document=document),
+                       HEDGE_TEXTRACT_INITIAL_DELAY_MS, allow_hedge=hedge_allowed('textract'))
+
+# Document Fetching
+def fetch_document(bucket, key):
+    """Stream an S3 object into a bounded in-memory buffer that spills to a temp file when too large.
+    
+    Returns the buffer and the cache digests (ETag and content hash) identifying the document.
+    """
+    response = get_s3_object(Bucket=bucket, Key=key)
+    content_length = response.get('ContentLength', 0)
+    logger.info(f"Streaming {content_length} bytes from S3")
+    
+    # Held in a BytesIO up to MAX_IN_MEMORY_BYTES, then moved to an unnamed file
+    # in /tmp that is removed when the buffer is closed
+    document = io.BytesIO()
+    hasher = hashlib.sha256()
+    try:
+        for chunk in response['Body'].iter_chunks(chunk_size=S3_READ_CHUNK_BYTES):
+            if isinstance(document, io.BytesIO) and document.tell() + len(chunk) > MAX_IN_MEMORY_BYTES:
+                document = spill_to_temp_file(document)
+            document.write(chunk)
+            hasher.update(chunk)
+    except Exception:
+        document.close()
+        raise
+    finally:
+        response['Body'].close()
+    
+    document.seek(0)
+    if isinstance(document, io.BytesIO):
+        # Trims the buffer BytesIO over-allocated while growing, so document_buffer can
+        # share it as it is
+        document.getvalue()
+    
+    digests = [content_digest(hasher)]
+    if response.get('ETag'):
+        digests.append(etag_digest(response['ETag']))
+    return document, digests
+
+def spill_to_temp_file(buffer):
+    """Move an in-memory document buffer to a temp file, returning the file positioned at its end"""
+    logger.info(f"Document larger than {MAX_IN_MEMORY_BYTES} bytes, spilling to temp file")
+    spilled = tempfile.TemporaryFile()
+    try:
+        with buffer.getbuffer() as contents:
+            spilled.write(contents)
+    except Exception:
+        spilled.close()
+        raise
+    finally:
+        buffer.close()
+    return spilled
+
+def read_document_bytes(document):
+    """Read the full contents of a fetched document"""
+    document.seek(0)
+    return document.read()
+
+@contextmanager
+def document_buffer(document):
+    """The contents of a fetched document as a buffer PdfReader can parse in place.
+    
+    A document held in memory is shared as the bytes object its BytesIO holds, without
+    copying it; one spilled to /tmp is memory-mapped, so only the parts PyPDF2 reads are
+    paged in. The map is released on exit.
+    """
+    if isinstance(document, io.BytesIO):
+        # getvalue() hands over the BytesIO's own bytes while no view of them is held, and
+        # PyPDF2 reads bytes in place (a getbuffer() view it would have to copy)
+        yield document.getvalue()
+        return
+    document.flush()
+    try:
+        mapped = mmap.mmap(document.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:
+        # An empty file cannot be mapped
+        yield b''
+        return
+    try:
+        yield mapped
+    finally:
+        mapped.close()
 
 # Text Extraction Functions
-def extract_from_pdf_with_textract(file_path):
+# Buckets Textract could not read objects from (other region, KMS key it cannot use, ...)
+textract_unreadable_buckets = set()
+# Worker threads for speculative Textract calls (batch mode parses up to BATCH_MAX_WORKERS CVs at once)
+speculation_executor = ThreadPoolExecutor(max_workers=BATCH_MAX_WORKERS, thread_name_prefix='speculative-textract')
+
+def textract_line_text(response):
+    """Join the LINE blocks of a Textract response"""
+    text = ""
+    for block in response['Blocks']:
+        if block['BlockType'] == 'LINE':
+            text += block['Text'] + "\n"
+    return text
+
+def detect_text_with_textract(file_bytes):
+    """Run Textract text detection on document bytes and return the LINE text"""
+    with stage('textract', len(file_bytes)):
+        response = detect_document_text({'Bytes': file_bytes})
+    return textract_line_text(response)
+
+def detect_text_with_textract_s3(s3_location, read_bytes):
+    """Run Textract text detection on a whole S3 object and return the LINE text.
+    
+    Textract fetches the object itself, so no document bytes are uploaded and the
+    10 MB S3 limit applies instead of the 5 MB inline one. read_bytes is only called
+    when Textract cannot read the bucket.
+    """
+    bucket, key = s3_location
+    if TEXTRACT_S3_OBJECT and bucket not in textract_unreadable_buckets:
+        try:
+            with stage('textract'):
+                response = detect_document_text({'S3Object': {'Bucket': bucket, 'Name': key}})
+            return textract_line_text(response)
+        except ClientError as e:
+            if e.response['Error'].get('Code') != 'InvalidS3ObjectException':
+                raise
+            logger.warning(f"Textract cannot read s3://{bucket}, sending document bytes instead: {str(e)}")
+            textract_unreadable_buckets.add(bucket)
+    return detect_text_with_textract(read_bytes())
+
+def wait_for_textract_job(job_id, stop=None):
+    """Poll an asynchronous Textract job with exponential backoff and return its first result page.
+    
+    Setting the stop event (a speculative job whose result is no longer needed) ends the polling.
+    """
+    delay = TEXTRACT_POLL_INITIAL_SECONDS
+    # Stop polling in time to parse whatever text is available before the invocation ends
+    timeout_seconds = min(TEXTRACT_JOB_TIMEOUT_SECONDS, (remaining_ms() - SECTIONS_ESTIMATE_MS) / 1000)
+    deadline = time.monotonic() + timeout_seconds
+    while True:
+        response = get_client('textract').get_document_text_detection(JobId=job_id, MaxResults=1000)
+        status = response['JobStatus']
+        if status in ['SUCCEEDED', 'PARTIAL_SUCCESS']:
+            if status == 'PARTIAL_SUCCESS':
+                logger.warning(f"Textract job {job_id} partially succeeded: {response.get('Warnings')}")
+            return response
+        if status == 'FAILED':
+            raise RuntimeError(f"Textract job {job_id} failed: {response.get('StatusMessage')}")
+        if time.monotonic() + delay > deadline:
+            raise TimeoutError(f"Textract job {job_id} did not finish within {max(timeout_seconds, 0):.1f}s")
+        if stop is None:
+            time.sleep(delay)
+        elif stop.wait(delay):
+            raise CancelledError(f"Stopped polling Textract job {job_id}")
+        delay = min(delay * 2, TEXTRACT_POLL_MAX_SECONDS)
+
+def detect_pages_with_textract_async(bucket, key, stop=None):
+    """Run asynchronous Textract text detection on an S3 object and return its LINE text per page"""
+    logger.info(f"Starting asynchronous Textract job for s3://{bucket}/{key}")
+    with stage('textract_async_job'):
+        job = get_client('textract').start_document_text_detection(
+            DocumentLocation={'S3Object': {'Bucket': bucket, 'Name': key}}
+        )
+        job_id = job['JobId']
+        
+        # The final poll already carries the first page of results
+        response = wait_for_textract_job(job_id, stop)
+    
+    # Result pages are chained by NextToken, so fetch the next one in the background
+    # while the blocks of the current one are assembled
+    page_lines = {}
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        while True:
+            next_token = response.get('NextToken')
+            next_response = None
+            if next_token:
+                next_response = executor.submit(
+                    get_client('textract').get_document_text_detection,
+                    JobId=job_id, MaxResults=1000, NextToken=next_token
+                )
+            
+            # Keep the page boundary of every LINE block
+            for block in response['Blocks']:
+                if block['BlockType'] == 'LINE':
+                    page_lines.setdefault(block.get('Page', 1), []).append(block['Text'])
+            
+            if next_response is None:
+                break
+            response = next_response.result()
+    
+    logger.info(f"Textract job {job_id} returned text for {len(page_lines)} pages")
+    return {page: "\n".join(lines) + "\n" for page, lines in sorted(page_lines.items())}
+
+def extract_from_pdf_with_textract(document, s3_location=None):
     """Extract text from PDF using Amazon Textract"""
     try:
         logger.info("Extracting text from PDF using Amazon Textract")
         
-        # Read the file as bytes
-        with open(file_path, 'rb') as file:
-            file_bytes = file.read()
-
-        # Call Textract to extract text
-        response = textract_client.detect_document_text(
-            Document={'Bytes': file_bytes}
-        )
-
-        # Extract text from Textract response
-        text = ""
-        for block in response['Blocks']:
-            if block['BlockType'] == 'LINE':
-                text += block['Text'] + "\n"
+        # Call Textract on the S3 object, or on the document bytes
+        if s3_location is not None:
+            text = detect_text_with_textract_s3(s3_location, lambda: read_document_bytes(document))
+        else:
+            text = detect_text_with_textract(read_document_bytes(document))
 
         logger.info(f"Extracted text length: {len(text)} characters")
         logger.info(f"Extracted text sample: {text[:300]}...")
@@ -44,47 +388,478 @@ def extract_from_pdf_with_textract(file_path):
         logger.error(f"Error extracting PDF with Textract: {str(e)}")
         raise
 
-def extract_from_docx(file_path):
-    """Extract text from DOCX file using python-docx"""
+def score_page_text(text):
+    """Score the quality of a page's text layer between 0 and 1"""
+    visible = [c for c in text if not c.isspace()]
+    if not visible:
+        return {"chars": 0, "glyph_coverage": 0.0, "garbage_ratio": 1.0, "score": 0.0}
+    
+    # Glyph coverage: characters that decoded to something printable (no replacement or private-use glyphs)
+    decoded = sum(1 for c in visible if c.isprintable() and c != '\ufffd' and not '\ue000' <= c <= '\uf8ff')
+    glyph_coverage = decoded / len(visible)
+    
+    # Garbage ratio: characters that are neither letters, digits nor ordinary punctuation
+    garbage = sum(1 for c in visible if not c.isalnum() and c not in COMMON_PUNCTUATION)
+    garbage_ratio = garbage / len(visible)
+    
+    # Penalize pages with too little text to trust (e.g. scanned pages with a stray footer)
+    density = min(1.0, len(visible) / MIN_PAGE_CHARS)
+    score = density * glyph_coverage * (1.0 - garbage_ratio)
+    
+    return {
+        "chars": len(visible),
+        "glyph_coverage": round(glyph_coverage, 3),
+        "garbage_ratio": round(garbage_ratio, 3),
+        "score": round(score, 3)
+    }
+
+def write_single_page_pdf(page):
+    """Serialize one PDF page as a document of its own"""
+    from io import BytesIO
+    from PyPDF2 import PdfWriter
+    
+    writer = PdfWriter()
+    writer.add_page(page)
+    buffer = BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+def extract_page_with_textract(page, s3_location=None):
+    """Extract text from a single PDF page using Amazon Textract.
+    
+    Textract's synchronous API only handles single-page documents, so the page is
+    sent on its own. Pass s3_location only when the page is the whole document, so
+    Textract can read it from S3 instead.
+    """
+    if s3_location is not None:
+        return detect_text_with_textract_s3(s3_location, lambda: write_single_page_pdf(page))
+    return detect_text_with_textract(write_single_page_pdf(page))
+
+def start_speculative_textract(document, page_count, s3_location, use_async_textract):
+    """Start Textract on the whole PDF on a worker thread, returning (engine, speculation).
+    
+    Returns None when Textract would need more than one request (a multi-page PDF in
+    sync mode) or there is no time for it. The speculation's result maps page numbers to text.
+    """
+    if use_async_textract:
+        bucket, key = s3_location
+        engine, needed_ms = 'textract-async', TEXTRACT_JOB_ESTIMATE_MS
+        detect = lambda stop: detect_pages_with_textract_async(bucket, key, stop)
+    elif page_count == 1:
+        # Read here, as the worker must not move the file position under PyPDF2
+        file_bytes = read_document_bytes(document)
+        engine, needed_ms = 'textract', TEXTRACT_PAGE_ESTIMATE_MS
+        if s3_location is not None:
+            detect = lambda stop: {1: detect_text_with_textract_s3(s3_location, lambda: file_bytes)}
+        else:
+            detect = lambda stop: {1: detect_text_with_textract(file_bytes)}
+    else:
+        return None
+    
+    # Checked without time_allows, which would flag the response partial though the text layer may do
+    if remaining_ms() < needed_ms + SECTIONS_ESTIMATE_MS:
+        return None
+    logger.info(f"Starting speculative {engine} extraction alongside the text layer")
+    return engine, Speculation(speculation_executor, detect)
+
+def finish_speculative_textract(engine, speculation, low_quality_pages, page_texts, page_report):
+    """Abandon a speculative Textract call if the text layer passed, else await it for the low-quality pages.
+    
+    Returns the engine that won and the Textract error, if any.
+    """
+    if not low_quality_pages:
+        speculation.abandon()
+        logger.info(f"Text layer passed, ignoring speculative {engine} result")
+        return 'pypdf2', None
+    
+    # Stop waiting in time to parse the text layer before the invocation ends
+    remaining = remaining_ms()
+    timeout = None if remaining == float('inf') else max(0, remaining - SECTIONS_ESTIMATE_MS) / 1000
     try:
-        from docx import Document
-        document = Document(file_path)
-        
-        # Extract text from paragraphs
-        paragraphs = []
-        for paragraph in document.paragraphs:
-            if paragraph.text.strip():
-                paragraphs.append(paragraph.text)
-        
-        # Extract text from tables
-        for table in document.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    for paragraph in cell.paragraphs:
-                        if paragraph.text.strip():
-                            paragraphs.append(paragraph.text)
+        textract_pages = speculation.result(timeout)
+    except TimeoutError as e:
+        logger.error(f"Speculative {engine} for pages {low_quality_pages} ran out of time: {str(e)}")
+        skip_stage('textract_async_job' if engine == 'textract-async' else 'textract')
+        return 'pypdf2', None
+    except Exception as e:
+        logger.error(f"Error extracting pages {low_quality_pages} with speculative {engine}: {str(e)}")
+        return 'pypdf2', e
+    
+    for page_number in low_quality_pages:
+        page_texts[page_number - 1] = textract_pages.get(page_number, "")
+        page_report[page_number - 1]["engine"] = engine
+    return engine, None
+
+def extract_from_pdf(document, s3_location=None, buffer=None):
+    """Extract text from PDF using its text layer, sending only low-quality pages to Textract.
+    
+    PyPDF2 parses the buffer of the document's contents when given one (see document_buffer),
+    else reads the document itself. Returns the text and the extraction report: per-page
+    engines and quality scores, and in speculative mode which engine won and how long each path took.
+    """
+    use_async_textract = TEXTRACT_MODE == 'async' and s3_location is not None
+    try:
+        from PyPDF2 import PdfReader
+        if buffer is None:
+            document.seek(0)
+        reader = PdfReader(document if buffer is None else buffer)
+        if reader.is_encrypted:
+            reader.decrypt('')
+        pages = reader.pages
+        page_count = len(pages)
+    except Exception as e:
+        # Unreadable PDF structure - let Textract deal with the whole document
+        logger.warning(f"Local PDF extraction unavailable, using Textract: {str(e)}")
+        if use_async_textract:
+            if not time_allows('textract_async_job', TEXTRACT_JOB_ESTIMATE_MS + SECTIONS_ESTIMATE_MS):
+                return "", {"pages": []}
+            textract_pages = detect_pages_with_textract_async(*s3_location)
+            text = clean_text("\n".join(textract_pages[number] for number in sorted(textract_pages)))
+            return text, {"pages": [{"page": number, "engine": "textract-async"} for number in sorted(textract_pages)]}
+        if not time_allows('textract', TEXTRACT_PAGE_ESTIMATE_MS + SECTIONS_ESTIMATE_MS):
+            return "", {"pages": []}
+        text = extract_from_pdf_with_textract(document, s3_location)
+        return text, {"pages": [{"page": 1, "engine": "textract"}]}
+    
+    speculative = None
+    if PDF_SPECULATIVE_TEXTRACT:
+        speculative = start_speculative_textract(document, page_count, s3_location, use_async_textract)
+    
+    logger.info(f"Extracting text layer from {page_count} PDF pages using PyPDF2")
+    local_start = time.perf_counter()
+    page_texts = []
+    page_report = []
+    low_quality_pages = []
+    for page_number, page in enumerate(pages, start=1):
+        try:
+            page_text = page.extract_text() or ""
+        except Exception as e:
+            logger.warning(f"Error extracting text layer from page {page_number}: {str(e)}")
+            page_text = ""
         
-        # Join paragraphs with newlines
-        text = '\n'.join(paragraphs)
-        logger.info(f"Extracted DOCX text length: {len(text)} characters")
-        logger.info(f"Extracted text sample: {text[:300]}...")
+        quality = score_page_text(page_text)
+        if quality["score"] < MIN_PAGE_QUALITY:
+            logger.info(f"Page {page_number} text layer score {quality['score']} below {MIN_PAGE_QUALITY}, using Textract")
+            low_quality_pages.append(page_number)
         
-        # Clean up text
-        text = clean_text(text)
-        return text
+        page_texts.append(page_text)
+        page_report.append({"page": page_number, "engine": "pypdf2", **quality})
+    local_ms = round((time.perf_counter() - local_start) * 1000, 3)
+    extraction = {"pages": page_report}
+    
+    # Image-only or garbled pages go to Textract
+    # Pages keep their text layer when there is no time left for Textract
+    textract_error = None
+    if speculative is not None:
+        engine, speculation = speculative
+        winner, textract_error = finish_speculative_textract(engine, speculation, low_quality_pages, page_texts, page_report)
+        # textract_ms is None when the text layer won before Textract finished
+        extraction["speculation"] = {
+            "winner": winner,
+            "local_ms": local_ms,
+            "textract_ms": speculation.elapsed_ms(),
+            "textract": speculation.state
+        }
+        logger.info(f"Speculative extraction: {extraction['speculation']}")
+    elif low_quality_pages and use_async_textract:
+        # One asynchronous job covers every page, so only a single Textract request is needed
+        if time_allows('textract_async_job', TEXTRACT_JOB_ESTIMATE_MS + SECTIONS_ESTIMATE_MS):
+            try:
+                textract_pages = detect_pages_with_textract_async(*s3_location)
+                for page_number in low_quality_pages:
+                    page_texts[page_number - 1] = textract_pages.get(page_number, "")
+                    page_report[page_number - 1]["engine"] = "textract-async"
+            except TimeoutError as e:
+                logger.error(f"Asynchronous Textract for pages {low_quality_pages} ran out of time: {str(e)}")
+                skip_stage('textract_async_job')
+            except Exception as e:
+                logger.error(f"Error extracting pages {low_quality_pages} with asynchronous Textract: {str(e)}")
+                textract_error = e
+    else:
+        for page_number in low_quality_pages:
+            if not time_allows('textract', TEXTRACT_PAGE_ESTIMATE_MS + SECTIONS_ESTIMATE_MS):
+                break
+            try:
+                # A single-page document is the page itself, so Textract can read it from S3
+                page_location = s3_location if page_count == 1 else None
+                page_texts[page_number - 1] = extract_page_with_textract(pages[page_number - 1], page_location)
+                page_report[page_number - 1]["engine"] = "textract"
+            except Exception as e:
+                logger.error(f"Error extracting page {page_number} with Textract: {str(e)}")
+                textract_error = e
+    
+    text = "\n".join(page_texts)
+    if textract_error and not text.strip():
+        raise textract_error
+    logger.info(f"Extracted text length: {len(text)} characters")
+    logger.info(f"Extracted text sample: {text[:300]}...")
+    
+    # Clean up text
+    text = clean_text(text)
+    return text, extraction
+
+def extract_paragraphs_with_python_docx(document):
+    """Extract paragraph and table text from DOCX using python-docx"""
+    from docx import Document
+    document = Document(document)
+    
+    # Extract text from paragraphs
+    paragraphs = []
+    for paragraph in document.paragraphs:
+        if paragraph.text.strip():
+            paragraphs.append(paragraph.text)
+    
+    # Extract text from tables, once per merged cell
+    for table in document.tables:
+        for cell_text in table.iter_cell_text():
+            for line in cell_text.split('\n'):
+                if line.strip():
+                    paragraphs.append(line)
+    return paragraphs
+
+def docx_text(paragraphs):
+    """Join DOCX paragraphs into cleaned text"""
+    # Join paragraphs with newlines
+    text = '\n'.join(paragraphs)
+    logger.info(f"Extracted DOCX text length: {len(text)} characters")
+    logger.info(f"Extracted text sample: {text[:300]}...")
+    
+    # Clean up text
+    return clean_text(text)
+
+def extract_from_docx(document):
+    """Extract text from DOCX file by streaming its document XML (or with python-docx when configured)"""
+    try:
+        document.seek(0)
+        if DOCX_ENGINE == 'python-docx':
+            paragraphs = extract_paragraphs_with_python_docx(document)
+        else:
+            # Paragraphs and table cells in document order
+            paragraphs = [paragraph for paragraph in iter_docx_paragraphs(document) if paragraph.strip()]
+        return docx_text(paragraphs)
+    except Exception as e:
+        logger.error(f"Error extracting DOCX: {str(e)}")
+        raise
+
+def open_ranged_docx(bucket, key):
+    """Open a DOCX in S3 for ranged GETs, fetching its last DOCX_TAIL_BYTES (the zip directory, or all of a small file)"""
+    with stage('download') as record:
+        remote = S3RangeFile(get_s3_object, bucket, key, tail_bytes=DOCX_TAIL_BYTES)
+        record['bytes'] = remote.bytes_fetched
+    return remote
+
+def read_whole_document(remote):
+    """Read the rest of an object opened for ranged GETs, and return it as fetch_document would"""
+    data = remote.read_all()
+    digests = [content_digest(hashlib.sha256(data))]
+    if remote.etag:
+        digests.append(etag_digest(remote.etag))
+    return io.BytesIO(data), digests
+
+def extract_from_docx_in_s3(remote):
+    """Extract text from a DOCX opened with open_ranged_docx, fetching only its text parts.
+    
+    Embedded images and fonts are never downloaded.
+    """
+    try:
+        with stage('download') as record:
+            tail_bytes = remote.bytes_fetched
+            package = zipfile.ZipFile(remote)
+            remote.prefetch(zip_member_spans(package, DOCX_TEXT_PARTS))
+            record['bytes'] = remote.bytes_fetched - tail_bytes
+        with package:
+            with stage('extract_docx', remote.size):
+                # Paragraphs and table cells in document order
+                paragraphs = [paragraph for paragraph in iter_package_paragraphs(package) if paragraph.strip()]
+        logger.info(f"Read {remote.bytes_fetched} of {remote.size} DOCX bytes in {remote.requests} ranged GETs")
+        return docx_text(paragraphs)
     except Exception as e:
         logger.error(f"Error extracting DOCX: {str(e)}")
         raise
 
 def clean_text(text):
     """Clean extracted text"""
-    # Replace multiple whitespace with single space
-    text = re.sub(r'\s+', ' ', text)
-    # Add newlines at periods to help with section detection
-    text = re.sub(r'\.\s+', '.\n', text)
-    return text.strip()
+    with stage('clean_text', len(text.encode('utf-8'))):
+        # Replace multiple whitespace with single space
+        text = patterns.sub('whitespace_run', ' ', text)
+        # Add newlines at periods to help with section detection
+        text = patterns.sub('sentence_break', '.\n', text)
+        return text.strip()
+
+# Extractor Patterns
+# Every extractor regex is registered here once and compiled once per container
+patterns = PatternRegistry()
+
+# Text cleanup
+patterns.register('whitespace_run', r'\s+')
+patterns.register('sentence_break', r'\.\s+')
+
+# Personal info
+NAME_PATTERNS = [
+    patterns.register('name_all_caps', r'^([A-Z][A-Z\s]+(?:[A-Z][a-z]+\s)*[A-Z][a-z]+)'),  # FIRST LAST or FIRST MIDDLE LAST
+    patterns.register('name_at_start', r'^([A-Z][a-z]+\s+[A-Z][a-z]+)'),  # First Last at start
+    patterns.register('name_anywhere', r'\b([A-Z][a-z]+\s+[A-Z][a-z]+)\b'),  # First Last anywhere
+    patterns.register('name_labeled', r'Name:?\s*([A-Z][a-z]+\s+[A-Z][a-z]+)')  # Name: First Last
+]
+patterns.register('street_word', r'\b(road|street|avenue|lane|drive|blvd)\b', re.IGNORECASE)
+# Email local parts are only tried from the start of a run of local-part characters:
+# every later start in the same run reaches the same "@" (or fails for the same
+# reason), so retrying them made long dotted or hyphenated runs quadratic.
+EMAIL_LOCAL = r'[A-Za-z0-9._%+-]'
+EMAIL_DOMAIN = r'@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}'
+
+def labeled_email_pattern(label):
+    """Build a '<label>: address' pattern that tries each run of local-part characters once"""
+    return (
+        # First label in a run (the address may continue the run), or a label followed by ":" or a space
+        r'(?:(?<!' + EMAIL_LOCAL + r')(?:(?!' + label + r')' + EMAIL_LOCAL + r')*+' + label + r'|' + label + r'(?=[:\s]))'
+        r':?\s*+(' + EMAIL_LOCAL + r'++' + EMAIL_DOMAIN + r')'
+    )
+
+# (pattern name, group holding the email)
+EMAIL_PATTERNS = [
+    # The address starts at the first word boundary of its run of local-part characters
+    (patterns.register('email', r'(?<!' + EMAIL_LOCAL + r')(?:(?!\b)' + EMAIL_LOCAL + r')*+\b(' + EMAIL_LOCAL + r'++' + EMAIL_DOMAIN + r'\b)', re.IGNORECASE), 1),
+    (patterns.register('email_labeled', labeled_email_pattern('email'), re.IGNORECASE), 1),
+    (patterns.register('e-mail_labeled', labeled_email_pattern('e-mail'), re.IGNORECASE), 1)
+]
+PHONE_PATTERNS = [
+    patterns.register('phone', r'\b(?:\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}\b', re.IGNORECASE),
+    patterns.register('phone_digits', r'\b\d{2,3}[-.\s]?\d{7,10}\b', re.IGNORECASE),
+    patterns.register('phone_labeled', r'phone:?\s*(\+?[\d\s\-\(\)\.]+)', re.IGNORECASE),
+    patterns.register('tel_labeled', r'tel:?\s*(\+?[\d\s\-\(\)\.]+)', re.IGNORECASE),
+    patterns.register('mobile_labeled', r'mobile:?\s*(\+?[\d\s\-\(\)\.]+)', re.IGNORECASE)
+]
 
-# Section Extraction Functions (unchanged)
+# Education
+# Institution names are found by find_university_mentions from these two patterns
+patterns.register('university_keyword', r'University|College|Institute|School', re.IGNORECASE)
+patterns.register('university_delimiter', r'[\.,\n]')
+# The degree name plus one character, then optionally "in|of <subject>" to the end of the run
+patterns.register('degree', r'((?:BSc|B\.Sc|MSc|M\.Sc|PhD|Ph\.D|Bachelor|Master|Diploma|B\.A\.|M\.A\.|B\.S\.|M\.S\.)[\s\w\.,&\(\)](?:(?:in|of)?\s[\w\s\.,&]++)?)', re.IGNORECASE)
+patterns.register('leading_bullet_or_number', r'^\s*[•\-\*\d\.]+\s*')
+patterns.register('trailing_date', r'\d{1,2}[/-]\d{1,2}[/-]\d{2,4}.*$')
+patterns.register('trailing_certificate', r'(?i)certificates?.*$')
+
+# Skills and certifications
+# A date (or date range) and the line after it. Only the first date on a line is tried, as
+# later dates reach the same line end; a later range can only differ by running onto the next line.
+DATED_ITEM_DATE = r'\d{2}\/\d{4}'
+DATED_ITEM_END = r'(?:' + DATED_ITEM_DATE + r'|Present|present|current|Current|now|Now)'
+patterns.register('dated_item', (
+    r'(?:^(?:(?!' + DATED_ITEM_DATE + r')[^\n])*+(?:' + DATED_ITEM_DATE + r'\s*[–-]\s*' + DATED_ITEM_END + r'|' + DATED_ITEM_DATE + r')'
+    r'|' + DATED_ITEM_DATE + r'(?:\s*[–-][^\S\n]*+\n\s*|[^\S\n]*+\n\s*[–-]\s*)' + DATED_ITEM_END + r')'
+    r'[^\n]*+\n([^\n]+)'
+), re.MULTILINE)
+patterns.register('bullet_item', r'[•*-]([^•*\n]+)')
+patterns.register('date_only_line', r'^\d{2}\/\d{4}\s*[–-]\s*\d{2}\/\d{4}$|^\d{2}\/\d{4}$')
+# A category only starts where a run of category characters starts (only the run's end can meet the colon)
+patterns.register('skill_category', r'(?<![A-Za-z\s&])([A-Za-z\s&]++)(?::|—)\s*([A-Za-z0-9\s,\.&+#]+)')
+patterns.register('comma_separator', r',\s*')
+patterns.register('comma_or_newline', r'[,\n]')
+patterns.register('date_range', r'\b\d{2}\/\d{4}\s*[–-]\s*(?:\d{2}\/\d{4}|present|Present)\b')
+patterns.register('leading_bullets', r'^[\s•*-]+')
+
+# Experience and projects
+# A capital, one title character, then title characters up to the first whitespace
+patterns.register('entry_title_break', r'\n(?=[A-Z][a-zA-Z0-9\s\-&][a-zA-Z0-9\-&]*+\s)')
+patterns.register('bullet_group', r'(?:^|\n)([^\n•*-]*+(?:\n\s*+[•*-][^\n]*+)+)')
+patterns.register('paragraph_break', r'\n\s*\n')
+
+# Section Segmentation
+# Section header keywords grouped by the normalized kind of section they start
+SECTION_HEADERS = {
+    'education': ['education', 'academic background', 'academic qualifications'],
+    'skills': ['skills', 'technical skills', 'competencies', 'proficiencies', 'expertise', 'technologies'],
+    'certifications': ['certificates', 'certifications', 'certification'],
+    'projects': ['projects', 'personal projects', 'academic projects', 'key projects'],
+    'experience': ['experience', 'work experience', 'professional experience', 'employment', 'work history'],
+    'awards': ['awards', 'achievements'],
+    'references': ['references'],
+    'languages': ['languages'],
+    'interests': ['interests'],
+    'summary': ['summary', 'about me', 'profile'],
+    'contact': ['contact', 'personal details', 'personal information']
+}
+SECTION_KINDS = {keyword: kind for kind, keywords in SECTION_HEADERS.items() for keyword in keywords}
+
+# Keywords that are usually sub-headings when another word precedes them, e.g. "Programming Languages:"
+QUALIFIABLE_HEADERS = {'languages', 'technologies', 'expertise', 'interests', 'profile', 'contact'}
+
+def keyword_alternation(keywords):
+    """Build a regex alternation of keywords grouped by first letter, longest first within each group.
+    
+    Grouping lets the regex engine reject most positions after a single character
+    instead of trying every keyword, and longest-first ordering makes
+    "work experience" win over "experience".
+    """
+    groups = {}
+    for keyword in sorted(keywords, key=len, reverse=True):
+        groups.setdefault(keyword[0].lower(), []).append(re.escape(keyword[1:]).replace(r'\ ', r'\s+'))
+    first_letters = ''.join(sorted(groups))
+    return (
+        r'(?=[' + first_letters + first_letters.upper() + r'])(?:'
+        + '|'.join(re.escape(letter) + '(?:' + '|'.join(rests) + ')' for letter, rests in sorted(groups.items()))
+        + ')'
+    )
+
+# All header keywords in one pattern so the text is scanned once
+patterns.register('section_header', r'\b(' + keyword_alternation(SECTION_KINDS) + r')\b', re.IGNORECASE)
+
+Section = namedtuple('Section', ['kind', 'header', 'start', 'end'])
+
+def is_section_header(text, match):
+    """Decide whether a header keyword occurrence actually starts a section"""
+    header = match.group(1)
+    before = match.start()
+    while before > 0 and text[before - 1] in ' \t':
+        before -= 1
+    if header.lower() in QUALIFIABLE_HEADERS and before > 0 and text[before - 1].isalpha():
+        return False
+    
+    # "Skills:" or "Skills —" anywhere in the text
+    after = match.end()
+    while after < len(text) and text[after] in ' \t':
+        after += 1
+    if after < len(text) and text[after] in ':—':
+        return True
+    
+    # Headers written in capitals, e.g. "EDUCATION University of ..."
+    if header.isupper() and len(header) > 3:
+        return True
+    
+    # A keyword standing alone on its own line
+    while before > 0 and text[before - 1] in ' \t•*-':
+        before -= 1
+    return (before == 0 or text[before - 1] == '\n') and (after == len(text) or text[after] == '\n')
+
+def build_section_index(text):
+    """Segment CV text into sections in a single pass over the text.
+    
+    Each section records its normalized kind, the header as written, and the
+    start/end offsets of its body (header excluded) so extractors can slice it.
+    """
+    headers = []
+    for match in patterns.finditer('section_header', text):
+        if is_section_header(text, match):
+            # Body starts after the header and its colon, if any
+            body_start = match.end()
+            while body_start < len(text) and text[body_start] in ' \t:—':
+                body_start += 1
+            kind = SECTION_KINDS[patterns.sub('whitespace_run', ' ', match.group(1).lower())]
+            headers.append((kind, match.group(1), match.start(), body_start))
+    
+    sections = []
+    for i, (kind, header, _, body_start) in enumerate(headers):
+        end = headers[i + 1][2] if i + 1 < len(headers) else len(text)
+        sections.append(Section(kind, header, body_start, max(body_start, end)))
+    return sections
+
+def get_section_texts(text, sections, kind):
+    """Return the body text of every section of the given kind"""
+    return [text[section.start:section.end].strip() for section in sections if section.kind == kind]
+
+# Section Extraction Functions
 def extract_sections(text):
     """Extract different sections from CV text"""
     try:
@@ -95,13 +870,23 @@ def extract_sections(text):
             "personal_info": {}
         }
         
+        text_bytes = len(text.encode('utf-8'))
+        
         # Extract personal information
-        result["personal_info"] = extract_personal_info(text)
+        with stage('personal_info', text_bytes):
+            result["personal_info"] = extract_personal_info(text)
+        
+        # Segment the text once and let every extractor slice the sections it needs
+        with stage('section_index', text_bytes):
+            sections = build_section_index(text)
         
         # Extract education, skills, and experience
-        result["education"] = extract_education_info(text)
-        result["qualifications"] = extract_skills_info(text)
-        result["projects"] = extract_experience_info(text)
+        with stage('education', text_bytes):
+            result["education"] = extract_education_info(text, sections)
+        with stage('skills', text_bytes):
+            result["qualifications"] = extract_skills_info(text, sections)
+        with stage('experience', text_bytes):
+            result["projects"] = extract_experience_info(text, sections)
         
         return result
     except Exception as e:
@@ -119,113 +904,110 @@ def extract_personal_info(text):
     personal_info = {}
     
     # Extract name
-    name_patterns = [
-        r'^([A-Z][A-Z\s]+(?:[A-Z][a-z]+\s)*[A-Z][a-z]+)',  # FIRST LAST or FIRST MIDDLE LAST
-        r'^([A-Z][a-z]+\s+[A-Z][a-z]+)',  # First Last at start
-        r'\b([A-Z][a-z]+\s+[A-Z][a-z]+)\b',  # First Last anywhere 
-        r'Name:?\s*([A-Z][a-z]+\s+[A-Z][a-z]+)'  # Name: First Last
-    ]
-    
-    for pattern in name_patterns:
-        name_match = re.search(pattern, text)
+    for pattern in NAME_PATTERNS:
+        name_match = patterns.search(pattern, text)
         if name_match:
             potential_name = name_match.group(1).strip()
-            if not re.search(r'\b(road|street|avenue|lane|drive|blvd)\b', potential_name, re.IGNORECASE):
+            if not patterns.search('street_word', potential_name):
                 personal_info["name"] = potential_name
                 break
     
     # Extract email
-    email_patterns = [
-        r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
-        r'email:?\s*([A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,})',
-        r'e-mail:?\s*([A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,})'
-    ]
-    
-    for pattern in email_patterns:
-        email_match = re.search(pattern, text, re.IGNORECASE)
+    for pattern, group in EMAIL_PATTERNS:
+        email_match = patterns.search(pattern, text)
         if email_match:
-            personal_info["email"] = email_match.group(1) if '(' in pattern else email_match.group(0)
+            personal_info["email"] = email_match.group(group)
             break
     
     # Extract phone
-    phone_patterns = [
-        r'\b(?:\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}\b',
-        r'\b\d{2,3}[-.\s]?\d{7,10}\b',
-        r'phone:?\s*(\+?[\d\s\-\(\)\.]+)',
-        r'tel:?\s*(\+?[\d\s\-\(\)\.]+)',
-        r'mobile:?\s*(\+?[\d\s\-\(\)\.]+)'
-    ]
-    
-    for pattern in phone_patterns:
-        phone_match = re.search(pattern, text, re.IGNORECASE)
+    for pattern in PHONE_PATTERNS:
+        phone_match = patterns.search(pattern, text)
         if phone_match:
-            personal_info["phone"] = phone_match.group(1).strip() if '(' in pattern and ')' in pattern and not '\\(' in pattern else phone_match.group(0)
+            personal_info["phone"] = phone_match.group(0)
             break
     
     return personal_info
 
-def extract_education_info(text):
+# Longest run of non-delimiter characters allowed either side of the keyword
+UNIVERSITY_CONTEXT_CHARS = 100
+
+def find_university_mentions(text):
+    """Return the (start, end) spans of institution names in the text.
+
+    Finds what [^.,\\n]{3,100}(?:University|College|Institute|School)[^.,\\n]{0,100}
+    would, but walks the keyword occurrences instead of retrying a 100-character
+    prefix at every offset, so long text without a keyword is scanned once.
+    """
+    keywords = patterns.finditer('university_keyword', text)
+    delimiters = [match.start() for match in patterns.finditer('university_delimiter', text)]
+    spans = []
+    position = 0
+    i = 0
+    while i < len(keywords):
+        keyword_start = keywords[i].start()
+        # The leftmost start: not before the last match, the last delimiter or the prefix limit
+        d = bisect_left(delimiters, keyword_start)
+        segment_start = delimiters[d - 1] + 1 if d else 0
+        start = max(position, segment_start, keyword_start - UNIVERSITY_CONTEXT_CHARS)
+        if keyword_start - start < 3:
+            i += 1
+            continue
+        
+        # The prefix is greedy, so the match runs to the last keyword it can reach
+        segment_end = delimiters[d] if d < len(delimiters) else len(text)
+        prefix_limit = min(start + UNIVERSITY_CONTEXT_CHARS, segment_end)
+        while i + 1 < len(keywords) and keywords[i + 1].start() <= prefix_limit:
+            i += 1
+        keyword_end = keywords[i].end()
+        d = bisect_left(delimiters, keyword_end)
+        suffix_end = delimiters[d] if d < len(delimiters) else len(text)
+        end = min(keyword_end + UNIVERSITY_CONTEXT_CHARS, suffix_end)
+        spans.append((start, end))
+        
+        position = end
+        while i < len(keywords) and keywords[i].start() < end:
+            i += 1
+    return spans
+
+def extract_education_info(text, sections=None):
     """Extract education information using a generalized approach without hardcoding"""
     education = []
+    seen = set()
+    if sections is None:
+        sections = build_section_index(text)
     
-    # Step 1: Try to identify education section(s)
-    lines = text.split('\n')
-    education_section_lines = []
-    in_education_section = False
-    education_section_keywords = ['education', 'academic background', 'academic qualifications']
-    other_section_keywords = ['experience', 'skills', 'projects', 'awards', 'achievements', 'references', 'certifications']
-    
-    for line in lines:
-        line_lower = line.lower().strip()
-        
-        # Check if this line starts an education section
-        if not in_education_section:
-            if any(keyword in line_lower and (keyword == line_lower or ':' in line_lower) for keyword in education_section_keywords):
-                in_education_section = True
-                continue  # Skip the header line
-        
-        # Check if this line starts a new non-education section
-        elif any(keyword in line_lower and (keyword == line_lower or ':' in line_lower) for keyword in other_section_keywords):
-            in_education_section = False
-        
-        # Add line if we're in education section
-        if in_education_section:
-            education_section_lines.append(line.strip())
+    # Step 1: Take the education section(s) from the section index
+    education_section_lines = get_section_texts(text, sections, 'education')
     
     # Step 2: Process identified education section(s)
     if education_section_lines:
         # Join the lines to create the education section text
         education_section = ' '.join(education_section_lines)
         
-        # Look for university and degree combinations using general patterns
-        university_pattern = r'([^\.,\n]{3,100}(?:University|College|Institute|School)[^\.,\n]{0,100})'
-        degree_pattern = r'((?:BSc|B\.Sc|MSc|M\.Sc|PhD|Ph\.D|Bachelor|Master|Diploma|B\.A\.|M\.A\.|B\.S\.|M\.S\.)[\s\w\.,&\(\)]+?(?:(?:in|of)?\s+[\w\s\.,&]+)?)'
-        
         # Find all universities in the education section
-        university_matches = re.finditer(university_pattern, education_section, re.IGNORECASE)
+        university_spans = find_university_mentions(education_section)
         
-        for uni_match in university_matches:
-            university = uni_match.group(0).strip()
+        for university_start, university_end in university_spans:
+            university = education_section[university_start:university_end].strip()
             
             # Look for degree information in the vicinity of the university
-            university_end = uni_match.end()
             search_window_end = min(university_end + 200, len(education_section))  # Fixed: Define search_window_end
             search_window = education_section[university_end:search_window_end]
             
             # Try to find degree information after the university mention
-            degree_match = re.search(degree_pattern, search_window, re.IGNORECASE)
+            degree_match = patterns.search('degree', search_window)
             
             if degree_match:
                 degree = degree_match.group(0).strip()
                 
                 # Clean up university and degree text
-                university = re.sub(r'^\s*[•\-\*\d\.]+\s*', '', university)  # Remove bullets and numbering
-                degree = re.sub(r'^\s*[•\-\*\d\.]+\s*', '', degree)  # Remove bullets and numbering
+                university = patterns.sub('leading_bullet_or_number', '', university)  # Remove bullets and numbering
+                degree = patterns.sub('leading_bullet_or_number', '', degree)  # Remove bullets and numbering
                 
                 # Remove dates and certificate mentions
-                university = re.sub(r'\d{1,2}[/-]\d{1,2}[/-]\d{2,4}.*$', '', university).strip()
-                degree = re.sub(r'\d{1,2}[/-]\d{1,2}[/-]\d{2,4}.*$', '', degree).strip()
-                degree = re.sub(r'(?i)certificates?.*$', '', degree).strip()
+                university = patterns.sub('trailing_date', '', university).strip()
+                degree = patterns.sub('trailing_date', '', degree).strip()
+                degree = patterns.sub('trailing_certificate', '', degree).strip()
                 
                 # Remove trailing periods that might cut off text
                 if university.endswith('.'):
@@ -235,26 +1017,28 @@ def extract_education_info(text):
                 
                 # Create education entry
                 education_entry = f"{university}\n{degree}"
-                if education_entry not in education:  # Avoid duplicates
+                if education_entry not in seen:  # Avoid duplicates
+                    seen.add(education_entry)
                     education.append(education_entry)
             else:
                 # If no degree found, just use the university name
-                university = re.sub(r'^\s*[•\-\*\d\.]+\s*', '', university)  # Remove bullets and numbering
-                university = re.sub(r'\d{1,2}[/-]\d{1,2}[/-]\d{2,4}.*$', '', university).strip()
-                if university not in education:
+                university = patterns.sub('leading_bullet_or_number', '', university)  # Remove bullets and numbering
+                university = patterns.sub('trailing_date', '', university).strip()
+                if university not in seen:
+                    seen.add(university)
                     education.append(university)
     
     # Step 3: If no education section was found, try extracting based on patterns
     if not education:
         # Find all university mentions
-        university_matches = re.finditer(r'([^\.,\n]{3,100}(?:University|College|Institute|School)[^\.,\n]{0,100})', text, re.IGNORECASE)
+        university_spans = find_university_mentions(text)
         
-        for uni_match in university_matches:
-            university = uni_match.group(0).strip()
+        for university_start, university_end in university_spans:
+            university = text[university_start:university_end].strip()
             
             # Check if this looks like a reference or other non-education section
-            context_start = max(0, uni_match.start() - 50)
-            context_end = min(uni_match.end() + 50, len(text))
+            context_start = max(0, university_start - 50)
+            context_end = min(university_end + 50, len(text))
             context = text[context_start:context_end].lower()
             
             # Skip if this appears to be in references or involves a professor
@@ -262,23 +1046,23 @@ def extract_education_info(text):
                 continue
             
             # Look for degree information near this university mention
-            search_start = max(0, uni_match.start() - 50)  # Look a bit before too
-            search_window_end = min(uni_match.end() + 200, len(text))  # Fixed: Define search_window_end
+            search_start = max(0, university_start - 50)  # Look a bit before too
+            search_window_end = min(university_end + 200, len(text))  # Fixed: Define search_window_end
             search_window = text[search_start:search_window_end]
             
-            degree_match = re.search(r'((?:BSc|B\.Sc|MSc|M\.Sc|PhD|Ph\.D|Bachelor|Master|Diploma|B\.A\.|M\.A\.|B\.S\.|M\.S\.)[\s\w\.,&\(\)]+?(?:(?:in|of)?\s+[\w\s\.,&]+)?)', search_window, re.IGNORECASE)
+            degree_match = patterns.search('degree', search_window)
             
             if degree_match:
                 degree = degree_match.group(0).strip()
                 
                 # Clean up
-                university = re.sub(r'^\s*[•\-\*\d\.]+\s*', '', university)  # Remove bullets and numbering
-                degree = re.sub(r'^\s*[•\-\*\d\.]+\s*', '', degree)  # Remove bullets and numbering
+                university = patterns.sub('leading_bullet_or_number', '', university)  # Remove bullets and numbering
+                degree = patterns.sub('leading_bullet_or_number', '', degree)  # Remove bullets and numbering
                 
                 # Remove dates and certificate mentions
-                university = re.sub(r'\d{1,2}[/-]\d{1,2}[/-]\d{2,4}.*$', '', university).strip()
-                degree = re.sub(r'\d{1,2}[/-]\d{1,2}[/-]\d{2,4}.*$', '', degree).strip()
-                degree = re.sub(r'(?i)certificates?.*$', '', degree).strip()
+                university = patterns.sub('trailing_date', '', university).strip()
+                degree = patterns.sub('trailing_date', '', degree).strip()
+                degree = patterns.sub('trailing_certificate', '', degree).strip()
                 
                 # Remove trailing periods that might cut off text
                 if university.endswith('.'):
@@ -288,7 +1072,8 @@ def extract_education_info(text):
                 
                 # Create education entry
                 education_entry = f"{university}\n{degree}"
-                if education_entry not in education:  # Avoid duplicates
+                if education_entry not in seen:  # Avoid duplicates
+                    seen.add(education_entry)
                     education.append(education_entry)
     
     # Step 4: Final validation to ensure we're not including references or certificates
@@ -300,51 +1085,42 @@ def extract_education_info(text):
     
     return validated_education
 
-def extract_skills_info(text):
+def extract_skills_info(text, sections=None):
     """Extract skills with a more flexible, content-based approach"""
     skills = []
     certifications = []
-    
-    # Common skill section keywords
-    skill_keywords = ['skills', 'technical skills', 'competencies', 'proficiencies', 'expertise', 'technologies']
-    
-    # Common certification section keywords
-    cert_keywords = ['certificates', 'certifications', 'certified', 'certification']
-    
-    # Common technical skills to look for directly
-    common_skills = [
-        'Python', 'Java', 'JavaScript', 'HTML', 'CSS', 'SQL', 'AWS', 'Azure', 'React', 'Angular', 
-        'Node.js', 'Express', 'Django', 'Flask', 'Docker', 'Kubernetes', 'Git', 'Agile', 'Scrum',
-        'Machine Learning', 'AI', 'Data Science', 'DevOps', 'CI/CD', 'REST API', 'GraphQL',
-        'MongoDB', 'PostgreSQL', 'MySQL', 'Oracle', 'NoSQL', 'Redis', 'Elasticsearch',
-        'Linux', 'Windows', 'macOS', 'iOS', 'Android', 'Swift', 'Kotlin', 'C++', 'C#',
-        'PHP', 'Ruby', 'Go', 'Rust', 'TypeScript', 'Bash', 'PowerShell'
-    ]
+    # Mirrors of the lists above for duplicate checks
+    seen_skills = set()
+    seen_certifications = set()
+    if sections is None:
+        sections = build_section_index(text)
     
     # EXTRACTING CERTIFICATIONS
-    for keyword in cert_keywords:
+    for section in (section for section in sections if section.kind == 'certifications'):
+        keyword = section.header
         try:
-            cert_section_match = re.search(r'(?i)\b' + re.escape(keyword) + r'[:\s]*\n?(.*?)(?:\n\n|\n[A-Z]|$)', text, re.DOTALL)
-            if cert_section_match:
-                section_text = cert_section_match.group(1).strip()
+            section_text = text[section.start:section.end].strip()
+            if section_text:
                 logger.info(f"Found certifications section with keyword '{keyword}': {section_text[:100]}...")
                 
                 # Try to extract certification items with a date pattern (MM/YYYY format)
-                date_pattern_items = re.findall(r'(?:\d{2}\/\d{4}\s*[–-]\s*\d{2}\/\d{4}|\d{2}\/\d{4}\s*[–-]\s*(?:Present|present|current|Current|now|Now)|\d{2}\/\d{4})[^\n]*\n([^\n]+)', section_text)
+                date_pattern_items = patterns.findall('dated_item', section_text)
                 
                 if date_pattern_items:
                     for item in date_pattern_items:
                         cert = item.strip()
-                        if cert and len(cert) > 5 and cert not in certifications:
+                        if cert and len(cert) > 5 and cert not in seen_certifications:
+                            seen_certifications.add(cert)
                             certifications.append(cert)
                 
                 # If no date pattern matches, look for bullet points or lines
                 if not certifications:
                     # Look for bullet points
-                    bullet_matches = re.findall(r'[•*-]([^•*\n]+)', section_text)
+                    bullet_matches = patterns.findall('bullet_item', section_text)
                     for match in bullet_matches:
                         match = match.strip()
-                        if match and len(match) > 5 and match not in certifications:
+                        if match and len(match) > 5 and match not in seen_certifications:
+                            seen_certifications.add(match)
                             certifications.append(match)
                     
                     # If still no matches, split by newlines and try to find certification-like content
@@ -353,9 +1129,10 @@ def extract_skills_info(text):
                         for line in lines:
                             line = line.strip()
                             # Ignore date-only lines or very short lines
-                            if re.match(r'^\d{2}\/\d{4}\s*[–-]\s*\d{2}\/\d{4}$|^\d{2}\/\d{4}$', line) or len(line) < 5:
+                            if patterns.match('date_only_line', line) or len(line) < 5:
                                 continue
-                            if line and line not in certifications:
+                            if line and line not in seen_certifications:
+                                seen_certifications.add(line)
                                 certifications.append(line)
                 
                 if certifications:
@@ -366,39 +1143,42 @@ def extract_skills_info(text):
             continue
     
     # EXTRACTING SKILLS
-    for keyword in skill_keywords:
+    for section in (section for section in sections if section.kind == 'skills'):
+        keyword = section.header
         try:
-            skill_section_match = re.search(r'(?i)\b' + re.escape(keyword) + r'[:\s]*\n?(.*?)(?:\n\n|\n[A-Z]|$)', text, re.DOTALL)
-            if skill_section_match:
-                section_text = skill_section_match.group(1).strip()
+            section_text = text[section.start:section.end].strip()
+            if section_text:
                 logger.info(f"Found skills section with keyword '{keyword}': {section_text[:100]}...")
                 
                 # Look for bullet points in the section
-                bullet_matches = re.findall(r'[•*-]([^•*\n]+)', section_text)
+                bullet_matches = patterns.findall('bullet_item', section_text)
                 if bullet_matches:
                     for match in bullet_matches:
                         match = match.strip()
-                        if match and len(match) > 2 and match not in skills:
+                        if match and len(match) > 2 and match not in seen_skills:
+                            seen_skills.add(match)
                             skills.append(match)
                 
                 # Look for category-based skills format (e.g., "Programming Languages: Java, Python")
-                category_matches = re.findall(r'([A-Za-z\s&]+)(?::|—)\s*([A-Za-z0-9\s,\.&+#]+)', section_text)
+                category_matches = patterns.findall('skill_category', section_text)
                 if category_matches:
                     for category, skill_list in category_matches:
                         category = category.strip()
                         # Split the skills by commas
-                        skill_items = [s.strip() for s in re.split(r',\s*', skill_list)]
+                        skill_items = [s.strip() for s in patterns.split('comma_separator', skill_list)]
                         for item in skill_items:
-                            if item and len(item) > 2 and item not in skills:
+                            if item and len(item) > 2 and item not in seen_skills:
                                 # Include the category with the skill for better context
+                                seen_skills.add(f"{category}: {item}")
                                 skills.append(f"{category}: {item}")
                 
                 # If no bullet points or categories, split by newlines and commas
                 if not skills:
-                    items = re.split(r'[,\n]', section_text)
+                    items = patterns.split('comma_or_newline', section_text)
                     for item in items:
                         item = item.strip()
-                        if item and len(item) > 2 and item not in skills:
+                        if item and len(item) > 2 and item not in seen_skills:
+                            seen_skills.add(item)
                             skills.append(item)
                 
                 if skills:
@@ -408,29 +1188,26 @@ def extract_skills_info(text):
             logger.error(f"Error in skills extraction with keyword '{keyword}': {str(e)}")
             continue
     
-    # If no skills found from the skills section, scan for common skills
-    if not skills:
-        logger.info("No skills section found, searching for common skill keywords")
+    # If no skills found from the skills section, scan for taxonomy skills in a single pass
+    if not skills and time_allows('skills_taxonomy_scan', FALLBACK_SCAN_ESTIMATE_MS):
+        logger.info("No skills section found, searching for skills from the taxonomy")
         found_skills = []
-        for skill in common_skills:
-            try:
-                if re.search(r'\b' + re.escape(skill) + r'\b', text, re.IGNORECASE):
-                    found_skills.append(skill)
-            except Exception as e:
-                logger.error(f"Error checking for skill '{skill}': {str(e)}")
-                continue
+        try:
+            found_skills = get_skills_matcher().find_skills(text)
+        except Exception as e:
+            logger.error(f"Error matching skills against the taxonomy: {str(e)}")
         
         if found_skills:
             skills = found_skills
-            logger.info(f"Found {len(skills)} common skills by keyword search")
+            logger.info(f"Found {len(skills)} skills by taxonomy search")
     
     # Clean up certifications
     clean_certifications = []
     for cert in certifications:
         # Remove date patterns
-        cert = re.sub(r'\b\d{2}\/\d{4}\s*[–-]\s*(?:\d{2}\/\d{4}|present|Present)\b', '', cert)
+        cert = patterns.sub('date_range', '', cert)
         # Remove bullet points and other markers
-        cert = re.sub(r'^[\s•*-]+', '', cert)
+        cert = patterns.sub('leading_bullets', '', cert)
         cert = cert.strip()
         if cert and len(cert) > 5:
             clean_certifications.append(cert)
@@ -439,7 +1216,7 @@ def extract_skills_info(text):
     clean_skills = []
     for skill in skills:
         # Remove bullet points and other markers
-        skill = re.sub(r'^[\s•*-]+', '', skill)
+        skill = patterns.sub('leading_bullets', '', skill)
         skill = skill.strip()
         if skill and len(skill) > 2:
             clean_skills.append(skill)
@@ -459,26 +1236,21 @@ def extract_skills_info(text):
     
     return all_qualifications
 
-def extract_experience_info(text):
+def extract_experience_info(text, sections=None):
     """Extract both work experience and projects separately with a flexible, content-based approach"""
     work_experience = []
     projects = []
+    if sections is None:
+        sections = build_section_index(text)
     
-    # Define section keywords - specific first
-    project_keywords = ['projects', 'personal projects', 'academic projects', 'key projects']
-    work_keywords = ['experience', 'work experience', 'professional experience', 'employment', 'work history']
-    
-    # Function to extract entries from a section
+    # Function to extract entries from a section (the header is already excluded by the section index)
     def extract_entries_from_section(section_text, section_type):
         entries = []
-        # Clean section header
-        for kw in (project_keywords if section_type == "projects" else work_keywords):
-            section_text = re.sub(r'(?i)^\s*' + re.escape(kw) + r'\s*(?::|$)', '', section_text).strip()
         
         # Try multiple strategies to identify individual entries
         
         # Strategy 1: Split by project/job titles (capitalized words followed by newline or space)
-        title_entries = re.split(r'\n(?=[A-Z][a-zA-Z0-9\s\-&]+(?:\n|\s))', section_text)
+        title_entries = patterns.split('entry_title_break', section_text)
         
         if len(title_entries) > 1:
             logger.info(f"Found {len(title_entries)} {section_type} entries using title splitting")
@@ -488,8 +1260,7 @@ def extract_experience_info(text):
                     entries.append(entry)
         else:
             # Strategy 2: Look for bullet point groups
-            bullet_pattern = r'(?:^|\n)([^\n•*-]*(?:\n\s*[•*-][^\n]*)+)'
-            bullet_entries = re.findall(bullet_pattern, section_text)
+            bullet_entries = patterns.findall('bullet_group', section_text)
             
             if bullet_entries:
                 logger.info(f"Found {len(bullet_entries)} {section_type} entries using bullet patterns")
@@ -499,7 +1270,7 @@ def extract_experience_info(text):
                         entries.append(entry)
             else:
                 # Strategy 3: Split by double newlines (paragraphs)
-                para_entries = re.split(r'\n\s*\n', section_text)
+                para_entries = patterns.split('paragraph_break', section_text)
                 if para_entries:
                     logger.info(f"Found {len(para_entries)} {section_type} entries using paragraph splitting")
                     for entry in para_entries:
@@ -507,58 +1278,37 @@ def extract_experience_info(text):
                         if entry and len(entry) > 20:
                             entries.append(entry)
         
-        # Clean up entries
-        clean_entries = []
-        for entry in entries:
-            # Remove any trailing sections that might have been captured
-            for next_section in ['Education', 'Skills', 'Certificates', 'Awards', 'References']:
-                if re.search(r'(?i)(?:^|\n)\s*' + re.escape(next_section) + r'\s*(?::|$)', entry):
-                    entry = re.split(r'(?i)(?:^|\n)\s*' + re.escape(next_section) + r'\s*(?::|$)', entry)[0].strip()
-            
-            # Only add if it's a substantial entry
-            if entry and len(entry) > 20:
-                clean_entries.append(entry)
-                
-        return clean_entries
+        # Only keep substantial entries (sections already end at the next header)
+        return [entry for entry in entries if len(entry) > 20]
     
     # Extract Projects Section
     project_section_found = False
-    for keyword in project_keywords:
+    for section in (section for section in sections if section.kind == 'projects'):
+        keyword = section.header
         try:
-            # Look for the section header and content until the next section header
-            pattern = r'(?i)(?:^|\n)(\s*' + re.escape(keyword) + r'\s*(?::|$).*?)(?:\n\s*(?:Education|Skills|Experience|Work|Certificates|Awards|References|Languages|Interests|Personal|Contact|Summary|About)\s*(?::|$)|\Z)'
-            project_section_match = re.search(pattern, text, re.DOTALL)
-            
-            if project_section_match:
-                section_text = project_section_match.group(1).strip()
-                logger.info(f"Found projects section with keyword '{keyword}': {section_text[:100]}...")
-                project_section_found = True
-                projects = extract_entries_from_section(section_text, "projects")
-                break
+            section_text = text[section.start:section.end].strip()
+            logger.info(f"Found projects section with keyword '{keyword}': {section_text[:100]}...")
+            project_section_found = True
+            projects = extract_entries_from_section(section_text, "projects")
+            break
         except Exception as e:
             logger.error(f"Error in projects section extraction with keyword '{keyword}': {str(e)}")
             continue
     
     # Extract Work Experience Section
-    work_section_found = False
-    for keyword in work_keywords:
+    for section in (section for section in sections if section.kind == 'experience'):
+        keyword = section.header
         try:
-            # Look for the section header and content until the next section header
-            pattern = r'(?i)(?:^|\n)(\s*' + re.escape(keyword) + r'\s*(?::|$).*?)(?:\n\s*(?:Education|Skills|Projects|Certificates|Awards|References|Languages|Interests|Personal|Contact|Summary|About)\s*(?::|$)|\Z)'
-            work_section_match = re.search(pattern, text, re.DOTALL)
-            
-            if work_section_match:
-                section_text = work_section_match.group(1).strip()
-                logger.info(f"Found work experience section with keyword '{keyword}': {section_text[:100]}...")
-                work_section_found = True
-                work_experience = extract_entries_from_section(section_text, "work experience")
-                break
+            section_text = text[section.start:section.end].strip()
+            logger.info(f"Found work experience section with keyword '{keyword}': {section_text[:100]}...")
+            work_experience = extract_entries_from_section(section_text, "work experience")
+            break
         except Exception as e:
             logger.error(f"Error in work experience extraction with keyword '{keyword}': {str(e)}")
             continue
     
     # If no project section found, but we have text to analyze
-    if not project_section_found and not projects:
+    if not project_section_found and not projects and time_allows('project_keyword_scan', FALLBACK_SCAN_ESTIMATE_MS):
         logger.info("No explicit projects section found, searching for project keywords")
         project_title_keywords = ['project', 'app', 'application', 'system', 'website', 'platform', 'tool']
         project_desc_keywords = ['developed', 'built', 'created', 'designed', 'implemented']
@@ -642,56 +1392,377 @@ def determine_file_type(file_path, mime_type):
     else:
         raise ValueError(f"Unsupported file type: {mime_type}")
 
-# Main Lambda Handler
-def lambda_handler(event, context):
+# Cache Helpers
+def get_cached(kind, digests, version, bucket):
+    """Return the first cached value found for any of the document digests (S3 holds only ETag entries)"""
+    with stage('cache_lookup'):
+        for digest in digests:
+            value = text_cache.get(make_cache_key(kind, digest, version), bucket, s3=is_etag_digest(digest))
+            if value is not None:
+                return value
+        return None
+
+def put_cached(kind, digests, version, value, bucket):
+    """Cache a value under every digest of the document.
+    
+    Only ETag entries get an S3 sidecar, one per CV, written in the background. A CV
+    re-uploaded in one part has the same ETag (its MD5); the content digest catches other
+    re-uploads in this container's memory and /tmp tiers.
+    """
+    with stage('cache_store'):
+        for digest in digests:
+            text_cache.put(make_cache_key(kind, digest, version), value, bucket, s3=is_etag_digest(digest))
+
+def extraction_version(file_extension):
+    """Cache version of a document's extracted text (DOCX text also depends on the engine that read it)"""
+    if file_extension == '.docx':
+        return f"{EXTRACTION_VERSION}-{DOCX_ENGINE}"
+    return EXTRACTION_VERSION
+
+def use_ranged_docx_reads(file_extension, content_length):
+    """Return whether a document should be read with ranged GETs.
+    
+    content_length is None when unknown (no HEAD was made), and the size is then checked
+    against DOCX_RANGED_MIN_BYTES once the first ranged GET has returned it.
     """
-    Lambda entry point that processes CV documents from S3
+    return (file_extension == '.docx' and DOCX_ENGINE == 'stream' and DOCX_RANGED_READS
+            and (content_length is None or content_length >= DOCX_RANGED_MIN_BYTES))
+
+def extract_document_text(s3_bucket, s3_key, file_extension, digests, content_length=None):
+    """Fetch a CV from S3 and extract its text, reusing the cache entry when the content was seen before.
+
+    Returns the entry ({'text', 'extraction'}, and 'sections' when cached with them) and
+    whether it came from the cache.
     """
-    logger.info(f"Received event: {json.dumps(event)}")
+    logger.info(f"Attempting to fetch from S3: Bucket={s3_bucket}, Key={s3_key}")
+    text_version = extraction_version(file_extension)
+    remote = None
+    if use_ranged_docx_reads(file_extension, content_length):
+        remote = open_ranged_docx(s3_bucket, s3_key)
+        if remote.size >= DOCX_RANGED_MIN_BYTES:
+            # Only part of the file is read, so there is no content hash to look the text up by
+            with remote:
+                cv_text = extract_from_docx_in_s3(remote)
+            if remote.etag and etag_digest(remote.etag) not in digests:
+                digests.append(etag_digest(remote.etag))
+            return {'text': cv_text, 'extraction': {'engine': DOCX_ENGINE}}, False
     
-    try:
-        # Extract parameters from event
-        s3_bucket = event['s3Bucket']
-        s3_key = event['s3Key']
-        
-        logger.info(f"Using bucket: {s3_bucket}, key: {s3_key}")
-        
-        # Download file from S3 to temp directory
-        file_name = os.path.basename(s3_key)
-        local_path = f"/tmp/{file_name}"
-        
-        logger.info(f"Attempting to download from S3: Bucket={s3_bucket}, Key={s3_key}")
-        s3_client.download_file(s3_bucket, s3_key, local_path)
-        logger.info(f"File downloaded to {local_path}")
+    # Stream file from S3 into memory (closing the buffer removes any spilled temp file)
+    with stage('download') as record:
+        if remote is None:
+            document, content_digests = fetch_document(s3_bucket, s3_key)
+        else:
+            # Its size was unknown before the first ranged GET, and a file under
+            # DOCX_RANGED_MIN_BYTES is read whole (one more GET at most)
+            with remote:
+                document, content_digests = read_whole_document(remote)
+        record['bytes'] = document.seek(0, os.SEEK_END)
+        document.seek(0)
+    with document:
+        logger.info("File fetched from S3")
         
-        # Determine file extension and mime type
-        file_extension = Path(file_name).suffix.lower()
-        mime_type = determine_mime_type(file_extension)
-        logger.info(f"Detected MIME type: {mime_type}")
+        # The same CV re-uploaded under a new key still matches on content hash
+        new_digests = [digest for digest in content_digests if digest not in digests]
+        if TEXT_CACHE_ENABLED:
+            cached = get_cached('text', new_digests, text_version, s3_bucket)
+            if cached is not None:
+                put_cached('text', digests, text_version, cached, s3_bucket)
+                digests.extend(new_digests)
+                return cached, True
+        digests.extend(new_digests)
         
         # Extract text based on file type
         if file_extension == '.pdf':
-            cv_text = extract_from_pdf_with_textract(local_path)
-        elif file_extension == '.docx':
-            cv_text = extract_from_docx(local_path)
+            with stage('extract_pdf', record['bytes']), document_buffer(document) as buffer:
+                cv_text, extraction = extract_from_pdf(document, (s3_bucket, s3_key), buffer)
         else:
-            raise ValueError(f"Unsupported file type: {file_extension}")
-        
-        # Process the extracted text to identify sections
-        cv_data = extract_sections(cv_text)
-        logger.info("CV parsed successfully")
-        
-        # Return the extracted data
+            with stage('extract_docx', record['bytes']):
+                cv_text = extract_from_docx(document)
+            extraction = {'engine': DOCX_ENGINE}
+    return {'text': cv_text, 'extraction': extraction}, False
+
+def process_cv(s3_bucket, s3_key):
+    """Parse one CV from S3 and return the success response (raises on failure)"""
+    logger.info(f"Using bucket: {s3_bucket}, key: {s3_key}")
+    
+    # Determine file extension and mime type
+    file_name = os.path.basename(s3_key)
+    file_extension = Path(file_name).suffix.lower()
+    mime_type = determine_mime_type(file_extension)
+    logger.info(f"Detected MIME type: {mime_type}")
+    
+    if file_extension not in SUPPORTED_EXTENSIONS:
+        raise ValueError(f"Unsupported file type: {file_extension}")
+    text_version = extraction_version(file_extension)
+    
+    # Check the ETag first so cached documents never need downloading. One entry holds the
+    # text and the sections parsed from it, so a new CV costs a HEAD and one sidecar GET
+    # before the download; its sidecar is written after the response is built.
+    digests = []
+    entry = None
+    content_length = None
+    if TEXT_CACHE_ENABLED:
+        with stage('head'):
+            head = head_s3_object(Bucket=s3_bucket, Key=s3_key)
+        digests.append(etag_digest(head['ETag']))
+        content_length = head.get('ContentLength')
+        entry = get_cached('text', digests, text_version, s3_bucket)
+    
+    if entry is not None:
+        logger.info("Extracted text served from cache")
+        text_cached = True
+    else:
+        entry, text_cached = extract_document_text(s3_bucket, s3_key, file_extension, digests, content_length)
+    
+    cached_sections = entry.get('sections')
+    if cached_sections is not None and cached_sections['version'] == PARSER_VERSION:
+        logger.info("CV parse result served from cache")
         return {
             'statusCode': 200,
-            'body': cv_data
-        }
-        
-    except Exception as e:
-        logger.error(f"Error processing CV: {str(e)}")
-        import traceback
-        logger.error(traceback.format_exc())
-        return {
-            'statusCode': 500,
-            'body': {'error': str(e)}
+            'body': cached_sections['body'],
+            'extraction': {**entry['extraction'], 'cache': 'sections'}
         }
+    
+    # Text extracted without Textract for lack of time is not cached
+    cache_result = TEXT_CACHE_ENABLED and not skipped_stages()
+    cv_text, extraction = entry['text'], entry['extraction']
+    
+    # Parse only the start of a long CV when the rest would not fit in the remaining time
+    if len(cv_text) > DEADLINE_TEXT_CAP_CHARS and not time_allows('full_text', SECTIONS_ESTIMATE_MS):
+        cv_text = cv_text[:DEADLINE_TEXT_CAP_CHARS]
+    
+    # Process the extracted text to identify sections
+    with stage('extract_sections', len(cv_text.encode('utf-8'))):
+        cv_data = extract_sections(cv_text)
+    logger.info("CV parsed successfully")
+    if LOG_PATTERN_STATS:
+        patterns.log_report()
+    
+    skipped = skipped_stages()
+    if cache_result:
+        # The full text, with the sections unless part of the parse was skipped
+        value = {'text': entry['text'], 'extraction': extraction}
+        if not skipped:
+            value['sections'] = {'version': PARSER_VERSION, 'body': cv_data}
+        put_cached('text', digests, text_version, value, s3_bucket)
+    
+    # Return the extracted data
+    response = {
+        'statusCode': 200,
+        'body': cv_data,
+        'extraction': {**extraction, 'cache': 'text'} if text_cached else extraction
+    }
+    if skipped:
+        logger.warning(f"Returning partial CV parse, skipped stages: {skipped}")
+        response['partial'] = True
+        response['skipped'] = skipped
+    return response
+
+def report_timings(timer):
+    """Log a timer's stages, and the hedges and AWS retries since the last report, and publish them as metrics"""
+    timer.log_report()
+    hedge_counts = hedger.take_counts()
+    for operation, counts in hedge_counts.items():
+        logger.info(f"Hedged '{operation}': {counts['hedged']} hedges issued, {counts['won']} won, in {counts['calls']} calls")
+    retry_counts = take_retry_counts()
+    for service_name, counts in retry_counts.items():
+        if counts['retries'] or counts['throttles']:
+            logger.info(f"AWS '{service_name}': {counts['retries']} retries, {counts['throttles']} throttled attempts, "
+                        f"{counts['throttled_failures']} calls failed throttled, in {counts['calls']} calls")
+    if STAGE_METRICS_ENABLED:
+        timer.emit_metrics(STAGE_METRICS_NAMESPACE)
+        emit_count_metrics(STAGE_METRICS_NAMESPACE, 'Operation', hedge_counts, HEDGE_METRIC_NAMES)
+        emit_count_metrics(STAGE_METRICS_NAMESPACE, 'Service', retry_counts, RETRY_METRIC_NAMES)
+
+# Batch Processing
+def s3_record_location(record):
+    """Return the (bucket, key) of an S3 event notification record"""
+    return record['s3']['bucket']['name'], unquote_plus(record['s3']['object']['key'])
+
+def batch_record_locations(record):
+    """Return the CVs referenced by an SQS message or S3 notification record as (bucket, key) pairs"""
+    if record.get('eventSource') == 'aws:sqs':
+        body = json.loads(record['body'])
+        if 's3Bucket' in body:
+            # Same payload as a direct invocation
+            return [(body['s3Bucket'], body['s3Key'])]
+        if 'Records' in body:
+            # S3 notification delivered through the queue
+            return [s3_record_location(s3_record) for s3_record in body['Records'] if 's3' in s3_record]
+        if body.get('Event') == 's3:TestEvent':
+            return []
+        raise ValueError(f"Unrecognized SQS message body: {record['body'][:200]}")
+    if 's3' in record:
+        return [s3_record_location(record)]
+    raise ValueError(f"Unrecognized event record from {record.get('eventSource')}")
+
+def batch_item_identifier(record):
+    """Identify a record in batchItemFailures (the SQS message id, or the S3 key)"""
+    if 'messageId' in record:
+        return record['messageId']
+    return record.get('s3', {}).get('object', {}).get('key')
+
+def store_batch_result(s3_bucket, s3_key, response):
+    """Write a parse result next to the CV for whoever queued it"""
+    get_client('s3').put_object(
+        Bucket=s3_bucket,
+        Key=f"{BATCH_RESULTS_PREFIX}{s3_key}.json",
+        Body=json.dumps(response).encode('utf-8'),
+        ContentType='application/json'
+    )
+
+def batch_skip_reason(s3_bucket, s3_key):
+    """Why an object referenced by a batch record is not parsed (None for a CV to parse)"""
+    # Our own result objects and cache sidecars can trigger notifications on the same bucket
+    if s3_key.startswith(BATCH_RESULTS_PREFIX):
+        return 'result object'
+    if text_cache.bucket in (None, s3_bucket) and s3_key.startswith(text_cache.prefix):
+        return 'text cache sidecar'
+    if Path(s3_key).suffix.lower() not in SUPPORTED_EXTENSIONS:
+        return 'unsupported file type'
+    return None
+
+def process_batch_record(record, context=None):
+    """Parse and store every CV referenced by one batch record (raises if any fails).
+
+    Returns the number of objects skipped rather than parsed.
+    """
+    skipped = 0
+    for s3_bucket, s3_key in batch_record_locations(record):
+        skip_reason = batch_skip_reason(s3_bucket, s3_key)
+        if skip_reason is not None:
+            # Retrying would not change the outcome, so these are not failures
+            logger.info(f"Skipping {skip_reason} s3://{s3_bucket}/{s3_key}")
+            skipped += 1
+            continue
+        # tracemalloc is process-wide, so peaks would mix across worker threads
+        timer = StageTimer(trace_memory=False)
+        try:
+            # No caller waits on a batch, so its clients can slow down for throttling
+            with timer, Deadline(context, DEADLINE_RESERVE_MS), retry_mode(BATCH_RETRY_MODE):
+                response = process_cv(s3_bucket, s3_key)
+                with stage('store_result'):
+                    store_batch_result(s3_bucket, s3_key, response)
+        finally:
+            report_timings(timer)
+    return skipped
+
+def process_batch(records, context=None):
+    """Process SQS or S3 notification records on a bounded thread pool and report the failed ones.
+
+    Parsing is dominated by S3 and Textract round trips, so threads overlap the
+    waiting. Records from a FIFO queue are processed in order and everything
+    after the first failure is reported as failed, preserving message order.
+    Only SQS reads batchItemFailures, so when a record delivered straight from an
+    S3 notification fails this raises instead, and Lambda retries the event.
+    """
+    failed = []
+    skipped = 0
+    if any(record.get('eventSourceARN', '').endswith('.fifo') for record in records):
+        for position, record in enumerate(records):
+            try:
+                skipped += process_batch_record(record, context)
+            except Exception as e:
+                logger.error(f"Error processing record {batch_item_identifier(record)}: {str(e)}")
+                failed = records[position:]
+                break
+    else:
+        with ThreadPoolExecutor(max_workers=max(1, min(BATCH_MAX_WORKERS, len(records)))) as executor:
+            futures = [(record, executor.submit(process_batch_record, record, context)) for record in records]
+            for record, future in futures:
+                try:
+                    skipped += future.result()
+                except Exception as e:
+                    logger.error(f"Error processing record {batch_item_identifier(record)}: {str(e)}")
+                    failed.append(record)
+    # No caller waits on the results, so the cache sidecars are written before the container is frozen
+    text_cache.flush()
+    
+    logger.info(f"Processed batch of {len(records)} records ({skipped} objects skipped), {len(failed)} failed")
+    if STAGE_METRICS_ENABLED:
+        counts = {'records': len(records), 'skipped': skipped, 'failed': len(failed)}
+        emit_count_metrics(STAGE_METRICS_NAMESPACE, 'Mode', {'batch': counts}, BATCH_METRIC_NAMES)
+    unreported = [record for record in failed if record.get('eventSource') != 'aws:sqs']
+    if unreported:
+        raise RuntimeError(f"{len(unreported)} S3 notification records failed: "
+                           f"{', '.join(str(batch_item_identifier(record)) for record in unreported)}")
+    return {'batchItemFailures': [{'itemIdentifier': batch_item_identifier(record)} for record in failed]}
+
+# Warm-up
+def is_warmup_event(event):
+    """Recognize keep-warm pings, which carry no CV to parse"""
+    return bool(event.get('warmup')) or event.get('source') in WARMUP_EVENT_SOURCES
+
+def connect_client(service_name, request):
+    """Create a client and make one cheap request so a pooled TLS connection is ready"""
+    with stage(f'warmup_{service_name}'):
+        client = get_client(service_name)
+        try:
+            request(client)
+        except ClientError as e:
+            # Any response, even an error, leaves the connection open in the pool
+            logger.info(f"Warm-up request to {service_name} returned {e.response['Error'].get('Code')}")
+        except Exception as e:
+            logger.warning(f"Warm-up request to {service_name} failed: {str(e)}")
+
+def warm_up(event):
+    """Do the one-off initialization of a CV parse: clients, connections, patterns, taxonomy and parsers"""
+    bucket = event.get('s3Bucket') or WARMUP_S3_BUCKET
+    if bucket:
+        connect_client('s3', lambda client: client.head_bucket(Bucket=bucket))
+    else:
+        with stage('warmup_s3'):
+            get_client('s3')
+    if WARMUP_TEXTRACT_CONNECTION:
+        # Unknown job ids are rejected without starting any work
+        connect_client('textract', lambda client: client.get_document_text_detection(JobId='warm-up'))
+    else:
+        with stage('warmup_textract'):
+            get_client('textract')
+    
+    with stage('warmup_patterns'):
+        patterns.compile_all()
+    with stage('warmup_skills_taxonomy'):
+        get_skills_matcher()
+    with stage('warmup_parsers'):
+        # Imported on first use by the extraction functions
+        import PyPDF2
+        if DOCX_ENGINE == 'python-docx':
+            import docx
+
+# Main Lambda Handler
+def lambda_handler(event, context):
+    """
+    Lambda entry point that processes CV documents from S3, either one
+    {s3Bucket, s3Key} event or a batch of SQS / S3 notification records
+    (warm-up pings only initialize the container)
+    """
+    logger.info(f"Received event: {json.dumps(event)}")
+    
+    if is_warmup_event(event):
+        timer = StageTimer(trace_memory=False)
+        with timer:
+            warm_up(event)
+        timer.log_report()
+        return {'statusCode': 200, 'body': {'warmup': True}, 'timings': timer.report()}
+    
+    if 'Records' in event:
+        return process_batch(event['Records'], context)
+    
+    timer = StageTimer(trace_memory=STAGE_MEMORY_TRACING or random.random() < STAGE_MEMORY_TRACING_RATE)
+    with timer, Deadline(context, DEADLINE_RESERVE_MS):
+        try:
+            response = process_cv(event['s3Bucket'], event['s3Key'])
+        except Exception as e:
+            logger.error(f"Error processing CV: {str(e)}")
+            import traceback
+            logger.error(traceback.format_exc())
+            response = {
+                'statusCode': 500,
+                'body': {'error': str(e)}
+            }
+    
+    report_timings(timer)
+    if INCLUDE_TIMINGS or event.get('includeTimings'):
+        response['timings'] = timer.report()
+    return response
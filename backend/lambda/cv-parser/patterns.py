@@ -0,0 +1,107 @@
+import logging
+import re
+import threading
+import time
+
+logger = logging.getLogger()
+
+class PatternRegistry:
+    """Named regular expressions compiled once per container.
+
+    Patterns are registered up front and compiled lazily on first use (or all at
+    once with compile_all). Every match call goes through the registry so the
+    compile time and cumulative match time of each pattern can be reported.
+    Safe to share between threads (batch workers parse CVs concurrently).
+    """
+
+    def __init__(self):
+        self._definitions = {}
+        self._compiled = {}
+        # name -> [compile seconds, calls, match seconds]
+        self._stats = {}
+        self._stats_lock = threading.Lock()
+
+    def register(self, name, pattern, flags=0):
+        """Register a pattern under a unique name"""
+        if name in self._definitions:
+            raise ValueError(f"Pattern already registered: {name}")
+        self._definitions[name] = (pattern, flags)
+        self._stats[name] = [0.0, 0, 0.0]
+        return name
+
+    def get(self, name):
+        """Return the compiled pattern, compiling it on first use"""
+        compiled = self._compiled.get(name)
+        if compiled is None:
+            pattern, flags = self._definitions[name]
+            start = time.perf_counter()
+            compiled = re.compile(pattern, flags)
+            with self._stats_lock:
+                self._stats[name][0] = time.perf_counter() - start
+            self._compiled[name] = compiled
+        return compiled
+
+    def compile_all(self):
+        """Compile every registered pattern and return the total compile time in seconds"""
+        start = time.perf_counter()
+        for name in self._definitions:
+            self.get(name)
+        return time.perf_counter() - start
+
+    def _timed(self, name, operation):
+        pattern = self.get(name)
+        start = time.perf_counter()
+        try:
+            return operation(pattern)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._stats_lock:
+                stats = self._stats[name]
+                stats[1] += 1
+                stats[2] += elapsed
+
+    def search(self, name, string):
+        return self._timed(name, lambda pattern: pattern.search(string))
+
+    def match(self, name, string):
+        return self._timed(name, lambda pattern: pattern.match(string))
+
+    def findall(self, name, string):
+        return self._timed(name, lambda pattern: pattern.findall(string))
+
+    def finditer(self, name, string):
+        # Materialize the matches so the scan itself is timed, not just iterator creation
+        return self._timed(name, lambda pattern: list(pattern.finditer(string)))
+
+    def sub(self, name, repl, string):
+        return self._timed(name, lambda pattern: pattern.sub(repl, string))
+
+    def split(self, name, string):
+        return self._timed(name, lambda pattern: pattern.split(string))
+
+    def report(self):
+        """Return compile and match timings per pattern, slowest matchers first"""
+        with self._stats_lock:
+            snapshot = [(name, tuple(stats)) for name, stats in self._stats.items()]
+        report = {
+            name: {
+                'compile_ms': round(compile_seconds * 1000, 3),
+                'calls': calls,
+                'match_ms': round(match_seconds * 1000, 3)
+            }
+            for name, (compile_seconds, calls, match_seconds) in snapshot
+        }
+        return dict(sorted(report.items(), key=lambda item: item[1]['match_ms'], reverse=True))
+
+    def reset_stats(self):
+        """Clear match timings (compile timings are kept since compilation happens once)"""
+        with self._stats_lock:
+            for stats in self._stats.values():
+                stats[1] = 0
+                stats[2] = 0.0
+
+    def log_report(self, limit=10):
+        """Log the patterns that dominate match time"""
+        for name, stats in list(self.report().items())[:limit]:
+            logger.info(f"Pattern '{name}': {stats['calls']} calls, {stats['match_ms']} ms matching, "
+                        f"{stats['compile_ms']} ms compiling")
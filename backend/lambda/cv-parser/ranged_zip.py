@@ -0,0 +1,137 @@
+import os
+
+# Fixed part of a zip local file header, before the file name and extra field
+LOCAL_HEADER_BYTES = 30
+# Room for a local extra field longer than the central directory's copy
+LOCAL_EXTRA_SLACK_BYTES = 256
+
+class S3RangeFile:
+    """Read-only, seekable file over an S3 object that fetches byte ranges on demand.
+
+    get_object is called with S3 GetObject parameters (a client's get_object, or a
+    wrapper around it). The first GET reads the last tail_bytes of the object, where a zip keeps its
+    central directory (a small object arrives whole). Reads are served from the
+    ranges fetched so far; a read outside them fetches at least read_ahead_bytes
+    from the read position. Every GET after the first is pinned to the first
+    response's ETag, so an object overwritten mid-read fails instead of mixing
+    two versions.
+    """
+
+    def __init__(self, get_object, bucket, key, tail_bytes=64 * 1024, read_ahead_bytes=64 * 1024):
+        self.get_object = get_object
+        self.bucket = bucket
+        self.key = key
+        self.read_ahead_bytes = read_ahead_bytes
+        self.etag = None
+        self.requests = 0
+        self.bytes_fetched = 0
+        # (start, bytes) of every fetched range
+        self._ranges = []
+        self._position = 0
+
+        response, data = self._get(f'bytes=-{tail_bytes}')
+        content_range = response.get('ContentRange')
+        # ContentRange is "bytes <first>-<last>/<size>"
+        self.size = int(content_range.rsplit('/', 1)[1]) if content_range else len(data)
+        self.etag = response.get('ETag')
+        self._ranges.append((self.size - len(data), data))
+
+    def _get(self, byte_range):
+        params = {'Bucket': self.bucket, 'Key': self.key, 'Range': byte_range}
+        if self.etag:
+            params['IfMatch'] = self.etag
+        response = self.get_object(**params)
+        try:
+            data = response['Body'].read()
+        finally:
+            response['Body'].close()
+        self.requests += 1
+        self.bytes_fetched += len(data)
+        return response, data
+
+    def _fetch(self, start, end):
+        _, data = self._get(f'bytes={start}-{end - 1}')
+        self._ranges.append((start, data))
+        return data
+
+    def _cached(self, start, end):
+        for range_start, data in self._ranges:
+            if range_start <= start and end <= range_start + len(data):
+                return data[start - range_start:end - range_start]
+        return None
+
+    def prefetch(self, spans):
+        """Fetch the (start, end) byte spans not already read, merging spans closer than read_ahead_bytes"""
+        missing = sorted(
+            (start, min(end, self.size)) for start, end in spans
+            if self._cached(start, min(end, self.size)) is None
+        )
+        merged = []
+        for start, end in missing:
+            if merged and start - merged[-1][1] < self.read_ahead_bytes:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        for start, end in merged:
+            self._fetch(start, end)
+
+    def read_all(self):
+        """Return the whole object, fetching what the first GET did not (one more GET at most)"""
+        tail_start, tail = self._ranges[0]
+        if tail_start == 0:
+            return tail
+        return self._fetch(0, tail_start) + tail
+
+    def read(self, size=-1):
+        start = self._position
+        end = self.size if size is None or size < 0 else min(self.size, start + size)
+        if end <= start:
+            return b''
+        data = self._cached(start, end)
+        if data is None:
+            data = self._fetch(start, min(self.size, max(end, start + self.read_ahead_bytes)))[:end - start]
+        self._position = end
+        return data
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_CUR:
+            offset += self._position
+        elif whence == os.SEEK_END:
+            offset += self.size
+        if offset < 0:
+            # zipfile treats an OSError here as a file too short to be a zip
+            raise OSError(f"Negative seek position {offset}")
+        self._position = offset
+        return offset
+
+    def tell(self):
+        return self._position
+
+    def seekable(self):
+        return True
+
+    def readable(self):
+        return True
+
+    def close(self):
+        self._ranges = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+def zip_member_spans(package, names):
+    """Byte spans (start, end) holding the local header and data of the named members of an open zip"""
+    spans = []
+    for name in names:
+        try:
+            info = package.getinfo(name)
+        except KeyError:
+            continue
+        end = (info.header_offset + LOCAL_HEADER_BYTES + len(info.filename.encode('utf-8'))
+               + len(info.extra) + info.compress_size + LOCAL_EXTRA_SLACK_BYTES)
+        spans.append((info.header_offset, end))
+    return spans
@@ -0,0 +1,133 @@
+import json
+import logging
+import os
+import time
+from collections import deque
+
+logger = logging.getLogger()
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'skills_taxonomy.json')
+
+def fold_case(text):
+    """Lowercase text without changing its length, so match offsets map back to the original"""
+    folded = text.lower()
+    if len(folded) == len(text):
+        return folded
+    # A few characters (e.g. 'İ') expand when lowercased - keep those as they are
+    return ''.join(c.lower() if len(c.lower()) == 1 else c for c in text)
+
+class SkillsMatcher:
+    """Aho-Corasick automaton over every skill name and synonym in a taxonomy.
+
+    Matching makes one pass over the text regardless of how many terms the
+    taxonomy holds. Matches may not start or end inside a word, overlapping
+    matches resolve to the leftmost longest term, and every term maps back to
+    its canonical skill name.
+    """
+
+    def __init__(self, skills):
+        # Trie as parallel lists indexed by node id
+        self._goto = [{}]
+        self._fail = [0]
+        self._outputs = [[]]
+        # term id -> (canonical name, term length, exact-case term or None)
+        self._terms = []
+
+        for skill in skills:
+            canonical = skill['name']
+            match_case = skill.get('match_case', False)
+            for term in [canonical] + skill.get('synonyms', []):
+                term = term.strip()
+                if term:
+                    self._add_term(term, canonical, match_case)
+
+        self._build_failure_links()
+
+    @classmethod
+    def from_file(cls, path=DEFAULT_TAXONOMY_PATH):
+        """Load a matcher from a taxonomy JSON file"""
+        start = time.perf_counter()
+        with open(path, encoding='utf-8') as file:
+            taxonomy = json.load(file)
+        matcher = cls(taxonomy['skills'])
+        logger.info(f"Loaded {len(taxonomy['skills'])} skills ({len(matcher._terms)} terms) "
+                    f"from taxonomy in {(time.perf_counter() - start) * 1000:.1f} ms")
+        return matcher
+
+    def _add_term(self, term, canonical, match_case):
+        node = 0
+        for char in fold_case(term):
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+                self._goto[node][char] = next_node
+            node = next_node
+        self._outputs[node].append(len(self._terms))
+        self._terms.append((canonical, len(term), term if match_case else None))
+
+    def _build_failure_links(self):
+        # Breadth-first so every node's failure target is finished before its children
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                # Inherit the outputs of the longest proper suffix
+                self._outputs[child] = self._outputs[child] + self._outputs[self._fail[child]]
+
+    def find(self, text):
+        """Find skill mentions as (canonical name, start, end), leftmost-longest and non-overlapping"""
+        goto, fail, outputs, terms = self._goto, self._fail, self._outputs, self._terms
+        folded = fold_case(text)
+        text_length = len(text)
+        candidates = []
+        node = 0
+        for position, char in enumerate(folded):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if not outputs[node]:
+                continue
+
+            end = position + 1
+            for term_id in outputs[node]:
+                canonical, length, exact_term = terms[term_id]
+                start = end - length
+                # Word boundaries: the term may not start or end inside a word
+                if start > 0 and text[start - 1].isalnum() and text[start].isalnum():
+                    continue
+                if end < text_length and text[end].isalnum() and text[end - 1].isalnum():
+                    continue
+                if exact_term is not None and text[start:end] != exact_term:
+                    continue
+                candidates.append((start, -length, canonical))
+
+        # Resolve overlaps: leftmost first, then longest ("C++" beats "C")
+        matches = []
+        covered_until = 0
+        for start, negative_length, canonical in sorted(candidates):
+            if start >= covered_until:
+                matches.append((canonical, start, start - negative_length))
+                covered_until = start - negative_length
+        return matches
+
+    def find_skills(self, text):
+        """Return the canonical names of every skill mentioned, in order of first mention"""
+        return list(dict.fromkeys(canonical for canonical, _, _ in self.find(text)))
+
+_matcher = None
+
+def get_skills_matcher():
+    """Return the container-wide skills matcher, loading the taxonomy on first use"""
+    global _matcher
+    if _matcher is None:
+        _matcher = SkillsMatcher.from_file(os.environ.get('SKILLS_TAXONOMY_PATH', DEFAULT_TAXONOMY_PATH))
+    return _matcher
@@ -0,0 +1,49 @@
+import threading
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from contextvars import copy_context
+
+class Speculation:
+    """A call started on a worker thread before it is known whether its result is needed.
+
+    The call runs in a copy of the caller's context, so its stages are timed on the
+    caller's timer and it sees the caller's deadline. It is passed a threading.Event
+    that is set when the result is abandoned, so work that polls can stop early.
+    """
+
+    def __init__(self, executor, function):
+        self.stop = threading.Event()
+        self.state = 'running'
+        self._submitted = time.perf_counter()
+        self._finished = None
+        self.future = executor.submit(copy_context().run, self._run, function)
+
+    def _run(self, function):
+        try:
+            return function(self.stop)
+        finally:
+            self._finished = time.perf_counter()
+
+    def result(self, timeout=None):
+        """Wait up to timeout seconds for the result (re-raises what the call raised, or TimeoutError)"""
+        try:
+            value = self.future.result(timeout)
+        except FutureTimeoutError:
+            self.abandon('timed_out')
+            raise TimeoutError(f"Speculative call did not finish within {timeout:.1f}s") from None
+        except Exception:
+            self.state = 'failed'
+            raise
+        self.state = 'used'
+        return value
+
+    def abandon(self, state='ignored'):
+        """Give up on the result, cancelling the call if it has not started yet"""
+        self.stop.set()
+        self.state = 'cancelled' if self.future.cancel() else state
+
+    def elapsed_ms(self):
+        """Milliseconds from submission until the call finished (None while it is still running)"""
+        if self._finished is None:
+            return None
+        return round((self._finished - self._submitted) * 1000, 3)
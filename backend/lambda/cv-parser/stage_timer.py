@@ -0,0 +1,170 @@
+import json
+import logging
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+logger = logging.getLogger()
+
+# The timer collecting stages for the invocation running in this thread
+_active_timer = ContextVar('active_stage_timer', default=None)
+
+class StageTimer:
+    """Wall time, CPU time, bytes processed and peak allocations per pipeline stage.
+
+    Stages may nest, so a stage's figures include those of the stages inside it.
+    A stage that runs several times (e.g. Textract once per page) accumulates
+    into one entry with a call count. Peak memory comes from tracemalloc and is
+    measured above the allocations live when the stage started.
+    """
+
+    def __init__(self, trace_memory=True):
+        self.trace_memory = trace_memory
+        self.stages = {}
+        # Open stages as [name, start traced bytes, highest traced bytes seen so far]
+        self._open = []
+        self._started_tracing = False
+        self._token = None
+
+    def __enter__(self):
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._token = _active_timer.set(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        _active_timer.reset(self._token)
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        return False
+
+    def _traced_peak(self):
+        # Fold the peak since the last reset into every open stage, then start a new window
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        for entry in self._open:
+            entry[2] = max(entry[2], peak)
+
+    @contextmanager
+    def stage(self, name, bytes_processed=None):
+        """Time a block of work; set record['bytes'] inside the block if the size is only known there"""
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        record = {'bytes': bytes_processed}
+        entry = None
+        if tracing:
+            self._traced_peak()
+            current, _ = tracemalloc.get_traced_memory()
+            entry = [name, current, current]
+            self._open.append(entry)
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield record
+        finally:
+            wall_ms = (time.perf_counter() - wall_start) * 1000
+            cpu_ms = (time.thread_time() - cpu_start) * 1000
+            peak_bytes = None
+            if entry is not None:
+                self._traced_peak()
+                self._open.remove(entry)
+                peak_bytes = entry[2] - entry[1]
+            self._record(name, wall_ms, cpu_ms, record['bytes'], peak_bytes)
+
+    def _record(self, name, wall_ms, cpu_ms, bytes_processed, peak_bytes):
+        stats = self.stages.get(name)
+        if stats is None:
+            stats = self.stages[name] = {'calls': 0, 'wall_ms': 0.0, 'cpu_ms': 0.0, 'bytes': None, 'peak_bytes': None}
+        stats['calls'] += 1
+        stats['wall_ms'] += wall_ms
+        stats['cpu_ms'] += cpu_ms
+        if bytes_processed is not None:
+            stats['bytes'] = (stats['bytes'] or 0) + bytes_processed
+        if peak_bytes is not None:
+            stats['peak_bytes'] = max(stats['peak_bytes'] or 0, peak_bytes)
+
+    def report(self):
+        """Return the stage figures in the order the stages first finished"""
+        return {
+            name: {
+                **stats,
+                'wall_ms': round(stats['wall_ms'], 3),
+                'cpu_ms': round(stats['cpu_ms'], 3)
+            }
+            for name, stats in self.stages.items()
+        }
+
+    def emit_metrics(self, namespace, dimensions=None):
+        """Write one CloudWatch Embedded Metric Format line per stage to stdout.
+
+        EMF documents must be the whole log event, so they are printed rather
+        than logged (the Lambda log handler prefixes a timestamp and request id).
+        """
+        dimensions = dimensions or {}
+        timestamp = int(time.time() * 1000)
+        for name, stats in self.report().items():
+            metrics = [
+                {'Name': 'WallTime', 'Unit': 'Milliseconds'},
+                {'Name': 'CpuTime', 'Unit': 'Milliseconds'}
+            ]
+            values = {'WallTime': stats['wall_ms'], 'CpuTime': stats['cpu_ms']}
+            if stats['bytes'] is not None:
+                metrics.append({'Name': 'BytesProcessed', 'Unit': 'Bytes'})
+                values['BytesProcessed'] = stats['bytes']
+            if stats['peak_bytes'] is not None:
+                metrics.append({'Name': 'PeakAllocated', 'Unit': 'Bytes'})
+                values['PeakAllocated'] = stats['peak_bytes']
+            print(json.dumps({
+                '_aws': {
+                    'Timestamp': timestamp,
+                    'CloudWatchMetrics': [{
+                        'Namespace': namespace,
+                        'Dimensions': [['Stage', *dimensions]],
+                        'Metrics': metrics
+                    }]
+                },
+                'Stage': name,
+                **dimensions,
+                **values,
+                'Calls': stats['calls']
+            }), flush=True)
+
+    def log_report(self):
+        """Log a one-line summary of each stage"""
+        for name, stats in self.report().items():
+            peak = f", peak {stats['peak_bytes']} bytes" if stats['peak_bytes'] is not None else ""
+            size = f", {stats['bytes']} bytes" if stats['bytes'] is not None else ""
+            logger.info(f"Stage '{name}': {stats['wall_ms']} ms wall, {stats['cpu_ms']} ms CPU{size}{peak}")
+
+def emit_count_metrics(namespace, dimension, counts, metric_names):
+    """Write one CloudWatch Embedded Metric Format line of counts per dimension value.
+
+    counts maps each value of the dimension (e.g. each operation) to {key: count},
+    and metric_names maps each key to the name of its metric.
+    """
+    timestamp = int(time.time() * 1000)
+    for value, value_counts in counts.items():
+        print(json.dumps({
+            '_aws': {
+                'Timestamp': timestamp,
+                'CloudWatchMetrics': [{
+                    'Namespace': namespace,
+                    'Dimensions': [[dimension]],
+                    'Metrics': [{'Name': metric_name, 'Unit': 'Count'} for metric_name in metric_names.values()]
+                }]
+            },
+            dimension: value,
+            **{metric_name: value_counts.get(key, 0) for key, metric_name in metric_names.items()}
+        }), flush=True)
+
+@contextmanager
+def stage(name, bytes_processed=None):
+    """Time a block of work against the active timer (a no-op when no timer is active)"""
+    timer = _active_timer.get()
+    if timer is None:
+        yield {'bytes': bytes_processed}
+        return
+    with timer.stage(name, bytes_processed) as record:
+        yield record
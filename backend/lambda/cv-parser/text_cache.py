@@ -0,0 +1,206 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from botocore.exceptions import ClientError
+
+logger = logging.getLogger()
+
+def make_cache_key(kind, digest, version):
+    """Build a cache key for a cached artifact of a document"""
+    return f"{kind}/{version}/{digest}"
+
+def etag_digest(etag):
+    """Normalize an S3 ETag into a cache digest"""
+    return "etag-" + etag.strip('"')
+
+def is_etag_digest(digest):
+    """Return whether a cache digest was made from an S3 ETag"""
+    return digest.startswith("etag-")
+
+def content_digest(hasher):
+    """Turn a content hash into a cache digest"""
+    return f"{hasher.name}-{hasher.hexdigest()}"
+
+class TextCache:
+    """Two-tier cache for extracted CV text and parsed sections.
+
+    The local tier is a size-bounded LRU held in memory and mirrored to /tmp so
+    it survives across warm invocations of the same container. The persistent
+    tier stores gzip JSON sidecar objects in S3 so every container benefits;
+    they are written in the background (see flush), off the caller's response
+    path. Safe to share between threads.
+    """
+
+    def __init__(self, get_s3_client, bucket=None, prefix='cv-cache/', memory_bytes=32 * 1024 * 1024,
+                 disk_dir='/tmp/cv-cache', disk_bytes=128 * 1024 * 1024):
+        # Called for a client only when the S3 tier is used, so the client can be created lazily
+        self.get_s3_client = get_s3_client
+        self.bucket = bucket
+        self.prefix = prefix
+        self.memory_bytes = memory_bytes
+        self.disk_dir = disk_dir
+        self.disk_bytes = disk_bytes
+        self._memory = OrderedDict()
+        self._memory_size = 0
+        self._memory_lock = threading.Lock()
+        self._s3_writer = ThreadPoolExecutor(max_workers=2, thread_name_prefix='cache-s3-write')
+        self._s3_writes = set()
+        self._s3_writes_lock = threading.Lock()
+
+    def get(self, key, bucket=None, s3=True):
+        """Look up a cached value, promoting hits from slower tiers (the S3 tier only when s3 is true)"""
+        value = self._get_memory(key)
+        if value is not None:
+            logger.info(f"Cache hit in memory: {key}")
+            return value
+
+        payload = self._get_disk(key)
+        if payload is None:
+            payload = self._get_s3(key, bucket) if s3 else None
+            if payload is None:
+                logger.info(f"Cache miss: {key}")
+                return None
+            logger.info(f"Cache hit in S3: {key}")
+            self._put_disk(key, payload)
+        else:
+            logger.info(f"Cache hit on disk: {key}")
+
+        value = json.loads(gzip.decompress(payload))
+        self._put_memory(key, value, len(payload))
+        return value
+
+    def put(self, key, value, bucket=None, s3=True):
+        """Store a value in the local tiers, and when s3 is true start writing its S3 sidecar"""
+        payload = gzip.compress(json.dumps(value).encode('utf-8'))
+        self._put_memory(key, value, len(payload))
+        self._put_disk(key, payload)
+        if s3:
+            write = self._s3_writer.submit(self._put_s3, key, payload, bucket)
+            with self._s3_writes_lock:
+                self._s3_writes.add(write)
+            write.add_done_callback(self._s3_write_done)
+
+    def flush(self):
+        """Wait for the S3 sidecar writes started so far"""
+        with self._s3_writes_lock:
+            writes = list(self._s3_writes)
+        wait(writes)
+
+    def _s3_write_done(self, write):
+        with self._s3_writes_lock:
+            self._s3_writes.discard(write)
+
+    # In-memory LRU tier
+    def _get_memory(self, key):
+        with self._memory_lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            self._memory.move_to_end(key)
+            return entry[0]
+
+    def _put_memory(self, key, value, size):
+        if size > self.memory_bytes:
+            return
+        with self._memory_lock:
+            if key in self._memory:
+                self._memory_size -= self._memory.pop(key)[1]
+            self._memory[key] = (value, size)
+            self._memory_size += size
+            while self._memory_size > self.memory_bytes:
+                _, (_, evicted_size) = self._memory.popitem(last=False)
+                self._memory_size -= evicted_size
+
+    # /tmp tier
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, hashlib.sha256(key.encode('utf-8')).hexdigest() + '.json.gz')
+
+    def _get_disk(self, key):
+        path = self._disk_path(key)
+        try:
+            with open(path, 'rb') as file:
+                payload = file.read()
+            # Touch the file so eviction treats it as recently used
+            os.utime(path)
+            return payload
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"Error reading disk cache entry {key}: {str(e)}")
+            return None
+
+    def _put_disk(self, key, payload):
+        if len(payload) > self.disk_bytes:
+            return
+        try:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            path = self._disk_path(key)
+            temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, 'wb') as file:
+                file.write(payload)
+            os.replace(temp_path, path)
+            self._evict_disk()
+        except OSError as e:
+            logger.warning(f"Error writing disk cache entry {key}: {str(e)}")
+
+    def _evict_disk(self):
+        entries = []
+        total = 0
+        with os.scandir(self.disk_dir) as it:
+            for entry in it:
+                if entry.name.endswith('.json.gz'):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        # Evicted by another thread since the directory was listed
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+
+        # Remove least recently used entries until we are back under budget
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.disk_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except FileNotFoundError:
+                pass
+
+    # S3 sidecar tier
+    def _get_s3(self, key, bucket):
+        bucket = self.bucket or bucket
+        if not bucket:
+            return None
+        try:
+            response = self.get_s3_client().get_object(Bucket=bucket, Key=self.prefix + key + '.json.gz')
+            return response['Body'].read()
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') not in ('NoSuchKey', '404'):
+                logger.warning(f"Error reading S3 cache entry {key}: {str(e)}")
+            return None
+        except Exception as e:
+            logger.warning(f"Error reading S3 cache entry {key}: {str(e)}")
+            return None
+
+    def _put_s3(self, key, payload, bucket):
+        bucket = self.bucket or bucket
+        if not bucket:
+            return
+        try:
+            self.get_s3_client().put_object(
+                Bucket=bucket,
+                Key=self.prefix + key + '.json.gz',
+                Body=payload,
+                ContentType='application/json',
+                ContentEncoding='gzip'
+            )
+        except Exception as e:
+            logger.warning(f"Error writing S3 cache entry {key}: {str(e)}")
@@ -8,7 +8,8 @@ exports.invokeCvParser = async (s3Key, fileType) => {
     const payload = {
       s3Bucket: process.env.S3_BUCKET_NAME,
       s3Key: s3Key,
-      fileType: fileType
+      fileType: fileType,
+      includeTimings: process.env.CV_PARSER_TIMINGS === 'true'
     };
     
     // Invoke Lambda function
@@ -30,6 +31,16 @@ exports.invokeCvParser = async (s3Key, fileType) => {
     
     // Parse and return the response payload
     const result = JSON.parse(Buffer.from(response.Payload).toString());
+    
+    // Per-stage timings are only present when requested
+    if (result.timings) {
+      logger.info(`CV parser stage timings: ${JSON.stringify(result.timings)}`);
+    }
+    
+    // The parser skips slow or optional stages rather than time out
+    if (result.partial) {
+      logger.warn(`CV parser returned a partial result, skipped stages: ${(result.skipped || []).join(', ')}`);
+    }
     return result;
   } catch (error) {
     logger.error(`Error invoking CV parser Lambda: ${error.message}`);